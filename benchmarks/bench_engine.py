@@ -0,0 +1,315 @@
+"""
+Throughput and latency benchmark for the quiz engine.
+
+Simulates concurrent synthetic players running full sessions (start, get
+question, answer, ..., result) against the engine, both in-process and
+through the quiz server on localhost, for several bank sizes. Reports
+throughput, p50/p95/p99 latency per operation and memory per session,
+and writes everything to a JSON file so runs can be compared across
+versions.
+
+Usage:
+    python benchmarks/bench_engine.py
+    python benchmarks/bench_engine.py --sizes 71 1000000 --players 500
+"""
+
+import argparse  # Import argparse to read command-line options
+import asyncio  # Import asyncio to drive the server with concurrent clients
+import json  # Import json to talk to the server and write results
+import os  # Import os to locate the repository
+import platform  # Import platform to describe the machine
+import random  # Import random to generate synthetic banks and answers
+import subprocess  # Import subprocess to record the git revision
+import sys  # Import sys to make the quiz engine importable
+import time  # Import time to measure latency
+import tracemalloc  # Import tracemalloc to measure memory per session
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from quiz_engine import (  # noqa: E402
+    BankIndex,
+    Question,
+    QuestionBank,
+    assemble_quiz,
+    load_bank,
+)
+from quiz_engine.server import QuizServer  # noqa: E402
+from quiz_engine.stats import summarize  # noqa: E402
+
+BUNDLED_QUESTIONS = os.path.join(ROOT, "data", "questions.json")
+BUNDLED_SIZE = 71  # Size of the bundled question file
+DEFAULT_SIZES = [BUNDLED_SIZE, 10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "engine.json")
+CATEGORIES = ("art", "general", "geography", "history", "literature", "science")
+DIFFICULTIES = ("easy", "medium", "hard")
+OPERATIONS = ("start", "question", "answer", "result")
+
+
+def make_bank(size):
+    """
+    Return the bundled bank for its own size, or a synthetic bank otherwise.
+    """
+    if size == BUNDLED_SIZE:
+        return load_bank(BUNDLED_QUESTIONS)
+    rng = random.Random(size)
+    return QuestionBank(
+        Question(
+            f"Synthetic question {number}?",
+            [f"Answer {rng.randrange(1000)}" for _ in range(3)] + ["Right"],
+            "Right",
+            "",
+            CATEGORIES[number % len(CATEGORIES)],
+            DIFFICULTIES[number % len(DIFFICULTIES)],
+        )
+        for number in range(size)
+    )
+
+
+def run_in_process(bank, index, players, sessions_per_player, questions, seed):
+    """
+    Interleave the sessions of many players in one thread, timing each call.
+    """
+    rng = random.Random(seed)
+    latencies = {operation: [] for operation in OPERATIONS}
+    timer = time.perf_counter
+    remaining = [sessions_per_player] * players
+    sessions = [None] * players
+    active = list(range(players))
+    started = timer()
+    while active:
+        still_active = []
+        for player in active:
+            session = sessions[player]
+            if session is None:
+                begin = timer()
+                session = sessions[player] = assemble_quiz(
+                    bank, count=questions, index=index, seed=rng.getrandbits(32)
+                )
+                latencies["start"].append(timer() - begin)
+            elif session.is_quiz_over():
+                begin = timer()
+                session.score, session.current_question_index  # Read the result
+                latencies["result"].append(timer() - begin)
+                sessions[player] = None
+                remaining[player] -= 1
+                if not remaining[player]:
+                    continue
+            else:
+                begin = timer()
+                _, options, correct, _ = session.get_randomized_question()
+                latencies["question"].append(timer() - begin)
+                choice = options[rng.randrange(len(options))]
+                begin = timer()
+                session.check_answer(choice, correct)
+                session.next_question()
+                latencies["answer"].append(timer() - begin)
+            still_active.append(player)
+        active = still_active
+    return timer() - started, latencies
+
+
+class Client:
+    """
+    Minimal keep-alive HTTP/JSON client for the quiz server.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data)
+
+
+async def run_server(bank, players, sessions_per_player, questions, seed):
+    """
+    Run the same player workload against a quiz server on localhost.
+    """
+    server = await QuizServer(bank, port=0).start()
+    latencies = {operation: [] for operation in OPERATIONS}
+    timer = time.perf_counter
+
+    async def timed(operation, client, method, path, payload=None):
+        begin = timer()
+        result = await client.request(method, path, payload)
+        latencies[operation].append(timer() - begin)
+        return result
+
+    async def player(number):
+        rng = random.Random(seed + number)
+        client = Client(*await asyncio.open_connection("127.0.0.1", server.port))
+        for _ in range(sessions_per_player):
+            _, created = await timed(
+                "start",
+                client,
+                "POST",
+                "/sessions",
+                {"count": questions, "seed": rng.getrandbits(32)},
+            )
+            base = f"/sessions/{created['session']}"
+            while True:
+                _, question = await timed("question", client, "GET", base + "/question")
+                if question["done"]:
+                    break
+                choice = rng.choice(question["options"])
+                await timed(
+                    "answer", client, "POST", base + "/answer", {"option": choice}
+                )
+            await timed("result", client, "GET", base + "/result")
+            await client.request("DELETE", base)
+        client.writer.close()
+
+    started = timer()
+    await asyncio.gather(*(player(number) for number in range(players)))
+    elapsed = timer() - started
+    await server.stop()
+    return elapsed, latencies
+
+
+def session_memory(bank, index, questions, sessions=1000):
+    """
+    Return the average bytes allocated per session, including its first question.
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = []
+    for seed in range(sessions):
+        session = assemble_quiz(bank, count=questions, index=index, seed=seed)
+        session.get_randomized_question()
+        kept.append(session)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / sessions
+
+
+def report(mode, size, players, sessions, elapsed, latencies, memory):
+    """
+    Build one result record, with latencies in milliseconds.
+    """
+    operations = sum(len(values) for values in latencies.values())
+    return {
+        "mode": mode,
+        "bank_size": size,
+        "players": players,
+        "sessions": sessions,
+        "operations": operations,
+        "elapsed_s": elapsed,
+        "throughput_ops_per_s": operations / elapsed if elapsed else 0.0,
+        "sessions_per_s": sessions / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            operation: summarize([value * 1000 for value in values])
+            for operation, values in latencies.items()
+        },
+        "memory_per_session_bytes": memory,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--sessions-per-player", type=int, default=3)
+    parser.add_argument("--questions", type=int, default=10, help="per session")
+    parser.add_argument(
+        "--modes", nargs="+", choices=("in-process", "server"), default=None
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+    modes = args.modes or ["in-process", "server"]
+
+    results = []
+    for size in args.sizes:
+        begin = time.perf_counter()
+        bank = make_bank(size)
+        index = BankIndex(bank)
+        print(
+            f"bank of {len(bank)} questions ready in {time.perf_counter() - begin:.2f}s"
+        )
+        memory = session_memory(bank, index, args.questions)
+        sessions = args.players * args.sessions_per_player
+        for mode in modes:
+            if mode == "in-process":
+                elapsed, latencies = run_in_process(
+                    bank,
+                    index,
+                    args.players,
+                    args.sessions_per_player,
+                    args.questions,
+                    args.seed,
+                )
+            else:
+                elapsed, latencies = asyncio.run(
+                    run_server(
+                        bank,
+                        args.players,
+                        args.sessions_per_player,
+                        args.questions,
+                        args.seed,
+                    )
+                )
+            result = report(
+                mode, len(bank), args.players, sessions, elapsed, latencies, memory
+            )
+            results.append(result)
+            answer = result["latency_ms"]["answer"]
+            print(
+                f"  {mode:>10}: {result['throughput_ops_per_s']:,.0f} ops/s, "
+                f"answer p50 {answer['p50']:.4f} ms / p99 {answer['p99']:.4f} ms, "
+                f"{memory:,.0f} bytes/session"
+            )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "benchmark": "engine",
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "settings": vars(args),
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
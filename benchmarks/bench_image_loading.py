@@ -0,0 +1,208 @@
+"""
+Image loading benchmark for the PyQt6 frontend's two image backends.
+
+Serves synthetic JPEG photos from a local StubImageServer and loads them
+into display-ready QPixmaps, once with the requests + PIL backend and once
+with the Qt-native backend (QNetworkAccessManager + QImageReader). Reports
+per-image latency when images are loaded one at a time, total time when a
+burst of images is loaded at once, and the peak resident memory each
+backend adds. Each backend runs in its own process so their peak memory can
+be told apart. Results are written to a JSON file.
+
+Usage:
+    python benchmarks/bench_image_loading.py
+    python benchmarks/bench_image_loading.py --images 50 --width 3000 --height 2000
+"""
+
+import argparse  # Import argparse to read command-line options
+import json  # Import json to pass and write results
+import os  # Import os to locate the repository
+import platform  # Import platform to describe the machine
+import resource  # Import resource to read the peak resident memory
+import subprocess  # Import subprocess to run each backend in its own process
+import sys  # Import sys to make the quiz engine importable
+import time  # Import time to measure latency
+from io import BytesIO  # Import BytesIO to encode the synthetic photos
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "pyqt6"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # No display needed
+
+from quiz_engine.stats import summarize  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "image_loading.json")
+BACKENDS = ("pil", "qt")
+
+
+def make_photos(count, width, height):
+    """
+    Encode `count` distinct noisy JPEGs, which compress like real photos.
+    """
+    from PIL import Image
+
+    photos = {}
+    for number in range(count):
+        bands = [Image.effect_noise((width, height), 40 + number) for _ in range(3)]
+        image = Image.merge("RGB", bands)
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=85)
+        photos[f"{number}.jpg"] = buffer.getvalue()
+    return photos
+
+
+def make_prefetcher(backend):
+    if backend == "qt":
+        from qt_image_loader import QtImagePrefetcher
+
+        return QtImagePrefetcher()
+    from quiz_engine import ImagePrefetcher
+    from quiz_engine.http_client import FetchClient
+    from quiz_engine.images import ImageLoader
+
+    return ImagePrefetcher(ImageLoader(FetchClient()))
+
+
+def to_pixmap(image):
+    """
+    Convert a loaded image to a QPixmap the way the frontend does.
+    """
+    from PIL import ImageQt
+    from PyQt6.QtGui import QImage, QPixmap
+
+    if not isinstance(image, QImage):
+        image = ImageQt.ImageQt(image).copy()
+    return QPixmap.fromImage(image)
+
+
+def wait(app, futures):
+    """
+    Run the Qt event loop until every future has finished.
+    """
+    while not all(future.done() for future in futures):
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def run_backend(backend, images, width, height, delay, burst):
+    """
+    Benchmark one backend in this process and return its measurements.
+    """
+    from PyQt6.QtWidgets import QApplication
+    from quiz_engine.stub_server import StubImageServer
+
+    photos = make_photos(images, width, height)
+    app = QApplication([])
+    # Every round gets its own URLs, so nothing is served from a cache
+    files = {
+        f"{round_name}/{name}": data
+        for round_name in ("warmup", "sequential", "burst")
+        for name, data in photos.items()
+    }
+    with StubImageServer(files, delay=delay) as server:
+        prefetcher = make_prefetcher(backend)
+        for name in list(photos)[:2]:
+            future = prefetcher.get(server.url(f"warmup/{name}"))
+            wait(app, [future])
+            to_pixmap(future.result())
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        latencies = []
+        for name in photos:
+            begin = time.perf_counter()
+            future = prefetcher.get(server.url(f"sequential/{name}"))
+            wait(app, [future])
+            to_pixmap(future.result())
+            latencies.append(time.perf_counter() - begin)
+
+        names = list(photos)[:burst]
+        begin = time.perf_counter()
+        futures = [prefetcher.get(server.url(f"burst/{name}")) for name in names]
+        wait(app, futures)
+        pixmaps = [to_pixmap(future.result()) for future in futures]
+        burst_elapsed = time.perf_counter() - begin
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        prefetcher.shutdown()
+    return {
+        "backend": backend,
+        "images": images,
+        "photo_bytes_mean": sum(map(len, photos.values())) / len(photos),
+        "latency_ms": summarize([value * 1000 for value in latencies]),
+        "burst_images": len(pixmaps),
+        "burst_elapsed_s": burst_elapsed,
+        "peak_rss_increase_kb": peak - baseline,  # ru_maxrss is in KB on Linux
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=1200)
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="server delay per request, seconds"
+    )
+    parser.add_argument("--burst", type=int, default=8, help="images loaded at once")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--child", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_backend(
+            args.child, args.images, args.width, args.height, args.delay, args.burst
+        )
+        print(json.dumps(result))
+        return
+
+    results = []
+    for backend in args.backends:
+        command = [sys.executable, os.path.abspath(__file__), "--child", backend]
+        for option in ("images", "width", "height", "delay", "burst"):
+            command += [f"--{option}", str(getattr(args, option))]
+        output = subprocess.run(command, capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout.splitlines()[-1])
+        results.append(result)
+        latency = result["latency_ms"]
+        print(
+            f"{backend:>3}: p50 {latency['p50']:.1f} ms / p95 {latency['p95']:.1f} ms "
+            f"per image, burst of {result['burst_images']} in "
+            f"{result['burst_elapsed_s']:.2f}s, "
+            f"peak memory +{result['peak_rss_increase_kb'] / 1024:.1f} MB"
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "benchmark": "image_loading",
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "settings": {
+                    key: value for key, value in vars(args).items() if key != "child"
+                },
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
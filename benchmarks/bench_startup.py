@@ -0,0 +1,265 @@
+"""
+Startup benchmark for the Tkinter and PyQt6 frontends.
+
+Measures, for each frontend, how long `import main` takes and how long it
+takes from launching the process to the first frame of the name and age
+screen, plus when the question bank has finished loading in the
+background. Every measurement runs in a fresh process, so nothing is
+already imported or cached, and the median of several runs is compared
+with the budget in benchmarks/startup_budget.json. The exit status is 1 if
+a frontend is over budget, so the benchmark can guard against startup
+regressions. Results are written to a JSON file.
+
+The PyQt6 frontend runs on Qt's offscreen platform. The Tkinter frontend
+needs a display; run it under Xvfb (`xvfb-run python ...`) on a machine
+without one, or it is skipped.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --frontends pyqt6
+    python benchmarks/bench_startup.py --questions big.json --no-check
+"""
+
+import argparse  # Import argparse to read command-line options
+import json  # Import json to pass and write results
+import os  # Import os to locate the repository
+import platform  # Import platform to describe the machine
+import statistics  # Import statistics for the median of the runs
+import subprocess  # Import subprocess to measure each run in a fresh process
+import sys  # Import sys to run the frontends
+import time  # Import time to measure startup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "startup.json")
+DEFAULT_BUDGET = os.path.join(ROOT, "benchmarks", "startup_budget.json")
+FRONTENDS = ("tkinter", "pyqt6")
+METRICS = ("import_ms", "first_frame_ms", "bank_ready_ms")
+
+
+def report(**values):
+    """
+    Print a child's measurements as the last line of its output.
+    """
+    print(json.dumps(values), flush=True)
+
+
+def measure_import(frontend):
+    """
+    Time `import main` of a frontend in this (fresh) process.
+    """
+    sys.path.insert(0, os.path.join(ROOT, frontend))
+    begin = time.perf_counter()
+    import main  # noqa: F401
+
+    report(import_ms=(time.perf_counter() - begin) * 1000)
+
+
+def patch_event_loop(frontend, launched):
+    """
+    Replace the frontend's event loop with one that stops after the first frame.
+
+    Once the first frame has been drawn, the time since `launched` is
+    reported, then the time until the question bank is ready, and the
+    frontend is closed so that its normal shutdown runs.
+    """
+
+    def finished(ui):
+        first_frame = (time.time() - launched) * 1000
+        loader = ui.quiz_manager
+        if hasattr(loader, "result"):
+            loader.result()  # Still loading in the background: wait for it
+        report(
+            first_frame_ms=first_frame, bank_ready_ms=(time.time() - launched) * 1000
+        )
+
+    if frontend == "tkinter":
+        import tkinter
+
+        def mainloop(self, n=0):
+            self.update()  # Map and draw the window
+            finished(self.ui)
+            self.destroy()
+
+        tkinter.Misc.mainloop = mainloop
+        return
+
+    from PyQt6 import QtWidgets
+
+    class BenchApplication(QtWidgets.QApplication):
+        def exec(self):
+            self.processEvents()  # Show, lay out and paint the window
+            (ui,) = [w for w in self.topLevelWidgets() if hasattr(w, "quiz_manager")]
+            finished(ui)
+            return 0
+
+    QtWidgets.QApplication = BenchApplication
+
+
+def measure_first_frame(frontend, launched, questions):
+    """
+    Run a frontend's main() in this process until its first frame.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # No display needed
+    patch_event_loop(frontend, launched)
+    sys.path.insert(0, os.path.join(ROOT, frontend))
+    sys.argv = [
+        "main.py",
+        "--questions",
+        questions,
+        "--no-telemetry",
+        "--no-results",
+    ]
+    import main
+
+    main.main()
+
+
+def run_child(frontend, measure, questions):
+    """
+    Measure one run in a fresh process; returns its values, or None if it failed.
+    """
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--child",
+        frontend,
+        "--measure",
+        measure,
+        "--questions",
+        questions,
+        "--launched",
+        repr(time.time()),
+    ]
+    result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        error = (result.stderr.strip().splitlines() or ["no output"])[-1]
+        print(f"Error: {frontend} {measure} run failed: {error}")
+        return None
+    return json.loads(lines[-1])
+
+
+def measure_frontend(frontend, runs, questions):
+    """
+    Return the median of each metric over `runs` runs, or None if it failed.
+    """
+    samples = {metric: [] for metric in METRICS}
+    for _ in range(runs):
+        for measure in ("import", "frame"):
+            values = run_child(frontend, measure, questions)
+            if values is None:
+                return None
+            for metric, value in values.items():
+                samples[metric].append(value)
+    return {
+        "runs": runs,
+        **{metric: statistics.median(values) for metric, values in samples.items()},
+        "samples": samples,
+    }
+
+
+def check_budget(frontend, result, budget):
+    """
+    Return the metrics of a frontend that are over its budget.
+    """
+    limits = budget.get(frontend, {})
+    return [
+        metric
+        for metric in METRICS
+        if metric in limits and result[metric] > limits[metric]
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--runs", type=int, default=5, help="fresh processes per metric"
+    )
+    parser.add_argument("--frontends", nargs="+", choices=FRONTENDS, default=FRONTENDS)
+    parser.add_argument("--questions", default="data/questions.json")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET)
+    parser.add_argument(
+        "--no-check",
+        dest="check",
+        action="store_false",
+        help="always exit with status 0, even when over budget",
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--child", choices=FRONTENDS, help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--measure", choices=("import", "frame"), help=argparse.SUPPRESS
+    )
+    parser.add_argument("--launched", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        if args.measure == "import":
+            measure_import(args.child)
+        else:
+            measure_first_frame(args.child, args.launched, args.questions)
+        return
+
+    with open(args.budget) as file:
+        budget = json.load(file)
+    results = []
+    over_budget = False
+    for frontend in args.frontends:
+        result = measure_frontend(frontend, args.runs, args.questions)
+        if result is None:
+            print(f"{frontend:>7}: skipped")
+            results.append({"frontend": frontend, "skipped": True})
+            continue
+        over = check_budget(frontend, result, budget)
+        over_budget = over_budget or bool(over)
+        results.append({"frontend": frontend, "over_budget": over, **result})
+        limits = budget.get(frontend, {})
+        print(
+            f"{frontend:>7}: "
+            + ", ".join(
+                f"{metric[:-3]} {result[metric]:.0f} ms"
+                + (f" (budget {limits[metric]})" if metric in limits else "")
+                for metric in METRICS
+            )
+            + (f" -- OVER BUDGET: {', '.join(over)}" if over else "")
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "benchmark": "startup",
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "settings": {
+                    key: value
+                    for key, value in vars(args).items()
+                    if key not in ("child", "measure", "launched")
+                },
+                "budget": budget,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"Results written to {args.output}")
+    if args.check and over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+"""
+UI transition benchmark for the Tkinter and PyQt6 frontends.
+
+Drives each frontend's UserInterface through a whole quiz with no one at
+the keyboard: it fills in the name and age, then for every question picks
+an option, submits it and moves on, the way a player would click. Question
+images are synthetic photos served from a local StubImageServer. For every
+question it measures
+
+- submit: clicking Submit until the feedback has been drawn,
+- next: clicking Next Question until the new question has been drawn,
+- image: clicking Next Question until the question's image is on screen.
+
+PyQt6 runs on Qt's offscreen platform. Tkinter needs an X display: without
+one, a virtual display is started with Xvfb if it is installed, otherwise
+the Tkinter run is skipped. Each frontend runs in its own process. The p95
+of every measurement is compared with benchmarks/ui_budget.json and the
+exit status is 1 if a frontend is over budget. Results are written to a
+JSON file.
+
+Usage:
+    python benchmarks/bench_ui.py
+    python benchmarks/bench_ui.py --questions 50 --delay 0.05 --frontends pyqt6
+"""
+
+import argparse  # Import argparse to read command-line options
+import json  # Import json to pass and write results
+import os  # Import os to locate the repository
+import platform  # Import platform to describe the machine
+import shutil  # Import shutil to find Xvfb
+import subprocess  # Import subprocess to run each frontend in its own process
+import sys  # Import sys to make the quiz engine and frontends importable
+import tempfile  # Import tempfile for the image cache of each run
+import time  # Import time to measure latency
+from io import BytesIO  # Import BytesIO to encode the synthetic photos
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from quiz_engine.stats import summarize  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results", "ui.json")
+DEFAULT_BUDGET = os.path.join(ROOT, "benchmarks", "ui_budget.json")
+FRONTENDS = ("tkinter", "pyqt6")
+METRICS = ("submit_ms", "next_ms", "image_ms")
+TIMEOUT = 10.0  # Seconds to wait for a screen update before giving up
+
+
+def make_photos(count, width, height):
+    """
+    Encode `count` distinct noisy JPEGs, which compress like real photos.
+    """
+    from PIL import Image
+
+    photos = {}
+    for number in range(count):
+        bands = [Image.effect_noise((width, height), 40 + number) for _ in range(3)]
+        buffer = BytesIO()
+        Image.merge("RGB", bands).save(buffer, format="JPEG", quality=85)
+        photos[f"{number}.jpg"] = buffer.getvalue()
+    return photos
+
+
+def make_bank(server, count):
+    """
+    Build a bank of `count` questions whose images come from the stub server.
+    """
+    from quiz_engine import Question, QuestionBank
+
+    with open(os.path.join(ROOT, "data", "questions.json")) as file:
+        entries = json.load(file)
+    return QuestionBank(
+        Question.from_dict(
+            dict(
+                entries[number % len(entries)],
+                question=f"{entries[number % len(entries)]['question']} ({number})",
+                image=server.url(f"{number}.jpg"),
+            )
+        )
+        for number in range(count)
+    )
+
+
+class TkDriver:
+    """
+    Clicks through the Tkinter UserInterface.
+    """
+
+    def __init__(self):
+        sys.path.insert(0, os.path.join(ROOT, "tkinter"))
+        import tkinter as tk
+        from user_interface import UserInterface
+
+        self.root = tk.Tk()
+        self.root.geometry("800x600")
+        self.UserInterface = UserInterface
+
+    def make_ui(self, quiz_manager, user, image_prefetcher, telemetry):
+        return self.UserInterface(
+            self.root, quiz_manager, user, image_prefetcher, None, telemetry
+        )
+
+    def pump(self):
+        self.root.update()  # Handle events and redraw
+
+    def click(self, widget):
+        widget.invoke()
+
+    def set_text(self, entry, text):
+        entry.delete(0, "end")
+        entry.insert(0, text)
+
+    def text(self, label):
+        return label.cget("text")
+
+    def close(self):
+        self.root.destroy()
+
+
+class QtDriver:
+    """
+    Clicks through the PyQt6 UserInterface.
+    """
+
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # No display needed
+        sys.path.insert(0, os.path.join(ROOT, "pyqt6"))
+        from PyQt6.QtWidgets import QApplication
+        from user_interface import UserInterface
+
+        self.app = QApplication([])
+        self.UserInterface = UserInterface
+        self.ui = None
+
+    def make_ui(self, quiz_manager, user, image_prefetcher, telemetry):
+        self.ui = self.UserInterface(
+            quiz_manager, user, image_prefetcher, None, telemetry
+        )
+        self.ui.resize(800, 600)
+        self.ui.show()
+        return self.ui
+
+    def pump(self):
+        self.app.processEvents()  # Handle events, including pending repaints
+
+    def click(self, widget):
+        widget.click()
+
+    def set_text(self, entry, text):
+        entry.setText(text)
+
+    def text(self, label):
+        return label.text()
+
+    def close(self):
+        self.ui.close()
+
+
+def wait_until(driver, condition):
+    """
+    Run the event loop until `condition()` is true; returns False on timeout.
+    """
+    deadline = time.perf_counter() + TIMEOUT
+    while True:
+        driver.pump()
+        if condition():
+            return True
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.0002)
+
+
+def image_shown(telemetry, position):
+    """
+    Check the telemetry for the image of the question at `position`.
+    """
+    for event in reversed(telemetry.events()):
+        if event["event"] == "shown" and event.get("position") == position:
+            return False  # Nothing since the question was shown
+        if event.get("position") == position and event["event"] in (
+            "image_loaded",
+            "image_failed",
+        ):
+            return True
+    return False
+
+
+def run_frontend(frontend, questions, width, height, delay, depth):
+    """
+    Play one whole quiz on a frontend in this process; returns the latencies.
+    """
+    from quiz_engine import ImagePrefetcher, QuizManager, Telemetry
+    from quiz_engine.decode import DecodePool
+    from quiz_engine.http_client import FetchClient
+    from quiz_engine.image_cache import ImageCache
+    from quiz_engine.images import ImageLoader
+    from quiz_engine.stub_server import StubImageServer
+
+    driver = TkDriver() if frontend == "tkinter" else QtDriver()
+    from user import User  # The frontend's own, importable now that it is on the path
+
+    photos = make_photos(questions, width, height)
+    samples = {metric: [] for metric in METRICS}
+    failed_images = 0
+    with StubImageServer(photos, delay=delay) as server, tempfile.TemporaryDirectory(
+        prefix="quiz-bench-"
+    ) as cache_dir:
+        fetch_client = FetchClient()
+        decode_pool = DecodePool()
+        image_prefetcher = ImagePrefetcher(
+            ImageLoader(fetch_client, ImageCache(cache_dir), decoder=decode_pool),
+            depth=depth,
+        )
+        telemetry = Telemetry()  # In memory: it tells when an image is shown
+        quiz_manager = QuizManager(make_bank(server, questions), seed=1)
+        ui = driver.make_ui(quiz_manager, User(), image_prefetcher, telemetry)
+        driver.pump()
+
+        driver.set_text(ui.name_entry, "Benchmark")
+        driver.set_text(ui.age_entry, "30")
+        driver.click(ui.start_button)
+        if not wait_until(driver, lambda: image_shown(telemetry, 0)):
+            print("Error: the first question's image never appeared")
+        for position in range(questions):
+            if position:
+                previous = driver.text(ui.question_label)
+                begin = time.perf_counter()
+                driver.click(ui.next_button)
+                driver.pump()
+                samples["next_ms"].append((time.perf_counter() - begin) * 1000)
+                if driver.text(ui.question_label) == previous:
+                    print(f"Error: question {position} was not drawn")
+                if not wait_until(driver, lambda: image_shown(telemetry, position)):
+                    print(f"Error: the image of question {position} never appeared")
+                samples["image_ms"].append((time.perf_counter() - begin) * 1000)
+            driver.click(ui.option_buttons[position % 2])
+            driver.pump()
+            begin = time.perf_counter()
+            driver.click(ui.submit_button)
+            driver.pump()
+            samples["submit_ms"].append((time.perf_counter() - begin) * 1000)
+            if not driver.text(ui.feedback_label):
+                print(f"Error: no feedback was drawn for question {position}")
+        failed_images = sum(
+            event["event"] == "image_failed" for event in telemetry.events()
+        )
+        driver.close()
+        image_prefetcher.shutdown()
+        fetch_client.close()
+        decode_pool.shutdown()
+    return {
+        "frontend": frontend,
+        "questions": questions,
+        "failed_images": failed_images,
+        **{metric: summarize(values) for metric, values in samples.items()},
+    }
+
+
+def start_virtual_display():
+    """
+    Start Xvfb on a free display; returns (process, display) or (None, None).
+    """
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None, None
+    read_end, write_end = os.pipe()
+    process = subprocess.Popen(
+        [
+            xvfb,
+            "-displayfd",
+            str(write_end),
+            "-screen",
+            "0",
+            "1024x768x24",
+            "-nolisten",
+            "tcp",
+        ],
+        pass_fds=(write_end,),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(write_end)
+    with os.fdopen(read_end) as pipe:
+        number = pipe.readline().strip()  # Xvfb writes its display number once ready
+    if not number:
+        process.terminate()
+        return None, None
+    return process, f":{number}"
+
+
+def check_budget(frontend, result, budget):
+    """
+    Return the measurements of a frontend whose p95 is over its budget.
+    """
+    limits = budget.get(frontend, {})
+    return [
+        metric
+        for metric in METRICS
+        if metric in limits and result[metric]["p95"] > limits[metric]
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=1200)
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="server delay per request, seconds"
+    )
+    parser.add_argument(
+        "--prefetch-depth", type=int, default=3, help="as in the frontends"
+    )
+    parser.add_argument("--frontends", nargs="+", choices=FRONTENDS, default=FRONTENDS)
+    parser.add_argument("--budget", default=DEFAULT_BUDGET)
+    parser.add_argument(
+        "--no-check",
+        dest="check",
+        action="store_false",
+        help="always exit with status 0, even when over budget",
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--child", choices=FRONTENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_frontend(
+            args.child,
+            args.questions,
+            args.width,
+            args.height,
+            args.delay,
+            args.prefetch_depth,
+        )
+        print(json.dumps(result))
+        return
+
+    with open(args.budget) as file:
+        budget = json.load(file)
+    results = []
+    over_budget = False
+    for frontend in args.frontends:
+        env = dict(os.environ)
+        display = None
+        if frontend == "tkinter" and not env.get("DISPLAY"):
+            display, env["DISPLAY"] = start_virtual_display()
+            if display is None:
+                print("tkinter: skipped, no display and Xvfb is not installed")
+                results.append({"frontend": frontend, "skipped": True})
+                continue
+        command = [sys.executable, os.path.abspath(__file__), "--child", frontend]
+        for option in ("questions", "width", "height", "delay", "prefetch_depth"):
+            command += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+        try:
+            output = subprocess.run(
+                command, capture_output=True, text=True, check=True, env=env
+            )
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr.strip().splitlines() or ["no output"])[-1]
+            print(f"Error: the {frontend} run failed: {error}")
+            results.append({"frontend": frontend, "skipped": True})
+            continue
+        finally:
+            if display is not None:
+                display.terminate()
+        result = json.loads(output.stdout.splitlines()[-1])
+        over = check_budget(frontend, result, budget)
+        over_budget = over_budget or bool(over)
+        results.append({**result, "over_budget": over})
+        print(
+            f"{frontend:>7}: "
+            + ", ".join(
+                f"{metric[:-3]} p50 {result[metric]['p50']:.1f} / "
+                f"p95 {result[metric]['p95']:.1f} ms"
+                for metric in METRICS
+            )
+            + (f" -- OVER BUDGET: {', '.join(over)}" if over else "")
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "benchmark": "ui",
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "settings": {
+                    key: value for key, value in vars(args).items() if key != "child"
+                },
+                "budget": budget,
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"Results written to {args.output}")
+    if args.check and over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,154 @@
+import argparse  # Import argparse to read command-line options
+import os  # Import os to locate the shared quiz engine
 import sys  # Import sys to handle system-specific parameters and functions
 
-from PyQt6.QtWidgets import QApplication
-from quiz_manager import QuizManager
-from user import User
-from user_interface import UserInterface
+# The quiz engine lives at the repository root, next to this frontend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from quiz_engine import ImagePrefetcher  # noqa: E402
+from quiz_engine.background import run_in_background  # noqa: E402
+from quiz_engine.asset_pack import open_asset_pack  # noqa: E402
+from quiz_engine.decode import DecodePool  # noqa: E402
+from quiz_engine.frontend import (  # noqa: E402
+    add_common_arguments,
+    check_common_arguments,
+    load_quiz,
+)
+from quiz_engine.http_client import FetchClient  # noqa: E402
+from quiz_engine.image_cache import ImageCache  # noqa: E402
+from quiz_engine.images import ImageLoader  # noqa: E402
+from quiz_engine.index import (  # noqa: E402
+    DEFAULT_HISTORY_PATH,
+    QuizPlan,
+    RecentQuestions,
+)
+from quiz_engine.leaderboard import Leaderboards  # noqa: E402
+from quiz_engine.results import ResultsStore  # noqa: E402
+from quiz_engine.telemetry import Telemetry  # noqa: E402
+from user import User  # noqa: E402
+from user_interface import UserInterface  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="PyQt6 quiz game")
+    add_common_arguments(parser)
+    parser.add_argument(
+        "--image-backend",
+        choices=("pil", "qt"),
+        default="pil",
+        help="load images with requests and PIL, or natively with Qt networking",
+    )
+    args = parser.parse_known_args()[0]  # Leave Qt's own options to QApplication
+    check_common_arguments(parser, args)
+    return args
 
 
 def main():
+    args = parse_args()  # Read the command-line options
     app = QApplication(sys.argv)  # Create the application instance
-    quiz_manager = QuizManager("data/questions.json")  # Initialize the quiz manager
+    profiler = None
+    if args.profile is not None:
+        # Only loaded when profiling, so normal runs pay nothing for it
+        from PyQt6.QtCore import QTimer
+        from quiz_engine.profiling import DEFAULT_PROFILE_DIR, Profiler
+
+        profiler = Profiler(args.profile or DEFAULT_PROFILE_DIR, "pyqt6")
+        profiler.instrument(UserInterface)  # Before the UI connects its slots
+        profiler.instrument_engine()
+        profiler.watch_event_loop(QTimer.singleShot)
+        profiler.start()
+    recent = None  # Questions of previous sessions, to avoid repeating them
+    if args.avoid_recent:
+        recent = RecentQuestions(args.avoid_recent, DEFAULT_HISTORY_PATH)
+    # Every player's session is assembled with the same options
+    quiz_plan = QuizPlan(
+        count=args.count,
+        category=args.category,
+        difficulty=args.difficulty,
+        tags=args.tag,
+        recent=recent,
+        adaptive=args.adaptive,
+    )
+    reloader = None
+    if args.watch:
+        from quiz_engine.reload import BankReloader  # Only needed when watching
+
+        reloader = BankReloader(args.questions)
+        reloader.subscribe(quiz_plan.apply_change)  # Next players get the changes
+    # Saves results in the background
+    results_store = ResultsStore(args.results_db) if args.results_db else None
+    leaderboards = Leaderboards()  # Today's top 10, shown with the results
+    # Load the questions (and the leaderboard) while the name and age screen
+    # is already up
+    quiz_loader = run_in_background(
+        load_quiz,
+        args,
+        quiz_plan,
+        reloader,
+        leaderboards,
+        results_store,
+        name="bank-loader",
+    )
+    asset_pack = open_asset_pack(args.asset_pack)  # Pre-rendered thumbnails, if built
+    fetch_client = None  # Pooled HTTP client, used by the PIL image backend only
+    decode_pool = None
+    if args.image_backend == "qt":
+        from qt_image_loader import QtImagePrefetcher  # Loads QtNetwork
+
+        image_prefetcher = QtImagePrefetcher(
+            args.image_cache_dir,
+            depth=args.prefetch_depth,
+            asset_pack=asset_pack,
+            max_pixels=args.max_image_pixels,
+            max_memory=args.max_image_memory * 1024 * 1024,
+        )
+    else:
+        fetch_client = FetchClient()
+        decode_pool = DecodePool(  # Decodes images outside the GUI process
+            args.decode_workers,
+            args.max_image_pixels,
+            args.max_image_memory * 1024 * 1024,
+        )
+        image_cache = ImageCache(args.image_cache_dir)
+        image_loader = ImageLoader(fetch_client, image_cache, decoder=decode_pool)
+        if reloader is not None:
+            # Edited questions may point at replaced images: check them again
+            reloader.subscribe(lambda change: image_cache.invalidate(*change.images()))
+        image_prefetcher = ImagePrefetcher(
+            image_loader, depth=args.prefetch_depth, asset_pack=asset_pack
+        )
     user = User()  # Initialize the user instance
-    ui = UserInterface(quiz_manager, user)  # Create the user interface
+    telemetry = Telemetry(args.telemetry)  # Per-question events, written in batches
+    ui = UserInterface(  # Create the user interface
+        quiz_loader,
+        user,
+        image_prefetcher,
+        asset_pack,
+        telemetry,
+        results_store,
+        leaderboards,
+        quiz_plan,
+    )
     ui.show()  # Show the user interface
-    sys.exit(app.exec())  # Execute the application
+    exit_code = app.exec()  # Execute the application
+    if profiler is not None:
+        prefix = profiler.close()  # Write the profile, then stop timing calls
+        print(profiler.report())
+        print(f"Profile written to {prefix}.pstats and {prefix}.latency.json")
+    if ui.quiz_started():
+        # Adaptive questions are only known once they have been asked
+        quiz_plan.session_finished(ui.quiz_manager)
+    if reloader is not None:
+        reloader.stop()  # Stop watching the question file
+    image_prefetcher.shutdown()  # Drop image loads that are no longer needed
+    if fetch_client is not None:
+        fetch_client.close()  # Close pooled connections
+        decode_pool.shutdown()  # Stop the decoder processes
+    if results_store is not None:
+        results_store.close()  # Commit the last results
+    telemetry.close()  # Write out the remaining events
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
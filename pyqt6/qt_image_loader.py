@@ -0,0 +1,135 @@
+import os  # Import os to place the network cache
+from concurrent.futures import Future  # Import Future to hand out pending images
+
+from PyQt6.QtCore import QBuffer, QIODevice, QSize, QUrl
+from PyQt6.QtGui import QImageReader
+from PyQt6.QtNetwork import (
+    QNetworkAccessManager,
+    QNetworkDiskCache,
+    QNetworkReply,
+    QNetworkRequest,
+)
+from quiz_engine.decode import DEFAULT_MAX_MEMORY, DEFAULT_MAX_PIXELS
+from quiz_engine.http_client import DEFAULT_READ_TIMEOUT, REQUEST_HEADERS
+from quiz_engine.image_cache import DEFAULT_MAX_BYTES
+from quiz_engine.images import THUMBNAIL_SIZE, ImageLoadError
+from quiz_engine.prefetch import (
+    DEFAULT_DEPTH,
+    DEFAULT_WORKERS,
+    ImagePrefetcher,
+    LoadToken,
+)
+
+
+class QtImagePrefetcher(ImagePrefetcher):
+    """
+    Image prefetcher that loads images with Qt instead of requests and PIL.
+
+    Downloads run asynchronously on the Qt event loop through one
+    QNetworkAccessManager, so no Python thread waits on the network.
+    QImageReader then decodes each image straight to the thumbnail size on
+    the worker pool (Qt releases the GIL while decoding) and the futures
+    resolve to QImage objects, ready for QPixmap.fromImage.
+
+    Must be created and advanced on the GUI thread.
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        depth=DEFAULT_DEPTH,
+        max_workers=DEFAULT_WORKERS,
+        asset_pack=None,
+        size=THUMBNAIL_SIZE,
+        max_pixels=DEFAULT_MAX_PIXELS,
+        max_memory=DEFAULT_MAX_MEMORY,
+    ):
+        """
+        Initialize the prefetcher, caching downloads in `cache_dir` if given.
+        """
+        super().__init__(self.decode, depth, max_workers, asset_pack)
+        self.size = QSize(*size)  # Size the images are decoded at
+        self.max_pixels = max_pixels  # Largest accepted source, in pixels
+        # Qt refuses to allocate decode buffers larger than this (in MB)
+        QImageReader.setAllocationLimit(max(1, max_memory // (1024 * 1024)))
+        self.network = QNetworkAccessManager()  # Shared, keeps connections alive
+        if cache_dir:
+            cache = QNetworkDiskCache(self.network)
+            cache.setCacheDirectory(os.path.join(cache_dir, "qt"))
+            cache.setMaximumCacheSize(DEFAULT_MAX_BYTES)
+            self.network.setCache(cache)
+        self._replies = {}  # LoadToken -> QNetworkReply still downloading
+
+    def _start(self, image_path):
+        """
+        Start downloading an image and return its (Future, LoadToken) pair.
+        """
+        future = Future()
+        token = LoadToken()
+        if image_path.startswith("http"):
+            url = QUrl(image_path)
+        else:
+            url = QUrl.fromLocalFile(os.path.abspath(image_path))
+        request = QNetworkRequest(url)
+        request.setRawHeader(b"User-Agent", REQUEST_HEADERS["User-Agent"].encode())
+        request.setTransferTimeout(int(DEFAULT_READ_TIMEOUT * 1000))
+        reply = self.network.get(request)
+        self._replies[token] = reply
+        reply.finished.connect(
+            lambda: self._downloaded(image_path, reply, future, token)
+        )
+        return future, token
+
+    def _cancel(self, future, token):
+        """
+        Cancel a load, aborting its download if it is still running.
+        """
+        super()._cancel(future, token)
+        reply = self._replies.pop(token, None)
+        if reply is not None:
+            reply.abort()
+
+    def _downloaded(self, image_path, reply, future, token):
+        """
+        Queue a finished download for decoding on the worker pool.
+        """
+        self._replies.pop(token, None)
+        reply.deleteLater()
+        if token.cancelled:
+            return
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            future.set_exception(ImageLoadError(f"{image_path}: {reply.errorString()}"))
+            return
+        data = reply.readAll()
+        try:
+            self._executor.submit(self._resolve, future, image_path, data, token)
+        except RuntimeError:
+            future.cancel()  # The prefetcher has been shut down
+
+    def _resolve(self, future, image_path, data, token):
+        if token.cancelled or not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.loader(image_path, data))
+        except ImageLoadError as e:
+            future.set_exception(e)
+
+    def decode(self, image_path, data):
+        """
+        Decode downloaded image bytes directly at the thumbnail size.
+        """
+        buffer = QBuffer()
+        buffer.setData(data)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        reader = QImageReader(buffer)
+        source = reader.size()
+        if source.width() * source.height() > self.max_pixels:
+            raise ImageLoadError(
+                f"{image_path}: image is {source.width()}x{source.height()}, "
+                f"more than {self.max_pixels} pixels"
+            )
+        reader.setScaledSize(self.size)
+        image = reader.read()
+        if image.isNull():
+            raise ImageLoadError(f"{image_path}: {reader.errorString()}")
+        return image
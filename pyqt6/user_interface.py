@@ -1,14 +1,10 @@
+import secrets  # Import secrets to identify sessions in the telemetry
 import time  # Import time to handle timing functions
-from io import BytesIO  # Import BytesIO for handling image data
-from threading import (  # Import Thread and Lock for handling asynchronous tasks
-    Lock,
-    Thread,
-)
+from concurrent.futures import Future  # Import Future to accept a loading quiz
+from threading import Lock  # Import Lock for handling asynchronous tasks
 
-import requests  # Import requests for downloading images
-from PIL import Image, ImageQt, UnidentifiedImageError  # Import PIL for handling images
 from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal  # Import PyQt6 modules
-from PyQt6.QtGui import QFont, QPixmap
+from PyQt6.QtGui import QFont, QImage, QPixmap
 from PyQt6.QtWidgets import (
     QButtonGroup,
     QGridLayout,
@@ -20,10 +16,14 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
+from quiz_engine import ImagePrefetcher, LoadCancelled, QuizManager, Telemetry
+from quiz_engine.images import ImageLoadError
 
 
 class SignalEmitter(QObject):
-    image_loaded = pyqtSignal(QPixmap)
+    image_loaded = pyqtSignal(object, int)  # Image and its load generation
+    image_failed = pyqtSignal(int)  # Load generation
+    quiz_loaded = pyqtSignal()  # The question bank has finished loading
 
 
 class UserInterface(QWidget):
@@ -31,14 +31,39 @@ class UserInterface(QWidget):
     Class to manage the graphical user interface of the quiz application.
     """
 
-    def __init__(self, quiz_manager, user):
+    def __init__(
+        self,
+        quiz_manager,
+        user,
+        image_prefetcher=None,
+        asset_pack=None,
+        telemetry=None,
+        results_store=None,
+        leaderboards=None,
+        quiz_plan=None,
+    ):
         """
         Initialize the UserInterface with the root window, quiz manager, and user.
+
+        `quiz_manager` may also be a Future of one, while the questions are
+        still loading; the quiz then starts once it is ready. `quiz_plan`
+        starts the session of each next player on the same bank.
         """
         super().__init__()
 
         self.quiz_manager = quiz_manager  # Instance of QuizManager to handle quiz logic
         self.user = user  # Instance of User to store user details
+        # Instance of ImagePrefetcher to load question images ahead of time
+        self.image_prefetcher = image_prefetcher or ImagePrefetcher(
+            asset_pack=asset_pack
+        )
+        self.asset_pack = asset_pack  # Pre-rendered thumbnails, or None
+        # Per-question event stream; kept in memory only if none is given
+        self.telemetry = telemetry or Telemetry()
+        self.session_id = secrets.token_hex(8)  # Identifies this session's events
+        self.results_store = results_store  # ResultsStore saving results, or None
+        self.leaderboards = leaderboards  # Live top lists shown with the results
+        self.quiz_plan = quiz_plan  # QuizPlan for the next player's session, or None
 
         self.selected_option = None  # Variable to store the selected option
         self.start_time = time.time()  # Track the start time of the quiz
@@ -51,9 +76,13 @@ class UserInterface(QWidget):
         self.header_frame_widget = QWidget()
         self.quiz_frame_widget = QWidget()
         self.button_frame_widget = QWidget()
+        self.result_frame_widget = None  # Built when the first quiz is over
+        self.quiz_frames_built = False  # The quiz widgets are built once, then reused
 
         self.signal_emitter = SignalEmitter()
         self.signal_emitter.image_loaded.connect(self.display_image)
+        self.signal_emitter.image_failed.connect(self.clear_image)
+        self.signal_emitter.quiz_loaded.connect(self.wait_for_quiz)
         self.lock = Lock()
 
         self.create_user_details_frame()  # Create the initial frame for user details
@@ -85,13 +114,13 @@ class UserInterface(QWidget):
         age_layout.addWidget(self.age_entry)
         layout.addLayout(age_layout)
 
-        start_button = QPushButton("Start Quiz")
-        start_button.clicked.connect(self.start_quiz)
-        layout.addWidget(start_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.start_button = QPushButton("Start Quiz")
+        self.start_button.clicked.connect(self.start_quiz)
+        layout.addWidget(self.start_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
-        self.feedback_label = QLabel("", alignment=Qt.AlignmentFlag.AlignCenter)
-        self.feedback_label.setStyleSheet("color: red;")
-        layout.addWidget(self.feedback_label)
+        self.details_feedback_label = QLabel("", alignment=Qt.AlignmentFlag.AlignCenter)
+        self.details_feedback_label.setStyleSheet("color: red;")
+        layout.addWidget(self.details_feedback_label)
 
         self.user_details_frame_widget.setLayout(layout)
         self.layout.addWidget(self.user_details_frame_widget)
@@ -104,27 +133,63 @@ class UserInterface(QWidget):
         self.user.age = self.age_entry.text()
 
         if not self.user.name or not self.user.age:
-            self.feedback_label.setText("Please enter all details")
+            self.details_feedback_label.setText("Please enter all details")
             return
 
         try:
             self.user.age = int(self.user.age)
         except ValueError:
-            self.feedback_label.setText("Age must be a number")
+            self.details_feedback_label.setText("Age must be a number")
+            return
+
+        if isinstance(self.quiz_manager, Future):
+            self.wait_for_quiz()
             return
 
         self.user_details_frame_widget.hide()
-        self.create_header_frame()
-        self.create_quiz_frame()
+        if self.quiz_frames_built:
+            self.show_quiz_frames()
+        else:
+            self.create_header_frame()
+            self.create_quiz_frame()
+            self.quiz_frames_built = True
         self.load_question()
 
+    def wait_for_quiz(self):
+        """
+        Start the quiz as soon as the questions have finished loading.
+        """
+        loader = self.quiz_manager
+        if loader.done():
+            try:
+                self.quiz_manager = loader.result()
+            except Exception as e:
+                print(f"Error: Could not load the questions: {e}")
+                self.details_feedback_label.setText("Could not load the questions")
+                return
+            self.details_feedback_label.setText("")
+            self.start_button.setEnabled(True)  # Ready for the next player too
+            self.start_quiz()
+            return
+        self.details_feedback_label.setText("Loading questions...")
+        self.start_button.setEnabled(False)
+        loader.add_done_callback(lambda _: self.signal_emitter.quiz_loaded.emit())
+
+    def quiz_started(self):
+        """
+        Check if the player got past the name and age screen.
+        """
+        return not isinstance(self.quiz_manager, Future)
+
     def create_header_frame(self):
         """
         Create the header frame to display user details, score, and time.
         """
         header_layout = QHBoxLayout()
-        header_layout.addWidget(QLabel(f"Name: {self.user.name}"))
-        header_layout.addWidget(QLabel(f"Age: {self.user.age}"))
+        self.name_label = QLabel(f"Name: {self.user.name}")
+        header_layout.addWidget(self.name_label)
+        self.age_label = QLabel(f"Age: {self.user.age}")
+        header_layout.addWidget(self.age_label)
         self.score_label = QLabel(
             f"Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}",
             alignment=Qt.AlignmentFlag.AlignCenter,
@@ -138,6 +203,24 @@ class UserInterface(QWidget):
         self.layout.addWidget(self.header_frame_widget)
         self.update_time()
 
+    def show_quiz_frames(self):
+        """
+        Show the header, quiz and button frames again for the next player.
+        """
+        self.name_label.setText(f"Name: {self.user.name}")
+        self.age_label.setText(f"Age: {self.user.age}")
+        self.score_label.setText(
+            f"Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}"
+        )
+        self.time_label.setText("Time: 0s")
+        self.submit_button.show()
+        self.next_button.show()
+        self.quit_button.show()
+        self.header_frame_widget.show()
+        self.quiz_frame_widget.show()
+        self.button_frame_widget.show()
+        self.update_time()
+
     def create_quiz_frame(self):
         """
         Create the frame for displaying quiz questions and options.
@@ -212,9 +295,18 @@ class UserInterface(QWidget):
             )
 
             self.question_label.setText(question)
-            if image_path:
-                thread = Thread(target=self.load_image, args=(image_path,))
-                thread.start()
+            self.telemetry.question_shown(self.quiz_manager, self.session_id)
+            # Fetch this question's image (usually already prefetched) and
+            # start loading the images of the next few questions
+            packed_image = self.asset_pack.get(image_path) if self.asset_pack else None
+            image_future = self.image_prefetcher.advance(self.quiz_manager)
+            generation = self.image_prefetcher.generation
+            if packed_image is not None:
+                self.display_packed_image(packed_image)
+            elif image_future is not None:
+                image_future.add_done_callback(
+                    lambda future: self.load_image(future, generation)
+                )
             else:
                 self.image_label.clear()
 
@@ -229,34 +321,62 @@ class UserInterface(QWidget):
         else:
             self.show_results()
 
-    def load_image(self, image_path):
+    def load_image(self, image_future, generation):
         """
-        Load an image from a URL or file path and display it.
+        Hand the prefetched image over to the GUI thread once it has loaded.
+
+        Images for a question the player has already left are dropped.
         """
+        if image_future.cancelled() or not self.image_prefetcher.is_current(generation):
+            return
         try:
-            if image_path.startswith("http"):
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
-                }
-                response = requests.get(image_path, headers=headers)
-                response.raise_for_status()
-                img_data = response.content
-                image = Image.open(BytesIO(img_data))
-            else:
-                image = Image.open(image_path)
-            image = image.resize((200, 200), Image.LANCZOS)
-            pixmap = QPixmap.fromImage(ImageQt.ImageQt(image))
-            self.signal_emitter.image_loaded.emit(pixmap)
-        except (requests.exceptions.RequestException, UnidentifiedImageError) as e:
+            image = image_future.result()
+        except LoadCancelled:
+            return
+        except ImageLoadError as e:
             print(f"Error loading image: {e}")
-            self.image_label.clear()
+            self.signal_emitter.image_failed.emit(generation)
+            return
+        self.signal_emitter.image_loaded.emit(image, generation)
+
+    def display_image(self, image, generation):
+        """
+        Display the image on the label, unless it is already out of date.
+
+        Accepts a PIL image or, from the Qt image backend, a QImage.
+        """
+        if not self.image_prefetcher.is_current(generation):
+            return
+        if not isinstance(image, QImage):
+            from PIL import ImageQt  # Only needed for the PIL image backend
+
+            # Copy the QImage: ImageQt only borrows the PIL buffer, which the
+            # pixmap may otherwise keep pointing at after it has been freed
+            image = ImageQt.ImageQt(image).copy()
+        pixmap = QPixmap.fromImage(image)
+        with self.lock:
+            self.image_label.setPixmap(pixmap)
+        self.telemetry.image_loaded(self.quiz_manager, self.session_id, "loader")
 
-    def display_image(self, pixmap):
+    def display_packed_image(self, png_data):
         """
-        Display the image on the label.
+        Display a pre-rendered thumbnail from the asset pack.
         """
+        pixmap = QPixmap()
+        pixmap.loadFromData(png_data, "PNG")
         with self.lock:
             self.image_label.setPixmap(pixmap)
+        self.telemetry.image_loaded(self.quiz_manager, self.session_id, "pack")
+
+    def clear_image(self, generation):
+        """
+        Remove the image from the label after a failed load.
+        """
+        if not self.image_prefetcher.is_current(generation):
+            return
+        with self.lock:
+            self.image_label.clear()
+        self.telemetry.image_failed(self.quiz_manager, self.session_id)
 
     def enable_submit_button(self):
         """
@@ -272,7 +392,17 @@ class UserInterface(QWidget):
         selected_button = self.button_group.checkedButton()
         if selected_button:
             selected_option = selected_button.text()
-            if self.quiz_manager.check_answer(selected_option, self.correct_answer):
+            correct = self.quiz_manager.check_answer(
+                selected_option, self.correct_answer
+            )
+            self.telemetry.question_answered(
+                self.quiz_manager, self.session_id, selected_option, correct
+            )
+            if self.results_store is not None:
+                self.results_store.record_answer(
+                    self.quiz_manager, self.session_id, selected_option, correct
+                )
+            if correct:
                 self.feedback_label.setText("Correct!")
                 self.feedback_label.setStyleSheet("color: green;")
             else:
@@ -306,14 +436,17 @@ class UserInterface(QWidget):
         elapsed_time = int(time.time() - self.start_time)
         self.time_label.setText(f"Time: {elapsed_time}s")
 
-    def update_time(self):
+    def update_time(self, session=None):
         """
-        Update the elapsed time every second.
+        Update the elapsed time every second, until the session is over.
         """
-        if not self.quiz_manager.is_quiz_over():
+        if session is None:
+            session = self.quiz_manager
+        # Stop once the player has moved on, so sessions never share a timer
+        if session is self.quiz_manager and not session.is_quiz_over():
             elapsed_time = int(time.time() - self.start_time)
             self.time_label.setText(f"Time: {elapsed_time}s")
-            QTimer.singleShot(1000, self.update_time)
+            QTimer.singleShot(1000, lambda: self.update_time(session))
 
     def show_results(self):
         """
@@ -330,6 +463,25 @@ class UserInterface(QWidget):
             self.quiz_manager.next_question()
 
         elapsed_time = time.time() - self.start_time
+        self.telemetry.session_finished(
+            self.quiz_manager, self.session_id, elapsed_time
+        )
+        if self.results_store is not None:
+            self.results_store.record_session(
+                self.quiz_manager,
+                self.session_id,
+                self.user.name,
+                self.user.age,
+                elapsed_time,
+            )
+        rank = None  # Place on today's leaderboard
+        if self.leaderboards is not None:
+            rank = self.leaderboards.record(
+                self.user.name,
+                self.quiz_manager.score,
+                self.quiz_manager.current_question_index,
+                elapsed_time,
+            )
         average_time = (
             elapsed_time / self.quiz_manager.current_question_index
             if self.quiz_manager.current_question_index
@@ -338,7 +490,26 @@ class UserInterface(QWidget):
         self.quiz_frame_widget.hide()
         self.button_frame_widget.hide()
 
-        result_frame = QWidget()
+        if self.result_frame_widget is None:
+            self.create_result_frame()
+        self.result_name_label.setText(f"Name: {self.user.name}")
+        self.result_age_label.setText(f"Age: {self.user.age}")
+        self.result_score_label.setText(
+            f"Your Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}"
+        )
+        self.result_time_label.setText(f"Total Time: {int(elapsed_time)} seconds")
+        self.result_average_label.setText(
+            f"Average Time per Question: {average_time:.2f} seconds"
+        )
+        if self.leaderboards is not None:
+            self.leaderboard_label.setText(self.leaderboard_text(rank))
+        self.result_frame_widget.show()
+
+    def create_result_frame(self):
+        """
+        Create the frame for the quiz results, reused for every player.
+        """
+        self.result_frame_widget = QWidget()
         result_layout = QVBoxLayout()
 
         result_layout.addWidget(
@@ -348,35 +519,75 @@ class UserInterface(QWidget):
                 font=QFont("Arial", 24),
             )
         )
-        result_layout.addWidget(
-            QLabel(f"Name: {self.user.name}", alignment=Qt.AlignmentFlag.AlignCenter)
-        )
-        result_layout.addWidget(
-            QLabel(f"Age: {self.user.age}", alignment=Qt.AlignmentFlag.AlignCenter)
+        self.result_name_label = QLabel(alignment=Qt.AlignmentFlag.AlignCenter)
+        result_layout.addWidget(self.result_name_label)
+        self.result_age_label = QLabel(alignment=Qt.AlignmentFlag.AlignCenter)
+        result_layout.addWidget(self.result_age_label)
+        self.result_score_label = QLabel(
+            alignment=Qt.AlignmentFlag.AlignCenter, font=QFont("Arial", 18)
         )
-        result_layout.addWidget(
-            QLabel(
-                f"Your Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}",
-                alignment=Qt.AlignmentFlag.AlignCenter,
-                font=QFont("Arial", 18),
-            )
-        )
-        result_layout.addWidget(
-            QLabel(
-                f"Total Time: {int(elapsed_time)} seconds",
-                alignment=Qt.AlignmentFlag.AlignCenter,
-            )
-        )
-        result_layout.addWidget(
-            QLabel(
-                f"Average Time per Question: {average_time:.2f} seconds",
-                alignment=Qt.AlignmentFlag.AlignCenter,
+        result_layout.addWidget(self.result_score_label)
+        self.result_time_label = QLabel(alignment=Qt.AlignmentFlag.AlignCenter)
+        result_layout.addWidget(self.result_time_label)
+        self.result_average_label = QLabel(alignment=Qt.AlignmentFlag.AlignCenter)
+        result_layout.addWidget(self.result_average_label)
+
+        if self.leaderboards is not None:
+            result_layout.addWidget(
+                QLabel(
+                    "Today's Top 10",
+                    alignment=Qt.AlignmentFlag.AlignCenter,
+                    font=QFont("Arial", 14),
+                )
             )
-        )
+            self.leaderboard_label = QLabel(alignment=Qt.AlignmentFlag.AlignCenter)
+            result_layout.addWidget(self.leaderboard_label)
 
+        result_buttons = QHBoxLayout()
+        self.play_again_button = QPushButton("Play Again")
+        self.play_again_button.clicked.connect(self.play_again)
+        result_buttons.addWidget(self.play_again_button)
         close_button = QPushButton("Close")
         close_button.clicked.connect(self.close)
-        result_layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        result_buttons.addWidget(close_button)
+        result_layout.addLayout(result_buttons)
+
+        self.result_frame_widget.setLayout(result_layout)
+        self.layout.addWidget(self.result_frame_widget)
 
-        result_frame.setLayout(result_layout)
-        self.layout.addWidget(result_frame)
+    def play_again(self):
+        """
+        Start a new session on the loaded bank and ask the next player's details.
+
+        The frames and widgets of the last quiz are reused, so the next
+        player is ready to go without loading or building anything again.
+        """
+        if self.quiz_plan is not None:
+            self.quiz_plan.session_finished(self.quiz_manager)
+            # On the plan's latest bank, which may have been reloaded
+            self.quiz_manager = self.quiz_plan.new_session()
+        else:
+            self.quiz_manager = QuizManager(self.quiz_manager.bank)
+        self.session_id = secrets.token_hex(8)
+        self.start_time = time.time()
+        self.total_time = 0
+
+        self.result_frame_widget.hide()
+        self.name_entry.clear()
+        self.age_entry.clear()
+        self.details_feedback_label.setText("")
+        self.user_details_frame_widget.show()
+        self.name_entry.setFocus()
+
+    def leaderboard_text(self, rank):
+        """
+        Format today's leaderboard, marking this player's place on it.
+        """
+        lines = []
+        for place, entry in enumerate(self.leaderboards.top("day"), start=1):
+            marker = "  <- you" if place == rank else ""
+            lines.append(
+                f"{place}. {entry.player}  {entry.score}/{entry.answered}"
+                f"  {entry.elapsed or 0:.0f}s{marker}"
+            )
+        return "\n".join(lines) or "No results yet"
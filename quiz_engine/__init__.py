@@ -0,0 +1,34 @@
+"""
+Headless quiz engine shared by the Tkinter and PyQt6 frontends.
+"""
+
+from .adaptive import AdaptiveSelector, DifficultyIndex
+from .bank import Question, QuestionBank, load_bank
+from .compiled_bank import CompiledBank, compile_bank
+from .index import BankIndex, QuizPlan, RecentQuestions, assemble_quiz
+from .prefetch import ImagePrefetcher, LoadCancelled, LoadToken
+from .session import QuizManager
+from .streaming import StreamingBank, iter_questions, reservoir_sample
+from .telemetry import Telemetry
+
+__all__ = [
+    "AdaptiveSelector",
+    "BankIndex",
+    "CompiledBank",
+    "DifficultyIndex",
+    "ImagePrefetcher",
+    "LoadCancelled",
+    "LoadToken",
+    "Question",
+    "QuestionBank",
+    "QuizManager",
+    "QuizPlan",
+    "RecentQuestions",
+    "StreamingBank",
+    "Telemetry",
+    "assemble_quiz",
+    "compile_bank",
+    "iter_questions",
+    "load_bank",
+    "reservoir_sample",
+]
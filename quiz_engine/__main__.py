@@ -0,0 +1,200 @@
+"""
+Command-line tools for the quiz engine.
+
+Usage:
+    python -m quiz_engine analyze [questions] [--db file] [--update]
+    python -m quiz_engine build-assets [questions] [-o output]
+    python -m quiz_engine compile-bank [questions] [-o output]
+    python -m quiz_engine export-results [--db file] [-o directory]
+    python -m quiz_engine serve [questions] [--host host] [--port port] [--telemetry file]
+                                [--watch]
+"""
+
+import argparse  # Import argparse to read command-line options
+import asyncio  # Import asyncio to run the quiz server
+import json  # Import json to write analysis reports
+import os  # Import os to check that input files exist
+
+from .asset_pack import DEFAULT_PACK_PATH, build_asset_pack
+from .bank import load_bank
+from .compiled_bank import compile_bank
+from .reload import BankReloader
+from .results import DEFAULT_RESULTS_PATH, ResultsStore
+from .server import DEFAULT_HOST, DEFAULT_PORT, QuizServer
+from .telemetry import Telemetry
+
+DEFAULT_QUESTIONS_PATH = "data/questions.json"
+DEFAULT_COMPILED_PATH = "data/questions.qbank"
+
+
+def analyze_answers(args):
+    """
+    Report which questions are too easy, too hard or misleading.
+    """
+    from .analysis import analyze, apply_difficulty, save_questions
+    from .compiled_bank import is_compiled_bank
+
+    if not os.path.exists(args.db):
+        print(f"Error: The results database {args.db} was not found.")
+        return
+    if args.update and is_compiled_bank(args.questions):
+        print(
+            f"Error: {args.questions} is a compiled bank; run --update on the"
+            " question file it was built from and compile it again."
+        )
+        return
+    bank = load_bank(args.questions)
+    report = analyze(bank, args.db, args.log_dir).report(args.min_answers)
+    judged = [row for row in report if "suggested_difficulty" in row]
+    print(f"{len(judged)} of {len(report)} questions have {args.min_answers}+ answers")
+    for row in judged:
+        if row["flags"]:
+            print(
+                f"  {', '.join(row['flags']):<22} p={row['p_value']:.2f}"
+                f" r={row['point_biserial'] or 0:+.2f}  {row['question']}"
+            )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        print(f"Report written to {args.json}")
+    if args.update:
+        try:
+            save_questions(apply_difficulty(bank, report), args.questions)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not update {args.questions}: {e}")
+            return
+        print(f"Difficulty labels in {args.questions} updated from the answers")
+
+
+def build_assets(args):
+    """
+    Pre-render the thumbnails of every question image into an asset pack.
+    """
+    from .image_cache import ImageCache
+    from .images import ImageLoader
+
+    bank = load_bank(args.questions)
+    loader = ImageLoader(cache=ImageCache())
+    count = build_asset_pack(bank, args.output, loader)
+    loader.client.close()
+    print(f"Wrote {count} thumbnails to {args.output}")
+
+
+def compile_questions(args):
+    """
+    Compile a JSON question file into the binary bank format.
+    """
+    count = compile_bank(load_bank(args.questions), args.output)
+    print(f"Compiled {count} questions into {args.output}")
+
+
+def export_results(args):
+    """
+    Export every saved session and answer to CSV files.
+    """
+    if not os.path.exists(args.db):
+        print(f"Error: The results database {args.db} was not found.")
+        return
+    store = ResultsStore(args.db)
+    sessions, answers = store.export_csv(args.output)
+    store.close()
+    print(f"Exported {sessions} sessions and {answers} answers to {args.output}")
+
+
+def serve(args):
+    """
+    Run the headless quiz server.
+    """
+    telemetry = Telemetry(args.telemetry) if args.telemetry else None
+    reloader = BankReloader(args.questions) if args.watch else None
+    bank = reloader.load() if reloader is not None else load_bank(args.questions)
+    server = QuizServer(bank, args.host, args.port, telemetry=telemetry)
+
+    async def run():
+        if reloader is not None:
+            # Changes are found on the reloader's thread, applied on the loop
+            loop = asyncio.get_running_loop()
+            reloader.subscribe(
+                lambda change: loop.call_soon_threadsafe(server.apply_change, change)
+            )
+            reloader.start()
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if reloader is not None:
+            reloader.stop()
+        if telemetry is not None:
+            telemetry.close()
+
+
+def main(argv=None):
+    """
+    Run one of the engine's command-line tools.
+    """
+    parser = argparse.ArgumentParser(prog="python -m quiz_engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analysis = commands.add_parser(
+        "analyze", help="find questions that are too easy, too hard or misleading"
+    )
+    analysis.add_argument("questions", nargs="?", default=DEFAULT_QUESTIONS_PATH)
+    analysis.add_argument("--db", default=DEFAULT_RESULTS_PATH)
+    analysis.add_argument(
+        "--log-dir",
+        default=os.path.join(os.path.dirname(DEFAULT_RESULTS_PATH), "answer_log"),
+        help="where the columnar copy of the answers is kept",
+    )
+    analysis.add_argument("--min-answers", type=int, default=30)
+    analysis.add_argument("--json", metavar="FILE", help="write the full report here")
+    analysis.add_argument(
+        "--update",
+        action="store_true",
+        help="rewrite the question file with difficulty labels from the answers",
+    )
+    analysis.set_defaults(handler=analyze_answers)
+
+    assets = commands.add_parser(
+        "build-assets", help="pre-render question thumbnails into an asset pack"
+    )
+    assets.add_argument("questions", nargs="?", default=DEFAULT_QUESTIONS_PATH)
+    assets.add_argument("-o", "--output", default=DEFAULT_PACK_PATH)
+    assets.set_defaults(handler=build_assets)
+
+    bank = commands.add_parser(
+        "compile-bank", help="compile a JSON question file into a binary bank"
+    )
+    bank.add_argument("questions", nargs="?", default=DEFAULT_QUESTIONS_PATH)
+    bank.add_argument("-o", "--output", default=DEFAULT_COMPILED_PATH)
+    bank.set_defaults(handler=compile_questions)
+
+    export = commands.add_parser(
+        "export-results", help="export saved results to sessions.csv and answers.csv"
+    )
+    export.add_argument("--db", default=DEFAULT_RESULTS_PATH)
+    export.add_argument("-o", "--output", default="results")
+    export.set_defaults(handler=export_results)
+
+    server = commands.add_parser("serve", help="run the headless quiz server")
+    server.add_argument("questions", nargs="?", default=DEFAULT_QUESTIONS_PATH)
+    server.add_argument("--host", default=DEFAULT_HOST)
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    server.add_argument(
+        "--telemetry", metavar="FILE", help="append per-question events to this file"
+    )
+    server.add_argument(
+        "--watch",
+        action="store_true",
+        help="reload the question file when it changes, for new sessions",
+    )
+    server.set_defaults(handler=serve)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
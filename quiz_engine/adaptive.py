@@ -0,0 +1,271 @@
+import math  # Import math for the logistic model
+import random  # Import random to break ties between equally hard questions
+from array import array  # Import array to store the index compactly
+from bisect import bisect_left, bisect_right  # Import bisect to search the index
+
+# Item difficulty on the logit scale of the 1PL (Rasch) model for each label
+DIFFICULTY_RATINGS = {"easy": -1.0, "medium": 0.0, "hard": 1.0}
+MAX_RATING = 4.0  # Ratings are kept within +-MAX_RATING logits
+INITIAL_STEP = 1.0  # Ability change per surprise at the first answer
+MIN_STEP = 0.25  # Smallest ability change, so late answers still count
+STEP_DECAY = 0.25  # How fast the step shrinks with every answer
+
+
+def _clamp(rating):
+    return max(-MAX_RATING, min(MAX_RATING, rating))
+
+
+def rating_for(question):
+    """
+    Return the difficulty rating of a question from its difficulty label.
+    """
+    return DIFFICULTY_RATINGS.get(question.difficulty, 0.0)
+
+
+def rating_for_p_value(p_value):
+    """
+    Return the difficulty rating that makes an average player right `p_value`
+    of the time, e.g. a p-value from the item analysis of saved answers.
+    """
+    p_value = min(max(p_value, 0.01), 0.99)
+    return _clamp(math.log((1.0 - p_value) / p_value))
+
+
+def item_ratings(bank, report=None, min_answers=30):
+    """
+    Return the difficulty rating of every question of a bank, by position.
+
+    Questions judged in an analysis `report` (see analysis.ItemAnalysis)
+    with at least `min_answers` answers are rated by how often they were
+    answered right; the others by their difficulty label.
+    """
+    measured = {}
+    for row in report or ():
+        if row["answers"] >= min_answers and row["p_value"] is not None:
+            measured[row["question"]] = rating_for_p_value(row["p_value"])
+    return [measured.get(question.text, rating_for(question)) for question in bank]
+
+
+def _find(ratings, positions, rating, position):
+    """
+    Return the slot of a position with a given rating, or None.
+
+    Entries are sorted by rating, then by position.
+    """
+    low = bisect_left(ratings, rating)
+    high = bisect_right(ratings, rating, low)
+    slot = bisect_left(positions, position, low, high)
+    if slot < high and positions[slot] == position:
+        return slot
+    return None
+
+
+class DifficultyIndex:
+    """
+    Bank positions sorted by difficulty rating.
+
+    Finding the unused question closest to a rating is a binary search
+    followed by a walk past the questions already used, so a pick costs
+    O(log n + k) for a bank of n questions of which k were asked. The index
+    is never modified, so one index can be shared by many sessions.
+    """
+
+    def __init__(self, bank, positions=None, ratings=None):
+        """
+        Build the index over `positions` of the bank (all of them by default).
+
+        `ratings` gives the rating of every bank position (see
+        item_ratings); ratings come from the difficulty labels by default.
+        """
+        if ratings is None:
+            ratings = item_ratings(bank)  # Reads every question, like BankIndex
+        if positions is None:
+            positions = range(len(ratings))
+        pairs = [(ratings[position], position) for position in positions]
+        pairs.sort()
+        self.bank = bank
+        self.ratings = array("d", (rating for rating, _ in pairs))
+        self.positions = array("I", (position for _, position in pairs))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def subset(self, positions):
+        """
+        Return an index of only the given bank positions, with their ratings.
+
+        The result is filtered from this index, so it needs no sorting.
+        """
+        wanted = set(positions)
+        index = DifficultyIndex.__new__(DifficultyIndex)
+        index.bank = self.bank
+        index.ratings = array("d")
+        index.positions = array("I")
+        for rating, position in zip(self.ratings, self.positions):
+            if position in wanted:
+                index.ratings.append(rating)
+                index.positions.append(position)
+        return index
+
+    def updated(self, change):
+        """
+        Return the index of a reloaded bank (see reload.BankChange).
+
+        This index must cover the whole bank. Changed questions are rated
+        by their difficulty label; the arrays are copied and only their
+        entries are moved, so nothing is sorted again. This index stays as
+        it is for the sessions still using the old bank.
+        """
+        ratings = array("d", self.ratings)
+        positions = array("I", self.positions)
+        for position, before, after in change.changes:
+            if before is not None:
+                slot = _find(ratings, positions, rating_for(before), position)
+                if slot is None:  # Rated some other way, e.g. from answers
+                    slot = positions.index(position)
+                del ratings[slot]
+                del positions[slot]
+            if after is not None:
+                rating = rating_for(after)
+                low = bisect_left(ratings, rating)
+                high = bisect_right(ratings, rating, low)
+                slot = bisect_left(positions, position, low, high)
+                ratings.insert(slot, rating)
+                positions.insert(slot, position)
+        index = DifficultyIndex.__new__(DifficultyIndex)
+        index.bank = change.bank
+        index.ratings = ratings
+        index.positions = positions
+        return index
+
+    def nearest(self, rating, used=(), rng=None):
+        """
+        Return the slot of the unused question whose rating is closest.
+
+        `used` holds bank positions; `positions[slot]` and `ratings[slot]`
+        are the picked question's position and rating. Ties between equally
+        rated questions are broken at random. Returns None when every
+        question of the index has been used.
+        """
+        ratings = self.ratings
+        positions = self.positions
+        size = len(ratings)
+        middle = bisect_left(ratings, rating)
+        # Walk outwards from the insertion point to the closest unused question
+        below = middle - 1
+        while below >= 0 and positions[below] in used:
+            below -= 1
+        above = middle
+        while above < size and positions[above] in used:
+            above += 1
+        if below < 0 and above >= size:
+            return None
+        if above >= size or (
+            below >= 0 and rating - ratings[below] <= ratings[above] - rating
+        ):
+            best = ratings[below]
+        else:
+            best = ratings[above]
+        # Pick at random among the unused questions with that same rating
+        start = bisect_left(ratings, best)
+        stop = bisect_right(ratings, best)
+        rng = rng or random
+        offset = rng.randrange(stop - start)
+        for step in range(stop - start):
+            slot = start + (offset + step) % (stop - start)
+            if positions[slot] not in used:
+                return slot
+        return None  # Not reached: the walk above found an unused one
+
+
+class _Unavailable:
+    """
+    Bank positions a selector must not pick: used, or of an excluded question.
+    """
+
+    __slots__ = ("used", "bank", "exclude")
+
+    def __init__(self, used, bank, exclude):
+        self.used = used
+        self.bank = bank
+        self.exclude = exclude
+
+    def __contains__(self, position):
+        return position in self.used or self.bank[position] in self.exclude
+
+
+class AdaptiveSelector:
+    """
+    Running ability estimate of one player and the questions picked for them.
+
+    The player's ability and each question's difficulty are on the same
+    logit scale: a player answers a question right with probability
+    1 / (1 + exp(difficulty - ability)). After each answer the ability
+    moves towards the evidence by a step that shrinks as answers add up
+    (an Elo update with a decaying K factor), and the next question is the
+    unused one whose difficulty is closest to the new estimate, which is
+    the most informative one to ask.
+    """
+
+    __slots__ = (
+        "index",
+        "limit",
+        "ability",
+        "answered",
+        "used",
+        "rating",
+        "_unavailable",
+        "_rng",
+    )
+
+    def __init__(self, index, limit=None, ability=0.0, seed=None, exclude=()):
+        """
+        Initialize the estimate for a DifficultyIndex of candidate questions.
+
+        At most `limit` questions are picked (every candidate by default).
+        Questions in `exclude`, e.g. RecentQuestions, are skipped as the
+        search passes them, so a shared index needs no filtering up front.
+        """
+        self.index = index
+        self.limit = len(index) if limit is None else min(limit, len(index))
+        self.ability = ability  # Current ability estimate, in logits
+        self.answered = 0  # Answers the estimate is based on
+        self.used = set()  # Bank positions picked so far
+        self.rating = None  # Rating of the last picked question
+        self._unavailable = self.used
+        if exclude:
+            self._unavailable = _Unavailable(self.used, index.bank, exclude)
+        self._rng = random.Random(seed)
+
+    def probability(self, rating):
+        """
+        Return the chance that the player answers a question of `rating` right.
+        """
+        return 1.0 / (1.0 + math.exp(rating - self.ability))
+
+    def update(self, correct, rating=None):
+        """
+        Move the ability estimate after an answer to the last picked question.
+
+        Pass `rating` to score an answer to some other question instead.
+        """
+        rating = self.rating if rating is None else rating
+        step = max(MIN_STEP, INITIAL_STEP / (1.0 + STEP_DECAY * self.answered))
+        self.ability = _clamp(
+            self.ability + step * (float(correct) - self.probability(rating))
+        )
+        self.answered += 1
+
+    def pick(self):
+        """
+        Pick the next question's bank position, or None when the quiz is done.
+        """
+        if len(self.used) >= self.limit:
+            return None
+        slot = self.index.nearest(self.ability, self._unavailable, self._rng)
+        if slot is None:
+            return None
+        position = self.index.positions[slot]
+        self.rating = self.index.ratings[slot]
+        self.used.add(position)
+        return position
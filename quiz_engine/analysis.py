@@ -0,0 +1,515 @@
+import io  # Import io to parse a question file already read into memory
+import json  # Import json to write updated question files
+import math  # Import math for the correlation
+import os  # Import os to replace question files atomically
+import shutil  # Import shutil to keep the permissions of question files
+import sqlite3  # Import sqlite3 to read saved answers
+import tempfile  # Import tempfile to write question files atomically
+
+import numpy as np  # Import NumPy for the vectorized statistics
+
+from .bank import Question, QuestionBank
+from .results import connect
+
+DEFAULT_LOG_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "quiz_game", "answer_log"
+)
+DEFAULT_CHUNK_SIZE = 1_048_576  # Answers processed at a time
+DEFAULT_MIN_ANSWERS = 30  # Answers needed before a question is judged
+# Response time histogram: 0.25 s to 128 s in quarter-octave bins
+TIME_BIN_EDGES = np.geomspace(0.25, 128.0, 37)
+EASY_P_VALUE = 0.85  # Questions answered right more often than this are easy
+HARD_P_VALUE = 0.35  # Questions answered right less often than this are hard
+MIN_DISCRIMINATION = 0.1  # Point-biserial below this means a misleading question
+
+
+ANSWER_RECORD = np.dtype(
+    [
+        ("question", "<i4"),  # Index into AnswerLog.questions
+        ("option", "<i2"),  # Index into that question's AnswerLog.options
+        ("correct", "i1"),
+        ("response_time", "<f4"),  # Seconds, NaN if unknown
+        ("rest_score", "<f4"),  # Share right of the session's other answers
+    ]
+)
+
+
+class AnswerLog:
+    """
+    Columnar copy of the saved answers, for fast analysis.
+
+    Reading rows out of SQLite into Python runs at about a million rows a
+    second, far too slow to analyse tens of millions of answers each time.
+    `sync` therefore converts the answers of sessions finished since the
+    last sync, once, into fixed-width records appended to a flat file,
+    which analysis then memory-maps and reads in chunks at NumPy speed.
+    Question and option texts are stored once, in a small JSON index.
+    """
+
+    def __init__(self, directory=DEFAULT_LOG_DIR):
+        """
+        Open the log in `directory`, creating it if needed.
+        """
+        self.directory = directory
+        self.data_path = os.path.join(directory, "answers.bin")
+        self.index_path = os.path.join(directory, "index.json")
+        self.questions = []  # Question texts
+        self.options = []  # Option texts seen, per question
+        self.rows = 0  # Records in the data file
+        self.last_session = 0  # Rowid of the last session synced
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as file:
+                index = json.load(file)
+            self.questions = index["questions"]
+            self.options = index["options"]
+            self.rows = index["rows"]
+            self.last_session = index["last_session"]
+        # Drop records appended after the index was last saved, e.g. by a crash
+        with open(self.data_path, "ab") as file:
+            file.truncate(self.rows * ANSWER_RECORD.itemsize)
+
+    def sync(self, db_path, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Append the answers of sessions finished since the last sync.
+
+        Returns the number of answers added.
+        """
+        question_codes = {text: code for code, text in enumerate(self.questions)}
+        option_codes = [
+            {option: code for code, option in enumerate(options)}
+            for options in self.options
+        ]
+        connection = connect(db_path)
+        added = 0
+        last_session = self.last_session
+        try:
+            cursor = connection.execute(
+                "SELECT s.rowid, q.text, a.option, a.correct, a.response_time,"
+                " s.score, s.answered FROM sessions s"
+                " JOIN answers a ON a.session = s.session"
+                " JOIN questions q ON q.id = a.question_id"
+                " WHERE s.rowid > ? ORDER BY s.rowid",
+                (self.last_session,),
+            )
+            with open(self.data_path, "ab") as file:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    records = np.empty(len(rows), dtype=ANSWER_RECORD)
+                    session_rows, texts, options, correct, times, scores, answered = (
+                        zip(*rows)
+                    )
+                    questions = []
+                    chosen = []
+                    for text, option in zip(texts, options):
+                        code = question_codes.get(text)
+                        if code is None:
+                            code = question_codes[text] = len(self.questions)
+                            self.questions.append(text)
+                            self.options.append([])
+                            option_codes.append({})
+                        questions.append(code)
+                        codes = option_codes[code]
+                        option_code = codes.get(option)
+                        if option_code is None:
+                            option_code = codes[option] = len(codes)
+                            self.options[code].append(option)
+                        chosen.append(option_code)
+                    records["question"] = questions
+                    records["option"] = chosen
+                    records["correct"] = correct
+                    records["response_time"] = np.array(times, dtype=np.float64)
+                    others = np.array(answered, dtype=np.float64) - 1
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        rest = (np.array(scores) - records["correct"]) / others
+                    rest[others <= 0] = np.nan
+                    records["rest_score"] = rest
+                    file.write(records.tobytes())
+                    added += len(rows)
+                    self.last_session = session_rows[-1]
+        except BaseException:
+            # Forget the partly appended records, they will be synced again
+            self.last_session = last_session
+            with open(self.data_path, "ab") as file:
+                file.truncate(self.rows * ANSWER_RECORD.itemsize)
+            raise
+        finally:
+            connection.close()
+        self.rows += added
+        self._save_index()
+        return added
+
+    def _save_index(self):
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "questions": self.questions,
+                    "options": self.options,
+                    "rows": self.rows,
+                    "last_session": self.last_session,
+                },
+                file,
+            )
+        os.replace(temporary_path, self.index_path)
+
+    def __len__(self):
+        return self.rows
+
+    def iter_chunks(self, bank, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Yield the answers as dictionaries of NumPy columns, mapped onto a bank.
+
+        Columns: "question" (bank position, -1 if not in the bank),
+        "option" (index into the question's options, -1 if not one of
+        them), "correct", "response_time" and "rest_score" (NaN if unknown).
+        """
+        if not self.rows:
+            return
+        positions = {question.text: position for position, question in enumerate(bank)}
+        to_bank = np.full(len(self.questions), -1, dtype=np.int32)
+        width = max((len(options) for options in self.options), default=1)
+        to_option = np.full((len(self.questions), width), -1, dtype=np.int16)
+        for code, text in enumerate(self.questions):
+            position = positions.get(text, -1)
+            to_bank[code] = position
+            if position < 0:
+                continue
+            bank_options = bank[position].options
+            for option_code, option in enumerate(self.options[code]):
+                if option in bank_options:
+                    to_option[code, option_code] = bank_options.index(option)
+        records = np.memmap(
+            self.data_path, dtype=ANSWER_RECORD, mode="r", shape=(self.rows,)
+        )
+        for start in range(0, self.rows, chunk_size):
+            chunk = records[start : start + chunk_size]
+            codes = chunk["question"]
+            yield {
+                "question": to_bank[codes],
+                "option": to_option[codes, chunk["option"]],
+                "correct": chunk["correct"].astype(np.float64),
+                "response_time": chunk["response_time"].astype(np.float64),
+                "rest_score": chunk["rest_score"].astype(np.float64),
+            }
+
+
+class ItemAnalysis:
+    """
+    Per-question statistics accumulated over chunks of answers.
+
+    For each question: the number of answers, difficulty as the p-value
+    (share answered correctly), discrimination as the point-biserial
+    correlation between answering it correctly and the player's score on
+    the rest of the session, how often each option was picked, and a
+    histogram of response times.
+
+    Every statistic is accumulated with vectorized bincount passes, so
+    memory is bounded by the chunk size and the number of questions, not
+    by the number of answers.
+    """
+
+    def __init__(self, bank):
+        """
+        Initialize empty accumulators for every question of a bank.
+        """
+        self.bank = bank
+        size = len(bank)
+        self.max_options = max((len(q.options) for q in bank), default=1)
+        self.answers = np.zeros(size)
+        self.correct = np.zeros(size)
+        # Sums for the point-biserial, over answers whose rest score is known
+        self.paired = np.zeros(size)
+        self.sum_x = np.zeros(size)
+        self.sum_y = np.zeros(size)
+        self.sum_yy = np.zeros(size)
+        self.sum_xy = np.zeros(size)
+        self.option_counts = np.zeros((size, self.max_options))
+        self.time_bins = len(TIME_BIN_EDGES) + 1  # Plus under- and overflow
+        self.time_counts = np.zeros((size, self.time_bins))
+        self.time_sum = np.zeros(size)
+        self.timed = np.zeros(size)
+
+    def add(self, chunk):
+        """
+        Accumulate one chunk of answers from `AnswerLog.iter_chunks`.
+        """
+        size = len(self.bank)
+        known = chunk["question"] >= 0
+        question = chunk["question"][known]
+        x = chunk["correct"][known]
+        self.answers += np.bincount(question, minlength=size)
+        self.correct += np.bincount(question, weights=x, minlength=size)
+
+        y = chunk["rest_score"][known]
+        paired = ~np.isnan(y)
+        q, xp, yp = question[paired], x[paired], y[paired]
+        self.paired += np.bincount(q, minlength=size)
+        self.sum_x += np.bincount(q, weights=xp, minlength=size)
+        self.sum_y += np.bincount(q, weights=yp, minlength=size)
+        self.sum_yy += np.bincount(q, weights=yp * yp, minlength=size)
+        self.sum_xy += np.bincount(q, weights=xp * yp, minlength=size)
+
+        option = chunk["option"][known].astype(np.int64)
+        picked = option >= 0
+        cells = question[picked] * self.max_options + option[picked]
+        self.option_counts += np.bincount(
+            cells, minlength=size * self.max_options
+        ).reshape(size, self.max_options)
+
+        seconds = chunk["response_time"][known]
+        timed = ~np.isnan(seconds)
+        q, seconds = question[timed], seconds[timed]
+        bins = np.searchsorted(TIME_BIN_EDGES, seconds)
+        self.time_counts += np.bincount(
+            q * self.time_bins + bins, minlength=size * self.time_bins
+        ).reshape(size, self.time_bins)
+        self.time_sum += np.bincount(q, weights=seconds, minlength=size)
+        self.timed += np.bincount(q, minlength=size)
+
+    def p_values(self):
+        """
+        Share of answers that were correct, per question (NaN if unanswered).
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.correct / self.answers
+
+    def point_biserial(self):
+        """
+        Correlation of correctness with the rest-of-session score, per question.
+        """
+        n = self.paired
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = self.sum_xy / n - (self.sum_x / n) * (self.sum_y / n)
+            var_x = self.sum_x / n - (self.sum_x / n) ** 2  # x is 0 or 1
+            var_y = self.sum_yy / n - (self.sum_y / n) ** 2
+            return covariance / np.sqrt(var_x * var_y)
+
+    def time_percentile(self, fraction):
+        """
+        Approximate response time percentile per question, from the histogram.
+        """
+        cumulative = np.cumsum(self.time_counts, axis=1)
+        targets = fraction * cumulative[:, -1:]
+        bins = (cumulative < targets).sum(axis=1)
+        # Upper edge of the bin holding the percentile
+        edges = np.append(TIME_BIN_EDGES, np.inf)
+        result = edges[np.minimum(bins, len(edges) - 1)]
+        result[cumulative[:, -1] == 0] = np.nan
+        return result
+
+    def report(self, min_answers=DEFAULT_MIN_ANSWERS):
+        """
+        Return one dictionary of statistics and flags per question.
+        """
+        p_values = self.p_values()
+        discrimination = self.point_biserial()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_times = self.time_sum / self.timed
+        medians = self.time_percentile(0.5)
+        p90s = self.time_percentile(0.9)
+        rows = []
+        for position, question in enumerate(self.bank):
+            answers = int(self.answers[position])
+            picks = self.option_counts[position, : len(question.options)]
+            total_picks = picks.sum()
+            rates = {
+                option: (float(count / total_picks) if total_picks else None)
+                for option, count in zip(question.options, picks)
+            }
+            row = {
+                "question": question.text,
+                "answers": answers,
+                "p_value": _number(p_values[position]),
+                "point_biserial": _number(discrimination[position]),
+                "option_rates": rates,
+                "mean_time": _number(mean_times[position]),
+                "median_time": _number(medians[position]),
+                "p90_time": _number(p90s[position]),
+                "difficulty": question.difficulty,
+                "flags": [],
+            }
+            if answers >= min_answers:
+                row["flags"] = _flags(question, row)
+                row["suggested_difficulty"] = difficulty_for(row["p_value"])
+            rows.append(row)
+        return rows
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+def _flags(question, row):
+    flags = []
+    p_value = row["p_value"]
+    if p_value is not None and p_value > EASY_P_VALUE:
+        flags.append("too easy")
+    if p_value is not None and p_value < HARD_P_VALUE:
+        flags.append("too hard")
+    discrimination = row["point_biserial"]
+    correct_rate = row["option_rates"].get(question.correct) or 0.0
+    popular_distractor = any(
+        rate is not None and rate > correct_rate
+        for option, rate in row["option_rates"].items()
+        if option != question.correct
+    )
+    if popular_distractor or (
+        discrimination is not None and discrimination < MIN_DISCRIMINATION
+    ):
+        flags.append("misleading")
+    return flags
+
+
+def difficulty_for(p_value):
+    """
+    Map a p-value to the bank's difficulty labels.
+    """
+    if p_value is None:
+        return ""
+    if p_value >= 0.75:
+        return "easy"
+    if p_value >= 0.45:
+        return "medium"
+    return "hard"
+
+
+def analyze(bank, db_path, log_dir=DEFAULT_LOG_DIR, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run item analysis over every answer saved in a results database.
+
+    New answers are first added to the columnar AnswerLog in `log_dir`.
+    """
+    log = AnswerLog(log_dir)
+    try:
+        log.sync(db_path)
+    except sqlite3.Error as e:
+        print(f"Error: Could not read answers from {db_path}: {e}")
+    analysis = ItemAnalysis(bank)
+    for chunk in log.iter_chunks(bank, chunk_size):
+        analysis.add(chunk)
+    return analysis
+
+
+def apply_difficulty(bank, report):
+    """
+    Return a copy of the bank with each judged question's suggested difficulty.
+    """
+    suggested = {
+        row["question"]: row["suggested_difficulty"]
+        for row in report
+        if row.get("suggested_difficulty")
+    }
+    return QuestionBank(
+        (
+            Question(
+                question.text,
+                question.options,
+                question.correct,
+                question.image,
+                question.category,
+                suggested.get(question.text, question.difficulty),
+                question.tags,
+            )
+            for question in bank
+        )
+    )
+
+
+def _set_member(text, key, value):
+    """
+    Return the JSON text of an object with one top-level member set.
+
+    Everything else in the text, including its layout, is kept as it is.
+    A new member is added after the last one, with the same separator as
+    the members before it.
+    """
+    decoder = json.JSONDecoder()
+    encoded = json.dumps(value, ensure_ascii=False)
+    position = _skip_space(text, text.index("{") + 1)
+    separator = ", "
+    end = None  # End of the last value
+    while text[position] != "}":
+        name, position = decoder.raw_decode(text, position)
+        position = _skip_space(text, _skip_space(text, position) + 1)  # ":"
+        start = position
+        _, end = decoder.raw_decode(text, position)
+        if name == key:
+            return text[:start] + encoded + text[end:]
+        position = _skip_space(text, end)
+        if text[position] == ",":
+            following = _skip_space(text, position + 1)
+            separator = text[end:following]
+            position = following
+    member = f"{separator}{json.dumps(key)}: {encoded}"
+    if end is None:
+        return text[:position] + member[len(separator) :] + text[position:]
+    return text[:end] + member + text[end:]
+
+
+def _skip_space(text, position):
+    while text[position] in " \t\r\n":
+        position += 1
+    return position
+
+
+def save_questions(bank, file_path):
+    """
+    Write the difficulty labels of a bank back to its JSON or JSONL file.
+
+    Only the `difficulty` values of entries whose label changed are
+    rewritten (or added); the rest of the file is kept byte for byte, so
+    its layout and any fields the bank does not know survive. The file is
+    replaced atomically and keeps its permissions. Raises ValueError for a
+    compiled bank or a file whose questions no longer match the bank.
+    """
+    from .compiled_bank import is_compiled_bank
+    from .streaming import is_json_array, iter_json_array
+
+    if is_compiled_bank(file_path):
+        raise ValueError(
+            f"{file_path} is a compiled bank; update the question file it was"
+            " built from and compile it again"
+        )
+    with open(file_path, "r", encoding="utf-8") as file:
+        array = is_json_array(file)
+        text = file.read()
+    if array:
+        elements = list(iter_json_array(io.StringIO(text), with_text=True))
+    else:
+        elements = [
+            (line.strip(), json.loads(line))
+            for line in text.splitlines()
+            if line.strip()
+        ]
+    if len(elements) != len(bank) or any(
+        entry.get("question") != question.text
+        for (_, entry), question in zip(elements, bank)
+    ):
+        raise ValueError(f"{file_path} has changed since it was analyzed")
+
+    # Splice the changed entries into the original text
+    pieces = []
+    cursor = 0
+    for (element, entry), question in zip(elements, bank):
+        start = text.index(element, cursor)
+        pieces.append(text[cursor:start])
+        cursor = start + len(element)
+        if question.difficulty and entry.get("difficulty") != question.difficulty:
+            element = _set_member(element, "difficulty", question.difficulty)
+        pieces.append(element)
+    pieces.append(text[cursor:])
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            file.write("".join(pieces))
+        shutil.copymode(file_path, temporary_path)  # mkstemp makes it private
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
@@ -0,0 +1,118 @@
+import hashlib  # Import hashlib to key thumbnails by image path
+import mmap  # Import mmap to map the pack file into memory
+import os  # Import os to replace the pack file atomically
+import struct  # Import struct to read and write the binary layout
+
+PACK_MAGIC = b"QZTP"  # Identifies a quiz thumbnail pack
+PACK_VERSION = 1
+HEADER = struct.Struct("<4sHI")  # Magic, version, number of thumbnails
+INDEX_ENTRY = struct.Struct("<32sQI")  # Path digest, data offset, data length
+
+DEFAULT_PACK_PATH = "data/thumbnails.pack"
+
+
+def image_key(image_path):
+    """
+    Return the digest a thumbnail is indexed under.
+    """
+    return hashlib.sha256(image_path.encode("utf-8")).digest()
+
+
+class AssetPack:
+    """
+    Read-only, memory-mapped pack of pre-rendered question thumbnails.
+
+    The file holds a fixed header, an index of (path digest, offset, length)
+    entries and then the PNG bytes of every thumbnail, so a thumbnail can be
+    handed to the GUI toolkit without any download or resampling.
+    """
+
+    def __init__(self, file_path):
+        """
+        Open and map the pack file, reading its index.
+        """
+        self.file_path = file_path
+        with open(file_path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count = HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            magic = version = count = None  # Truncated file
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._map.close()
+            raise ValueError(f"{file_path} is not a version {PACK_VERSION} asset pack")
+        self._index = {}  # Path digest -> (offset, length)
+        position = HEADER.size
+        for _ in range(count):
+            key, offset, length = INDEX_ENTRY.unpack_from(self._map, position)
+            self._index[key] = (offset, length)
+            position += INDEX_ENTRY.size
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, image_path):
+        return bool(image_path) and image_key(image_path) in self._index
+
+    def get(self, image_path):
+        """
+        Return the PNG bytes of a thumbnail, or None if it is not packed.
+        """
+        if not image_path:
+            return None
+        entry = self._index.get(image_key(image_path))
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._map[offset : offset + length]
+
+    def close(self):
+        """
+        Unmap the pack file.
+        """
+        self._map.close()
+
+
+def open_asset_pack(file_path=DEFAULT_PACK_PATH):
+    """
+    Open an asset pack, returning None if it has not been built.
+    """
+    try:
+        return AssetPack(file_path)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+
+
+def build_asset_pack(bank, output_path, loader=None):
+    """
+    Render the thumbnail of every image in a bank into a pack file.
+
+    Returns the number of thumbnails written.
+    """
+    from .images import ImageLoader, ImageLoadError, encode_png
+
+    loader = loader or ImageLoader()
+    thumbnails = {}  # Path digest -> PNG bytes
+    for question in bank:
+        if not question.image or image_key(question.image) in thumbnails:
+            continue
+        try:
+            thumbnails[image_key(question.image)] = encode_png(loader(question.image))
+        except ImageLoadError as e:
+            print(f"Error loading image: {e}")
+
+    keys = sorted(thumbnails)
+    offset = HEADER.size + INDEX_ENTRY.size * len(keys)
+    temp_path = output_path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(keys)))
+        for key in keys:
+            file.write(INDEX_ENTRY.pack(key, offset, len(thumbnails[key])))
+            offset += len(thumbnails[key])
+        for key in keys:
+            file.write(thumbnails[key])
+    os.replace(temp_path, output_path)
+    return len(keys)
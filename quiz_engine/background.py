@@ -0,0 +1,26 @@
+from concurrent.futures import Future  # Import Future to hand out the result
+from threading import Thread  # Import Thread to run the work
+
+
+def run_in_background(function, *args, name="background", **kwargs):
+    """
+    Call a function in a daemon thread and return a Future of its result.
+
+    The frontends use this to load the question bank while the first
+    window is already on screen. The thread is a daemon, so closing the
+    window before the work is done does not keep the program running.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    Thread(target=run, name=name, daemon=True).start()
+    return future
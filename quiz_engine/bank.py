@@ -0,0 +1,143 @@
+import json  # Import json to parse question files
+import random  # Import random to sample compiled banks
+import sys  # Import sys to intern repeated option strings
+
+
+class Question:
+    """
+    Compact, read-only record for a single quiz question.
+
+    Options and metadata are stored as interned strings so that values
+    shared by many questions (e.g. "True"/"False", country names,
+    categories) are kept once.
+    """
+
+    __slots__ = (
+        "text",
+        "options",
+        "correct",
+        "image",
+        "category",
+        "difficulty",
+        "tags",
+    )
+
+    def __init__(
+        self, text, options, correct, image="", category="", difficulty="", tags=()
+    ):
+        self.text = text  # The question text
+        self.options = tuple(sys.intern(str(option)) for option in options)
+        self.correct = sys.intern(str(correct))  # The correct option
+        self.image = image or ""  # Image URL or file path, empty if none
+        self.category = sys.intern(category or "")  # e.g. "science", optional
+        self.difficulty = sys.intern(difficulty or "")  # e.g. "medium", optional
+        self.tags = tuple(sys.intern(str(tag)) for tag in tags or ())
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a question from an entry of the JSON question file.
+        """
+        return cls(
+            data["question"],
+            data["options"],
+            data["correct"],
+            data.get("image", ""),
+            data.get("category", ""),
+            data.get("difficulty", ""),
+            data.get("tags", ()),
+        )
+
+    def to_dict(self):
+        """
+        Convert the question back to its JSON representation.
+        """
+        data = {
+            "question": self.text,
+            "options": list(self.options),
+            "correct": self.correct,
+            "image": self.image,
+        }
+        # Metadata is optional and only written when present
+        if self.category:
+            data["category"] = self.category
+        if self.difficulty:
+            data["difficulty"] = self.difficulty
+        if self.tags:
+            data["tags"] = list(self.tags)
+        return data
+
+    def __repr__(self):
+        return f"Question({self.text!r})"
+
+
+class QuestionBank:
+    """
+    Immutable collection of questions shared by any number of quiz sessions.
+    """
+
+    def __init__(self, questions=()):
+        """
+        Initialize the bank from an iterable of Question records.
+        """
+        self._questions = tuple(questions)
+
+    @classmethod
+    def from_dicts(cls, entries):
+        """
+        Build a bank from a list of question dictionaries.
+        """
+        return cls(Question.from_dict(entry) for entry in entries)
+
+    def __len__(self):
+        return len(self._questions)
+
+    def __getitem__(self, index):
+        return self._questions[index]
+
+    def __iter__(self):
+        return iter(self._questions)
+
+    def wait_for(self, index):
+        """
+        Check if the bank has a question at `index`.
+        """
+        return index < len(self._questions)
+
+
+def load_bank(file_path, stream=False, sample=None, rng=None):
+    """
+    Load a question bank from a JSON, JSONL or compiled bank file.
+
+    JSON and JSONL files are parsed incrementally. With `stream`, the bank
+    is returned straight away and fills in the background; with `sample`,
+    only a random subset of that many questions is kept.
+    """
+    from .compiled_bank import CompiledBank, is_compiled_bank
+    from .streaming import StreamingBank, iter_questions, reservoir_sample
+
+    if is_compiled_bank(file_path):
+        try:
+            bank = CompiledBank(file_path)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return QuestionBank()
+        if sample is not None:
+            rng = rng or random.Random()
+            indexes = rng.sample(range(len(bank)), min(sample, len(bank)))
+            return QuestionBank(bank[index] for index in indexes)
+        return bank
+    if stream and sample is None:
+        return StreamingBank(file_path)
+    try:
+        if sample is not None:
+            return QuestionBank(
+                reservoir_sample(iter_questions(file_path), sample, rng)
+            )
+        return QuestionBank(iter_questions(file_path))
+    except FileNotFoundError:
+        print(f"Error: The file {file_path} was not found.")
+        return QuestionBank()
+    except json.JSONDecodeError:
+        print(f"Error: The file {file_path} contains invalid JSON.")
+        return QuestionBank()
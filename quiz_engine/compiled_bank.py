@@ -0,0 +1,148 @@
+import mmap  # Import mmap to share the bank's pages between processes
+import os  # Import os to replace the output file atomically
+import shutil  # Import shutil to assemble the output file
+import struct  # Import struct to read and write the binary layout
+import sys  # Import sys to check the machine byte order
+import tempfile  # Import tempfile to stage record data while compiling
+from array import array  # Import array to collect record offsets compactly
+
+from .bank import Question
+
+BANK_MAGIC = b"QZBK"  # Identifies a compiled question bank
+BANK_VERSION = 2
+HEADER = struct.Struct("<4sHHI")  # Magic, version, reserved, number of questions
+OFFSET = struct.Struct("<Q")  # Start of a record, relative to the data section
+RECORD_HEADER = struct.Struct("<BB")  # Number of options and of tags
+
+
+def is_compiled_bank(file_path):
+    """
+    Check if a file starts with the compiled bank magic.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            return file.read(len(BANK_MAGIC)) == BANK_MAGIC
+    except OSError:
+        return False
+
+
+def encode_question(question):
+    """
+    Encode a question as: option and tag counts, string lengths, then UTF-8
+    strings.
+
+    The strings are the question text, correct option, image, category,
+    difficulty, options and tags.
+    """
+    strings = [
+        question.text,
+        question.correct,
+        question.image,
+        question.category,
+        question.difficulty,
+        *question.options,
+        *question.tags,
+    ]
+    encoded = [string.encode("utf-8") for string in strings]
+    lengths = struct.pack(f"<{len(encoded)}I", *(len(data) for data in encoded))
+    counts = RECORD_HEADER.pack(len(question.options), len(question.tags))
+    return counts + lengths + b"".join(encoded)
+
+
+class CompiledBank:
+    """
+    Question bank backed by a memory-mapped compiled bank file.
+
+    The file has a fixed-width header, a table of count + 1 record offsets
+    and then the encoded records. Opening it only reads the header; each
+    question is decoded on access, so startup costs the same for any bank
+    size and every process using the file shares the same mapped pages.
+    """
+
+    def __init__(self, file_path):
+        """
+        Open and map a compiled bank file.
+        """
+        self.file_path = file_path
+        with open(file_path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, _, count = HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            magic = version = count = None  # Truncated file
+        if magic != BANK_MAGIC or version != BANK_VERSION:
+            self._map.close()
+            raise ValueError(
+                f"{file_path} is not a version {BANK_VERSION} bank, recompile it"
+            )
+        self._count = count
+        self._offsets = HEADER.size  # Start of the offset table
+        self._data = HEADER.size + OFFSET.size * (count + 1)  # Start of the records
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("question index out of range")
+        position = (
+            self._data
+            + OFFSET.unpack_from(self._map, self._offsets + OFFSET.size * index)[0]
+        )
+        option_count, tag_count = RECORD_HEADER.unpack_from(self._map, position)
+        position += RECORD_HEADER.size
+        string_count = 5 + option_count + tag_count
+        lengths = struct.unpack_from(f"<{string_count}I", self._map, position)
+        position += 4 * len(lengths)
+        strings = []
+        for length in lengths:
+            strings.append(str(self._map[position : position + length], "utf-8"))
+            position += length
+        text, correct, image, category, difficulty = strings[:5]
+        options = strings[5 : 5 + option_count]
+        tags = strings[5 + option_count :]
+        return Question(text, options, correct, image, category, difficulty, tags)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def wait_for(self, index):
+        """
+        Check if the bank has a question at `index`.
+        """
+        return index < self._count
+
+    def close(self):
+        """
+        Unmap the bank file.
+        """
+        self._map.close()
+
+
+def compile_bank(questions, output_path):
+    """
+    Write an iterable of Question records to a compiled bank file.
+
+    Records are staged in a temporary file while their offsets are
+    collected, so the questions can come from a generator of any size.
+    Returns the number of questions written.
+    """
+    offsets = array("Q", [0])
+    directory = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryFile(dir=directory) as records:
+        for question in questions:
+            offsets.append(offsets[-1] + records.write(encode_question(question)))
+        count = len(offsets) - 1
+        records.seek(0)
+        temp_path = output_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(HEADER.pack(BANK_MAGIC, BANK_VERSION, 0, count))
+            if sys.byteorder == "big":
+                offsets.byteswap()  # The table is little-endian on disk
+            offsets.tofile(file)
+            shutil.copyfileobj(records, file)
+    os.replace(temp_path, output_path)
+    return count
@@ -0,0 +1,134 @@
+from io import BytesIO  # Import BytesIO to read image bytes
+from threading import Lock  # Import Lock to guard pool restarts
+
+# PIL and multiprocessing are imported where they are used, so that starting
+# the game does not wait for them before the first question image
+
+DEFAULT_MAX_PIXELS = 64_000_000  # Largest accepted source image, in pixels
+DEFAULT_MAX_MEMORY = 256 * 1024 * 1024  # Largest decode buffer, in bytes
+DEFAULT_DECODE_WORKERS = 2  # Number of decoder processes
+
+
+class DecodeError(Exception):
+    """
+    Raised when image bytes cannot be decoded into a thumbnail.
+    """
+
+
+def decode_thumbnail(
+    data, size, max_pixels=DEFAULT_MAX_PIXELS, max_memory=DEFAULT_MAX_MEMORY
+):
+    """
+    Decode image bytes straight to a thumbnail of `size`.
+
+    Only the header is read before the caps are checked, so oversized
+    sources are rejected without being decoded. JPEGs are decoded in draft
+    mode, which scales them down by up to 8x while decoding; other formats
+    are reduced by whole factors before the final LANCZOS resize. Returns
+    a compact (mode, size, pixel bytes) tuple that is cheap to send
+    between processes; see `thumbnail_from_buffer`.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(BytesIO(data))
+        width, height = image.size
+        if width * height > max_pixels:
+            raise DecodeError(
+                f"image is {width}x{height}, more than {max_pixels} pixels"
+            )
+        # Decode at the smallest JPEG scale that is still at least `size`
+        image.draft("RGB", size)
+        width, height = image.size
+        needed = width * height * len(image.getbands())
+        if needed > max_memory:
+            raise DecodeError(f"decoding needs {needed} bytes, more than {max_memory}")
+        image = ImageOps.exif_transpose(image)  # Camera photos are often rotated
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        image = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise DecodeError(str(e)) from e
+    return image.mode, image.size, image.tobytes()
+
+
+def thumbnail_from_buffer(buffer):
+    """
+    Rebuild a PIL image from the tuple returned by `decode_thumbnail`.
+    """
+    from PIL import Image
+
+    mode, size, pixels = buffer
+    return Image.frombytes(mode, size, pixels)
+
+
+class DecodePool:
+    """
+    Small process pool that decodes and resizes question images.
+
+    Decoding a camera-original photo takes long enough to starve the GUI
+    thread of the GIL when it runs in a thread of the same process, so the
+    work is done in separate processes and only the finished thumbnail
+    pixels are sent back. The pool starts on first use and is restarted if
+    a worker dies, e.g. after running out of memory on a hostile image.
+    """
+
+    def __init__(
+        self,
+        max_workers=DEFAULT_DECODE_WORKERS,
+        max_pixels=DEFAULT_MAX_PIXELS,
+        max_memory=DEFAULT_MAX_MEMORY,
+    ):
+        """
+        Initialize the pool size and the caps applied to every image.
+        """
+        self.max_workers = max_workers  # Number of decoder processes
+        self.max_pixels = max_pixels  # Largest accepted source, in pixels
+        self.max_memory = max_memory  # Largest decode buffer, in bytes
+        self._executor = None
+        self._lock = Lock()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # Forking a process that runs GUI and network threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def __call__(self, data, size):
+        """
+        Decode image bytes to a PIL thumbnail in a worker process.
+
+        Blocks the calling (worker) thread until the thumbnail is ready.
+        With `max_workers` set to 0 the image is decoded in that thread.
+        """
+        from concurrent.futures.process import BrokenProcessPool
+
+        if not self.max_workers:
+            buffer = decode_thumbnail(data, size, self.max_pixels, self.max_memory)
+            return thumbnail_from_buffer(buffer)
+        executor = self._pool()
+        try:
+            buffer = executor.submit(
+                decode_thumbnail, data, size, self.max_pixels, self.max_memory
+            ).result()
+        except BrokenProcessPool as e:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None  # Start a fresh pool for the next image
+            raise DecodeError("decoder process died") from e
+        return thumbnail_from_buffer(buffer)
+
+    def shutdown(self):
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
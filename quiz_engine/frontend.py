@@ -0,0 +1,164 @@
+"""
+Command-line options and startup steps shared by the desktop frontends.
+"""
+
+from .asset_pack import DEFAULT_PACK_PATH
+from .bank import load_bank
+from .decode import DEFAULT_DECODE_WORKERS, DEFAULT_MAX_MEMORY, DEFAULT_MAX_PIXELS
+from .image_cache import DEFAULT_CACHE_DIR
+from .results import DEFAULT_RESULTS_PATH
+from .telemetry import DEFAULT_TELEMETRY_PATH
+
+
+def add_common_arguments(parser):
+    """
+    Add the options both frontends accept to an argparse parser.
+    """
+    parser.add_argument(
+        "--questions",
+        default="data/questions.json",
+        help="question file: JSON, or a bank built with 'quiz_engine compile-bank'",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="start the quiz while a large question file is still loading",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        help="play a random subset of this many questions",
+    )
+    parser.add_argument(
+        "--count", type=int, help="number of questions to ask (default: all)"
+    )
+    parser.add_argument("--category", help="only ask questions in this category")
+    parser.add_argument(
+        "--difficulty", help="only ask questions of this difficulty, e.g. medium"
+    )
+    parser.add_argument(
+        "--tag",
+        action="append",
+        default=[],
+        help="only ask questions with this tag (can be repeated)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="pick each question to match how well the player is doing",
+    )
+    parser.add_argument(
+        "--avoid-recent",
+        type=int,
+        default=0,
+        metavar="SESSIONS",
+        help="do not repeat questions asked in this many previous sessions",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="reload the question file when it changes, for the next players",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="replay the session with this seed (same questions and option order)",
+    )
+    parser.add_argument(
+        "--prefetch-depth",
+        type=int,
+        default=3,
+        help="number of upcoming questions to prefetch images for",
+    )
+    parser.add_argument(
+        "--image-cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="directory where downloaded question images are cached",
+    )
+    parser.add_argument(
+        "--asset-pack",
+        default=DEFAULT_PACK_PATH,
+        help="thumbnail pack built with 'quiz_engine build-assets'",
+    )
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=DEFAULT_DECODE_WORKERS,
+        help="processes that decode images (0 decodes in the loading threads)",
+    )
+    parser.add_argument(
+        "--max-image-pixels",
+        type=int,
+        default=DEFAULT_MAX_PIXELS,
+        help="skip question images with more pixels than this",
+    )
+    parser.add_argument(
+        "--max-image-memory",
+        type=int,
+        default=DEFAULT_MAX_MEMORY // (1024 * 1024),
+        metavar="MB",
+        help="skip question images that need more memory than this to decode",
+    )
+    parser.add_argument(
+        "--telemetry",
+        default=DEFAULT_TELEMETRY_PATH,
+        metavar="FILE",
+        help="JSON Lines file that per-question events are appended to",
+    )
+    parser.add_argument(
+        "--no-telemetry",
+        dest="telemetry",
+        action="store_const",
+        const=None,
+        help="do not write per-question events to disk",
+    )
+    parser.add_argument(
+        "--results-db",
+        default=DEFAULT_RESULTS_PATH,
+        metavar="FILE",
+        help="SQLite database that finished sessions and answers are saved to",
+    )
+    parser.add_argument(
+        "--no-results",
+        dest="results_db",
+        action="store_const",
+        const=None,
+        help="do not save results",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="time every UI callback and engine call and write a profile to DIR"
+        " when the game exits (default: ~/.cache/quiz_game/profiles)",
+    )
+
+
+def check_common_arguments(parser, args):
+    """
+    Reject combinations of the common options that cannot work together.
+    """
+    if args.watch and (args.stream or args.sample):
+        parser.error("--watch cannot be combined with --stream or --sample")
+
+
+def load_quiz(args, quiz_plan, reloader=None, leaderboards=None, results_store=None):
+    """
+    Load the question bank and start the first quiz session of the plan.
+
+    Runs in a background thread while the name and age screen is shown.
+    With a BankReloader, the bank is loaded through it and watched from
+    then on. Today's leaderboard is filled from the results store here too,
+    before any session can finish.
+    """
+    if reloader is not None:
+        bank = reloader.load()
+    else:
+        bank = load_bank(args.questions, stream=args.stream, sample=args.sample)
+    session = quiz_plan.new_session(bank, seed=args.seed)
+    if reloader is not None:
+        reloader.start()
+    if results_store is not None:
+        leaderboards.load(results_store)
+    return session
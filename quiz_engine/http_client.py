@@ -0,0 +1,125 @@
+import time  # Import time to measure request latency
+from collections import deque  # Import deque to keep recent latency samples
+from threading import BoundedSemaphore, Lock  # Import primitives to cap concurrency
+from urllib.parse import urlsplit  # Import urlsplit to group stats by host
+
+from .stats import percentile
+
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
+}
+
+DEFAULT_CONNECT_TIMEOUT = 3.05  # Seconds to wait for a connection to be set up
+DEFAULT_READ_TIMEOUT = 10  # Seconds to wait between bytes of a response
+DEFAULT_MAX_CONCURRENCY = 4  # Maximum number of fetches in flight at once
+
+
+class LatencyStats:
+    """
+    Thread-safe record of recent request latencies.
+    """
+
+    def __init__(self, max_samples=1000):
+        """
+        Initialize the stats, keeping at most `max_samples` recent requests.
+        """
+        self.samples = deque(maxlen=max_samples)  # (host, status, seconds) tuples
+        self.count = 0  # Total number of requests made
+        self.errors = 0  # Requests that failed without a response
+        self._lock = Lock()
+
+    def record(self, url, status, seconds):
+        """
+        Record one request; `status` is None when no response was received.
+        """
+        with self._lock:
+            self.samples.append((urlsplit(url).netloc, status, seconds))
+            self.count += 1
+            if status is None:
+                self.errors += 1
+
+    def summary(self, host=None):
+        """
+        Summarize the recent latencies, optionally for a single host.
+        """
+        with self._lock:
+            samples = [s for s in self.samples if host is None or s[0] == host]
+            count, errors = self.count, self.errors
+        latencies = sorted(seconds for _, _, seconds in samples)
+        return {
+            "requests": count,
+            "errors": errors,
+            "samples": len(latencies),
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "max": latencies[-1] if latencies else 0.0,
+        }
+
+
+class FetchClient:
+    """
+    Shared HTTP client for downloading question images.
+
+    Connections are kept alive and pooled per host, every request has a
+    connect and a read timeout so a stalled host cannot hang a worker, and
+    at most `max_concurrency` requests run at the same time. requests is
+    only imported, and the session only set up, on the first request.
+    """
+
+    def __init__(
+        self,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+    ):
+        """
+        Initialize the client with its timeouts and concurrency limit.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_concurrency = max_concurrency
+        self.stats = LatencyStats()  # Per-request latency statistics
+        self._session = None  # requests.Session, created on first use
+        self._session_lock = Lock()
+        self._slots = BoundedSemaphore(max_concurrency)
+
+    @property
+    def session(self):
+        """
+        The pooled requests.Session, created on first use.
+        """
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update(REQUEST_HEADERS)
+                # One pool per host
+                adapter = HTTPAdapter(pool_maxsize=self.max_concurrency)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def get(self, url, headers=None):
+        """
+        Perform a GET request and return the response.
+        """
+        with self._slots:
+            status = None
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                status = response.status_code
+            finally:
+                self.stats.record(url, status, time.perf_counter() - start)
+        return response
+
+    def close(self):
+        """
+        Close every pooled connection.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
@@ -0,0 +1,185 @@
+import hashlib  # Import hashlib to derive cache keys from URLs
+import json  # Import json to store entry metadata
+import os  # Import os for file system access
+import tempfile  # Import tempfile to write entries atomically
+import time  # Import time to find temporary files left behind
+from threading import Lock  # Import Lock to guard the in-process bookkeeping
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "quiz_game", "images"
+)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # Size cap of the cache directory
+EVICT_TO = 0.9  # Share of the cap eviction frees the cache down to
+STALE_TEMP_AGE = 3600  # Seconds after which a temporary file is from a crash
+
+
+class CacheEntry:
+    """
+    Raw image bytes read from the cache along with their HTTP validators.
+    """
+
+    __slots__ = ("data", "etag", "last_modified")
+
+    def __init__(self, data, etag=None, last_modified=None):
+        self.data = data  # Raw image bytes, exactly as downloaded
+        self.etag = etag  # ETag header of the response, if any
+        self.last_modified = last_modified  # Last-Modified header, if any
+
+
+class ImageCache:
+    """
+    Persistent, content-addressed on-disk cache of downloaded images.
+
+    Each URL is stored in one file named after the SHA-256 of the URL. The
+    file starts with a line of JSON metadata (URL and HTTP validators)
+    followed by the raw image bytes. Files are written to a temporary name
+    and renamed into place, so several processes can share one directory
+    and never see a half-written entry. When the directory grows past
+    `max_bytes`, the least recently used entries are removed; reads refresh
+    an entry's modification time to mark it as used.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache in the given directory, creating it if needed.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = Lock()
+        self._validated = set()  # URLs revalidated with the server by this process
+        # Approximate total size of the directory, scanned on the first write
+        # so that opening the cache does not walk it
+        self._size = None
+
+    def _path(self, url):
+        """
+        Return the file path an URL is cached under.
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], key + ".img")
+
+    def _scan_size(self):
+        """
+        Add up the size of every entry in the cache directory.
+        """
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        """
+        Yield (path, last use time, size) for every entry in the cache.
+
+        Temporary files left behind by writers that crashed are removed.
+        """
+        stale = time.time() - STALE_TEMP_AGE
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".tmp"):
+                    try:
+                        if os.stat(path).st_mtime < stale:
+                            os.remove(path)
+                    except FileNotFoundError:
+                        pass  # Renamed into place or removed meanwhile
+                    continue
+                if not name.endswith(".img"):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # Evicted by another process meanwhile
+                yield path, stat.st_mtime, stat.st_size
+
+    def get(self, url):
+        """
+        Return the cached CacheEntry for an URL, or None on a miss.
+        """
+        path = self._path(url)
+        try:
+            with open(path, "rb") as file:
+                metadata = json.loads(file.readline())
+                data = file.read()
+            os.utime(path)  # Mark the entry as recently used
+        except (FileNotFoundError, ValueError):
+            return None
+        if metadata.get("url") != url:
+            return None  # Hash collision or foreign file
+        return CacheEntry(data, metadata.get("etag"), metadata.get("last_modified"))
+
+    def put(self, url, data, etag=None, last_modified=None):
+        """
+        Store the raw bytes of an URL along with its HTTP validators.
+        """
+        if self._size is None:
+            size = self._scan_size()
+            with self._lock:
+                if self._size is None:
+                    self._size = size
+        path = self._path(url)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        metadata = {"url": url, "etag": etag, "last_modified": last_modified}
+        header = json.dumps(metadata).encode("utf-8") + b"\n"
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(header)
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self._validated.add(url)
+            self._size += len(header) + len(data)
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def is_validated(self, url):
+        """
+        Check if an URL was already revalidated by this process.
+        """
+        with self._lock:
+            return url in self._validated
+
+    def mark_validated(self, url):
+        """
+        Record that the server confirmed the cached copy of an URL is current.
+        """
+        with self._lock:
+            self._validated.add(url)
+
+    def invalidate(self, *urls):
+        """
+        Make the next use of these URLs revalidate their cached copies.
+
+        Used for the images of edited questions, since an image may have
+        been replaced under the same URL.
+        """
+        with self._lock:
+            self._validated.difference_update(urls)
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits its size cap.
+
+        The cache is freed down to EVICT_TO of the cap, so that the
+        directory is not walked again after every few downloads.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * EVICT_TO if total > self.max_bytes else total
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Already evicted by another process
+            total -= size
+        with self._lock:
+            self._size = total
@@ -0,0 +1,109 @@
+from io import BytesIO  # Import BytesIO for handling image data
+
+from .decode import DecodeError, decode_thumbnail, thumbnail_from_buffer
+from .http_client import FetchClient
+
+THUMBNAIL_SIZE = (200, 200)  # Size every question image is displayed at
+
+
+class ImageLoadError(Exception):
+    """
+    Raised when a question image cannot be downloaded or decoded.
+    """
+
+
+def encode_png(image):
+    """
+    Encode a thumbnail as PNG bytes, a format both GUI toolkits read natively.
+    """
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class ImageLoader:
+    """
+    Turn an image URL or file path into a display-ready thumbnail.
+    """
+
+    def __init__(self, client=None, cache=None, size=THUMBNAIL_SIZE, decoder=None):
+        """
+        Initialize the loader with a FetchClient and an optional ImageCache.
+
+        Images are decoded by `decoder`, usually a DecodePool, or in the
+        calling thread if it is None.
+        """
+        self.client = client or FetchClient()  # Shared HTTP client for downloads
+        self.cache = cache  # ImageCache for downloaded images, or None
+        self.size = size  # Size of the produced thumbnails
+        self.decoder = decoder  # Callable turning (bytes, size) into a thumbnail
+
+    def __call__(self, image_path, token=None):
+        """
+        Download (or read) an image and decode it to thumbnail size.
+
+        If a LoadToken is given and gets cancelled while the image is being
+        fetched, LoadCancelled is raised instead of decoding it.
+        """
+        from requests.exceptions import RequestException
+
+        try:
+            data = self.fetch(image_path)
+            if token is not None:
+                token.check()
+            if self.decoder is not None:
+                image = self.decoder(data, self.size)
+            else:
+                image = thumbnail_from_buffer(decode_thumbnail(data, self.size))
+        except (RequestException, DecodeError, OSError) as e:
+            raise ImageLoadError(f"{image_path}: {e}") from e
+        return image
+
+    def fetch(self, image_path):
+        """
+        Return the raw bytes of an image from a URL or file path.
+        """
+        from requests.exceptions import RequestException
+
+        if not image_path.startswith("http"):
+            with open(image_path, "rb") as file:
+                return file.read()
+        if self.cache is None:
+            return self.download(image_path).content
+
+        entry = self.cache.get(image_path)
+        if entry is not None and self.cache.is_validated(image_path):
+            return entry.data
+
+        # Ask the server whether our copy is still current
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        try:
+            response = self.download(image_path, headers)
+        except RequestException:
+            if entry is not None:
+                return entry.data  # Offline or server error: use the cached copy
+            raise
+        if response.status_code == 304 and entry is not None:
+            self.cache.mark_validated(image_path)
+            return entry.data
+        self.cache.put(
+            image_path,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return response.content
+
+    def download(self, url, headers=None):
+        """
+        Perform a GET request for an image and check its status.
+        """
+        response = self.client.get(url, headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
@@ -0,0 +1,375 @@
+import json  # Import json to persist the recent question history
+import os  # Import os to create the history directory
+import random  # Import random to pick questions
+from array import array  # Import array to store posting lists compactly
+from bisect import bisect_left  # Import bisect_left to update posting lists
+from collections import deque  # Import deque to keep the last few sessions
+from threading import Lock  # Import Lock since reloads come from another thread
+
+from .adaptive import AdaptiveSelector, DifficultyIndex
+from .session import QuizManager
+
+MAX_DRAW_ATTEMPTS = 8  # Random draws per wanted question before scanning instead
+
+DEFAULT_HISTORY_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "quiz_game", "recent_questions.json"
+)
+
+
+class BankIndex:
+    """
+    Inverted indexes over the category, difficulty and tags of a bank.
+
+    Each index maps a value to the sorted bank positions of the questions
+    that have it. Building the index reads every question once; after that
+    a quiz of k matching questions is assembled in time proportional to k
+    (as long as matching questions are not mostly excluded), however large
+    the bank is.
+    """
+
+    def __init__(self, bank):
+        """
+        Build the indexes for a bank.
+        """
+        self.bank = bank
+        self._size = 0
+        self._by_category = {}  # Category -> positions
+        self._by_difficulty = {}  # Difficulty -> positions
+        self._by_pair = {}  # (category, difficulty) -> positions
+        self._by_tag = {}  # Tag -> positions
+        for position, question in enumerate(bank):
+            self._add(self._by_category, question.category, position)
+            self._add(self._by_difficulty, question.difficulty, position)
+            self._add(self._by_pair, (question.category, question.difficulty), position)
+            for tag in question.tags:
+                self._add(self._by_tag, tag, position)
+            self._size = position + 1
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def _add(index, key, position):
+        postings = index.get(key)
+        if postings is None:
+            postings = index[key] = array("I")
+        postings.append(position)
+
+    def _keys(self, question):
+        """
+        Yield (index, key) for every posting list a question is in.
+        """
+        yield self._by_category, question.category
+        yield self._by_difficulty, question.difficulty
+        yield self._by_pair, (question.category, question.difficulty)
+        for tag in question.tags:
+            yield self._by_tag, tag
+
+    def updated(self, change):
+        """
+        Return the index of a reloaded bank (see reload.BankChange).
+
+        Only the posting lists of the changed questions are copied and
+        updated; the others are shared with this index, which stays as it
+        is for the sessions still using the old bank.
+        """
+        index = BankIndex.__new__(BankIndex)
+        index.bank = change.bank
+        index._size = len(change.bank)
+        index._by_category = dict(self._by_category)
+        index._by_difficulty = dict(self._by_difficulty)
+        index._by_pair = dict(self._by_pair)
+        index._by_tag = dict(self._by_tag)
+        copied = set()  # (id of the index, key) of posting lists already copied
+
+        def postings(table, key):
+            if (id(table), key) not in copied:
+                copied.add((id(table), key))
+                table[key] = array("I", table.get(key, ()))
+            return table[key]
+
+        for position, before, after in change.changes:
+            if before is not None:
+                for table, key in index._keys(before):
+                    positions = postings(table, key)
+                    slot = bisect_left(positions, position)
+                    if slot < len(positions) and positions[slot] == position:
+                        del positions[slot]
+                    if not positions:
+                        del table[key]
+                        copied.discard((id(table), key))
+            if after is not None:
+                for table, key in index._keys(after):
+                    positions = postings(table, key)
+                    positions.insert(bisect_left(positions, position), position)
+        return index
+
+    def categories(self):
+        return sorted(key for key in self._by_category if key)
+
+    def difficulties(self):
+        return sorted(key for key in self._by_difficulty if key)
+
+    def tags(self):
+        return sorted(self._by_tag)
+
+    def candidates(self, category=None, difficulty=None, tags=()):
+        """
+        Return the smallest posting list that covers every given filter.
+
+        Questions in it still have to be checked against the tags, since
+        only one tag's postings can be used.
+        """
+        if category and difficulty:
+            lists = [self._by_pair.get((category, difficulty), array("I"))]
+        elif category:
+            lists = [self._by_category.get(category, array("I"))]
+        elif difficulty:
+            lists = [self._by_difficulty.get(difficulty, array("I"))]
+        else:
+            lists = [range(self._size)]
+        lists.extend(self._by_tag.get(tag, array("I")) for tag in tags)
+        return min(lists, key=len)
+
+    def select(
+        self, count, category=None, difficulty=None, tags=(), exclude=(), rng=None
+    ):
+        """
+        Pick up to `count` distinct bank positions matching the filters.
+
+        Questions must have every tag in `tags`; questions found in
+        `exclude` (e.g. a RecentQuestions history) are skipped. Positions
+        are returned in random order.
+        """
+        rng = rng or random.Random()
+        candidates = self.candidates(category, difficulty, tags)
+        tags = set(tags)
+
+        def wanted(position):
+            question = self.bank[position]
+            return tags.issubset(question.tags) and question not in exclude
+
+        if count >= len(candidates):
+            chosen = [position for position in candidates if wanted(position)]
+            rng.shuffle(chosen)
+            return chosen
+
+        # Draw random candidates until we have enough; this is O(count) unless
+        # most candidates are rejected, in which case we fall back to a scan
+        chosen = []
+        seen = set()
+        for _ in range(count * MAX_DRAW_ATTEMPTS):
+            if len(chosen) == count:
+                return chosen
+            position = candidates[rng.randrange(len(candidates))]
+            if position in seen:
+                continue
+            seen.add(position)
+            if wanted(position):
+                chosen.append(position)
+        if len(chosen) == count:
+            return chosen
+        remaining = [p for p in candidates if p not in seen and wanted(p)]
+        chosen.extend(rng.sample(remaining, min(count - len(chosen), len(remaining))))
+        return chosen
+
+
+class RecentQuestions:
+    """
+    The questions asked in the last few sessions, to avoid repeating them.
+
+    Questions are remembered by their text, so the history stays valid when
+    the bank is reloaded or sampled differently. When a file path is given,
+    the history is kept there so it survives restarts.
+    """
+
+    def __init__(self, sessions=5, file_path=None):
+        """
+        Initialize the history, loading it from `file_path` if it exists.
+        """
+        self.file_path = file_path
+        self._sessions = deque(maxlen=sessions)  # One set of question texts each
+        if file_path:
+            try:
+                with open(file_path, "r") as file:
+                    for texts in json.load(file)[-sessions:]:
+                        self._sessions.append(set(texts))
+            except (FileNotFoundError, ValueError):
+                pass  # No usable history yet
+
+    def __contains__(self, question):
+        return any(question.text in texts for texts in self._sessions)
+
+    def add_session(self, questions):
+        """
+        Remember the questions of a finished (or started) session.
+        """
+        if self._sessions.maxlen == 0:
+            return
+        self._sessions.append({question.text for question in questions})
+        if self.file_path:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+            with open(self.file_path, "w") as file:
+                json.dump([sorted(texts) for texts in self._sessions], file)
+
+
+def assemble_quiz(
+    bank,
+    count=None,
+    category=None,
+    difficulty=None,
+    tags=(),
+    recent=None,
+    index=None,
+    seed=None,
+    adaptive=False,
+    difficulty_index=None,
+):
+    """
+    Start a quiz session over the questions of a bank matching the filters.
+
+    Without any filter or count, every question is asked in file order.
+    Otherwise up to `count` matching questions (all of them by default)
+    are asked in random order, skipping those in `recent`, which then
+    records the new session. Pass a prebuilt BankIndex as `index` to reuse
+    it across sessions. The question order and option orders both follow
+    from `seed` (random by default).
+
+    With `adaptive`, each question is the matching one closest in
+    difficulty to the player's running ability estimate instead (see
+    AdaptiveSelector). Pass a prebuilt DifficultyIndex of the whole bank
+    as `difficulty_index` to reuse it across sessions. Since
+    the questions are only known as they are asked, the caller records an
+    adaptive session in `recent` once it is over.
+    """
+    seed = random.getrandbits(63) if seed is None else seed
+    if adaptive:
+        if category or difficulty or tags:
+            index = index or BankIndex(bank)
+            positions = index.select(len(index), category, difficulty, tags)
+            if difficulty_index is not None:
+                difficulty_index = difficulty_index.subset(positions)
+            else:
+                difficulty_index = DifficultyIndex(bank, positions)
+        elif difficulty_index is None:
+            difficulty_index = DifficultyIndex(bank)
+        selector = AdaptiveSelector(
+            difficulty_index,
+            count,
+            seed=seed,
+            exclude=recent if recent is not None else (),
+        )
+        return QuizManager(bank, seed=seed, adaptive=selector)
+    if count is None and not (category or difficulty or tags or recent):
+        return QuizManager(bank, seed=seed)
+    rng = random.Random(seed)
+    index = index or BankIndex(bank)
+    order = index.select(
+        len(index) if count is None else count,
+        category,
+        difficulty,
+        tags,
+        exclude=recent if recent is not None else (),
+        rng=rng,
+    )
+    session = QuizManager(bank, order=order, seed=seed)
+    if recent is not None:
+        recent.add_session(session.session_questions())
+    return session
+
+
+class QuizPlan:
+    """
+    The options a frontend assembles its quizzes with.
+
+    A plan starts any number of sessions on one loaded bank, e.g. a new
+    player on a kiosk, without loading the bank again. The indexes built
+    for the first session are kept, so later ones start in milliseconds
+    even on a large bank.
+    """
+
+    def __init__(
+        self,
+        count=None,
+        category=None,
+        difficulty=None,
+        tags=(),
+        recent=None,
+        adaptive=False,
+    ):
+        """
+        Initialize the plan with the filters and mode of assemble_quiz.
+        """
+        self.count = count
+        self.category = category
+        self.difficulty = difficulty
+        self.tags = tags
+        self.recent = recent  # RecentQuestions shared by every session, or None
+        self.adaptive = adaptive
+        self._bank = None  # The bank of the last session, or of the last reload
+        self._index = None  # Indexes over that bank, built when first needed
+        self._difficulty_index = None
+        self._lock = Lock()  # Reloads are applied from another thread
+
+    def new_session(self, bank=None, seed=None):
+        """
+        Start a quiz session on a bank; random unless `seed` is given.
+
+        By default the session uses the bank of the previous one, or the
+        latest bank applied with `apply_change`.
+        """
+        with self._lock:
+            if bank is None:
+                bank = self._bank
+            elif bank is not self._bank:
+                self._bank = bank
+                self._index = None
+                self._difficulty_index = None
+            filtered = bool(self.category or self.difficulty or self.tags)
+            if not self.adaptive:
+                # Recent questions are skipped by the adaptive search instead
+                filtered = filtered or self.recent is not None or self.count is not None
+            if self._index is None and filtered:
+                self._index = BankIndex(bank)
+            if self._difficulty_index is None and self.adaptive:
+                self._difficulty_index = DifficultyIndex(bank)
+            index = self._index
+            difficulty_index = self._difficulty_index
+        return assemble_quiz(
+            bank,
+            count=self.count,
+            category=self.category,
+            difficulty=self.difficulty,
+            tags=self.tags,
+            recent=self.recent,
+            index=index,
+            seed=seed,
+            adaptive=self.adaptive,
+            difficulty_index=difficulty_index,
+        )
+
+    def apply_change(self, change):
+        """
+        Start the next sessions on a reloaded bank (see reload.BankReloader).
+
+        The indexes are updated for the changed questions only. Sessions
+        already started keep the bank and indexes they began with.
+        """
+        with self._lock:
+            if self._bank is not change.old:
+                self._index = None  # Not built for this bank: build when needed
+                self._difficulty_index = None
+            if self._index is not None:
+                self._index = self._index.updated(change)
+            if self._difficulty_index is not None:
+                self._difficulty_index = self._difficulty_index.updated(change)
+            self._bank = change.bank
+
+    def session_finished(self, session):
+        """
+        Record a finished adaptive session in the recent questions.
+
+        Other sessions were recorded when they started.
+        """
+        if self.recent is not None and self.adaptive:
+            self.recent.add_session(session.session_questions())
@@ -0,0 +1,167 @@
+import time  # Import time to place entries in time windows
+from bisect import bisect_right  # Import bisect to keep boards sorted
+from threading import Lock  # Import Lock so frontends and servers can share boards
+
+DEFAULT_SIZE = 10  # Entries kept per board
+HOUR = 3600
+DAY = 86400
+WINDOWS = ("all", "day", "hour")
+
+
+class LeaderboardEntry:
+    """
+    One finished session on a leaderboard.
+    """
+
+    __slots__ = ("player", "score", "answered", "elapsed", "finished_at")
+
+    def __init__(self, player, score, answered, elapsed=None, finished_at=None):
+        self.player = player
+        self.score = score
+        self.answered = answered
+        self.elapsed = elapsed  # Seconds the session took, or None if unknown
+        self.finished_at = time.time() if finished_at is None else finished_at
+
+    def rank_key(self):
+        """
+        Sort key: highest score first, then fastest, then earliest.
+        """
+        elapsed = float("inf") if self.elapsed is None else self.elapsed
+        return (-self.score, elapsed, self.finished_at)
+
+    def to_dict(self):
+        return {
+            "player": self.player,
+            "score": self.score,
+            "answered": self.answered,
+            "elapsed": self.elapsed,
+            "finished_at": self.finished_at,
+        }
+
+
+class Leaderboard:
+    """
+    The best `size` entries seen so far, kept in rank order.
+
+    Adding an entry that does not make the board is a single comparison
+    against the last place; one that does is inserted with a binary search.
+    Reading the board is a slice, O(size), however many sessions were added.
+    """
+
+    def __init__(self, size=DEFAULT_SIZE):
+        self.size = size
+        self._keys = []  # Rank keys, sorted, parallel to _entries
+        self._entries = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry):
+        """
+        Add an entry; returns its 1-based rank, or None if it did not make it.
+        """
+        key = entry.rank_key()
+        if len(self._keys) >= self.size and key >= self._keys[-1]:
+            return None
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._entries.insert(position, entry)
+        if len(self._keys) > self.size:
+            self._keys.pop()
+            self._entries.pop()
+        return position + 1
+
+    def top(self, count=None):
+        """
+        Return the best `count` entries (all of them by default), best first.
+        """
+        return self._entries[:count]
+
+
+class WindowedLeaderboard:
+    """
+    Leaderboards for consecutive time windows, e.g. one per hour or per day.
+
+    Each entry goes to the board of the window it finished in. Windows
+    follow local time, so daily boards start at local midnight. Only the
+    current and previous `keep` - 1 windows are kept; older boards are
+    dropped whole, so expiring entries costs nothing per entry.
+    """
+
+    def __init__(self, window, size=DEFAULT_SIZE, keep=2):
+        self.window = window  # Window length in seconds
+        self.size = size
+        self.keep = keep
+        self._boards = {}  # Window number -> Leaderboard
+
+    def _window_of(self, timestamp):
+        offset = time.localtime(timestamp).tm_gmtoff
+        return int((timestamp + offset) // self.window)
+
+    def add(self, entry):
+        """
+        Add an entry to its window's board; returns its rank there, or None.
+        """
+        number = self._window_of(entry.finished_at)
+        board = self._boards.get(number)
+        if board is None:
+            newest = max(number, max(self._boards, default=number))
+            if number <= newest - self.keep:
+                return None  # Its window has already expired
+            board = self._boards[number] = Leaderboard(self.size)
+            for expired in [n for n in self._boards if n <= newest - self.keep]:
+                del self._boards[expired]
+        return board.add(entry)
+
+    def top(self, count=None, now=None):
+        """
+        Return the best entries of the window containing `now`.
+        """
+        board = self._boards.get(self._window_of(time.time() if now is None else now))
+        return board.top(count) if board is not None else []
+
+
+class Leaderboards:
+    """
+    Live all-time, daily and hourly top lists, updated as sessions end.
+    """
+
+    def __init__(self, size=DEFAULT_SIZE):
+        self.size = size
+        self.boards = {
+            "all": Leaderboard(size),
+            "day": WindowedLeaderboard(DAY, size),
+            "hour": WindowedLeaderboard(HOUR, size),
+        }
+        self._lock = Lock()
+
+    def record(self, player, score, answered, elapsed=None, finished_at=None):
+        """
+        Add a finished session to every board; returns its daily rank or None.
+        """
+        entry = LeaderboardEntry(player, score, answered, elapsed, finished_at)
+        with self._lock:
+            ranks = {name: board.add(entry) for name, board in self.boards.items()}
+        return ranks["day"]
+
+    def top(self, window="day", count=None):
+        """
+        Return the best entries of a board: "all", "day" or "hour".
+        """
+        with self._lock:
+            return self.boards[window].top(count)
+
+    def load(self, results_store):
+        """
+        Seed the boards with today's best sessions from a ResultsStore.
+
+        This keeps the daily board across restarts of a frontend.
+        """
+        for row in results_store.top_today(self.size):
+            self.record(
+                row["player"],
+                row["score"],
+                row["answered"],
+                row["elapsed"],
+                row["finished_at"],
+            )
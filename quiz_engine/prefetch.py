@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor  # Import the bounded worker pool
+from threading import Lock  # Import Lock to guard the shared future table
+
+DEFAULT_DEPTH = 3  # Number of upcoming questions to prefetch images for
+DEFAULT_WORKERS = 2  # Number of images fetched at the same time
+
+
+class LoadCancelled(Exception):
+    """
+    Raised by a loader when the image it is loading is no longer wanted.
+    """
+
+
+class LoadToken:
+    """
+    Cancellation flag shared between the prefetcher and one image load.
+    """
+
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        """
+        Raise LoadCancelled if the load has been cancelled.
+        """
+        if self.cancelled:
+            raise LoadCancelled()
+
+
+class ImagePrefetcher:
+    """
+    Fetch, decode and resize question images ahead of time.
+
+    While the player is answering the current question, the images of the
+    next `depth` questions are loaded on a small worker pool, so that moving
+    to the next question finds its image already decoded.
+
+    Every call to `advance` starts a new generation. Loads that fall out of
+    the current and upcoming window are cancelled: queued ones never start
+    and running ones stop before decoding. At most `depth` + 1 loads are
+    therefore queued or running at any time. Callers compare the
+    generation they started with against `generation` to drop images that
+    finish after the player has moved on.
+    """
+
+    def __init__(
+        self,
+        loader=None,
+        depth=DEFAULT_DEPTH,
+        max_workers=DEFAULT_WORKERS,
+        asset_pack=None,
+    ):
+        """
+        Initialize the prefetcher with an image loader and pool settings.
+
+        The loader is called as loader(image_path, token) and should call
+        token.check() between fetching and decoding. Images found in
+        `asset_pack` are already pre-rendered and are never loaded.
+        """
+        if loader is None:
+            # Imported here so the engine stays usable without PIL and requests
+            from .images import ImageLoader
+
+            loader = ImageLoader()
+        self.loader = loader  # Turns an image path into a display-ready image
+        self.depth = depth  # Look-ahead depth, in questions
+        self.asset_pack = asset_pack  # AssetPack of pre-rendered thumbnails, or None
+        self.generation = 0  # Incremented every time the current question changes
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="image-prefetch"
+        )
+        self._loads = {}  # Image path -> (Future of the loaded image, LoadToken)
+        self._lock = Lock()
+
+    def get(self, image_path):
+        """
+        Return a Future for the image, starting the load if it is not under way.
+        """
+        with self._lock:
+            load = self._loads.get(image_path)
+            if load is None:
+                load = self._loads[image_path] = self._start(image_path)
+            return load[0]
+
+    def _start(self, image_path):
+        """
+        Start loading an image and return its (Future, LoadToken) pair.
+        """
+        token = LoadToken()
+        return self._executor.submit(self.loader, image_path, token), token
+
+    def _cancel(self, future, token):
+        """
+        Cancel a load that is no longer wanted.
+        """
+        token.cancel()
+        future.cancel()
+
+    def is_current(self, generation):
+        """
+        Check if no newer question has been advanced to since `generation`.
+        """
+        return generation == self.generation
+
+    def advance(self, session):
+        """
+        Load the current question's image and prefetch the upcoming ones.
+
+        Images that are no longer current or upcoming are cancelled and
+        forgotten, which also keeps the number of decoded images held in
+        memory bounded. Returns a Future for the current image, or None if
+        it has none or it is in the asset pack.
+        """
+        self.generation += 1
+        current = session.current_image()
+        upcoming = session.upcoming_images(self.depth)
+        if self.asset_pack is not None:
+            if current in self.asset_pack:
+                current = ""
+            upcoming = [path for path in upcoming if path not in self.asset_pack]
+        wanted = set(upcoming)
+        if current:
+            wanted.add(current)
+        with self._lock:
+            for image_path in list(self._loads):
+                if image_path not in wanted:
+                    self._cancel(*self._loads.pop(image_path))
+        future = self.get(current) if current else None
+        for image_path in upcoming:
+            self.get(image_path)
+        return future
+
+    def shutdown(self):
+        """
+        Stop the worker pool, cancelling every load still under way.
+        """
+        with self._lock:
+            for future, token in self._loads.values():
+                self._cancel(future, token)
+            self._loads.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,261 @@
+import bisect  # Import bisect to find histogram buckets
+import cProfile  # Import cProfile for the function-level profile
+import functools  # Import functools to keep the names of wrapped functions
+import inspect  # Import inspect to see how many arguments a callback takes
+import json  # Import json to write the latency histograms
+import os  # Import os to create the profile directory
+import time  # Import time to time callbacks
+from threading import Lock  # Import Lock since engine calls come from many threads
+
+DEFAULT_PROFILE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "quiz_game", "profiles"
+)
+DEFAULT_LAG_INTERVAL = 50  # Milliseconds between event-loop lag samples
+# Histogram bucket upper edges in milliseconds: 0.01 ms to about 84 s, 4 per octave
+BUCKET_EDGES = tuple(0.01 * 2 ** (step / 4) for step in range(93))
+
+
+class LatencyHistogram:
+    """
+    Log-scale histogram of latencies, in milliseconds.
+
+    Memory stays constant however long a kiosk runs; percentiles are
+    accurate to the bucket width, about 19%.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES) + 1)  # Last bucket: beyond the edges
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, milliseconds):
+        self.counts[bisect.bisect_left(BUCKET_EDGES, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+
+    def percentile(self, fraction):
+        """
+        Return the upper edge of the bucket holding the given fraction (0-1),
+        or the largest latency seen if that is lower.
+        """
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted and count and bucket < len(BUCKET_EDGES):
+                return min(BUCKET_EDGES[bucket], self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max,
+        }
+
+    def to_dict(self):
+        """
+        Return the summary with the non-empty buckets, keyed by upper edge.
+        """
+        buckets = {}
+        for bucket, count in enumerate(self.counts):
+            if count:
+                edge = BUCKET_EDGES[bucket] if bucket < len(BUCKET_EDGES) else "inf"
+                buckets[edge if edge == "inf" else f"{edge:.4g}"] = count
+        return {**self.summary(), "buckets": buckets}
+
+
+class Profiler:
+    """
+    Opt-in profiling of a frontend: callback latencies, event-loop lag and
+    a cProfile of the GUI thread.
+
+    Nothing is changed until `instrument` is called: then the chosen
+    methods of a class are replaced with wrappers that time every call
+    into a LatencyHistogram. `close` puts the original methods back, so
+    when profiling is off the frontends run their code untouched, with no
+    overhead at all.
+    """
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, name="quiz"):
+        """
+        Initialize the profiler; files are written to `directory` on `dump`.
+        """
+        self.directory = directory
+        self.name = name  # Prefix of the file names, e.g. the frontend
+        self.histograms = {}  # Callback name -> LatencyHistogram
+        self._lock = Lock()
+        self._patched = []  # (class, attribute name, original function)
+        self._profile = cProfile.Profile()
+        self._lag_schedule = None
+        self._lag_interval = DEFAULT_LAG_INTERVAL
+        self._lag_due = None
+        self._started = time.strftime("%Y%m%d-%H%M%S")
+
+    def start(self):
+        """
+        Start the cProfile of the calling (GUI) thread.
+        """
+        self._profile.enable()
+
+    def record(self, name, milliseconds):
+        """
+        Add one latency to the histogram of `name`.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.add(milliseconds)
+
+    def wrap(self, name, function):
+        """
+        Return a function that calls `function` and records how long it took.
+
+        Extra positional arguments that `function` cannot take are dropped,
+        as Qt does for slots, e.g. the `checked` argument of `clicked`.
+        """
+        code = getattr(function, "__code__", None)
+        limit = None
+        if code is not None and not code.co_flags & inspect.CO_VARARGS:
+            limit = code.co_argcount
+        record = self.record
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            if limit is not None and len(args) > limit:
+                args = args[:limit]
+            begin = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, (perf_counter() - begin) * 1000)
+
+        return timed
+
+    def instrument(self, cls, names=None, prefix=None):
+        """
+        Time calls to methods of a class, on every instance.
+
+        `names` lists the methods; by default every public method defined
+        on the class itself is timed. Call this before the instances bind
+        their methods as callbacks, e.g. before a UI builds its widgets.
+        """
+        prefix = prefix or cls.__name__
+        if names is None:
+            names = [
+                name
+                for name, value in vars(cls).items()
+                if inspect.isfunction(value) and not name.startswith("_")
+            ]
+        for name in names:
+            original = vars(cls).get(name)
+            if not inspect.isfunction(original):
+                continue  # Inherited or not a plain method: leave it alone
+            setattr(cls, name, self.wrap(f"{prefix}.{name}", original))
+            self._patched.append((cls, name, original))
+
+    def instrument_engine(self):
+        """
+        Time the quiz engine calls a frontend makes from its GUI thread.
+        """
+        from .leaderboard import Leaderboards
+        from .prefetch import ImagePrefetcher
+        from .results import ResultsStore
+        from .session import QuizManager
+        from .telemetry import Telemetry
+
+        self.instrument(QuizManager)
+        self.instrument(ImagePrefetcher, ["get", "advance", "is_current"])
+        self.instrument(Telemetry)
+        self.instrument(ResultsStore, ["record_answer", "record_session"])
+        self.instrument(Leaderboards, ["record", "top"])
+
+    def watch_event_loop(self, schedule, interval=DEFAULT_LAG_INTERVAL):
+        """
+        Measure event-loop lag with a timer that should fire every `interval` ms.
+
+        `schedule(milliseconds, callback)` runs a callback on the GUI thread
+        after a delay, like `root.after` in Tk or `QTimer.singleShot` in Qt.
+        How late each tick runs is recorded as "event_loop.lag".
+        """
+        self._lag_schedule = schedule
+        self._lag_interval = interval
+        self._schedule_tick()
+
+    def _schedule_tick(self):
+        self._lag_due = time.perf_counter() + self._lag_interval / 1000
+        self._lag_schedule(self._lag_interval, self._tick)
+
+    def _tick(self):
+        if self._lag_schedule is None:
+            return
+        lag = (time.perf_counter() - self._lag_due) * 1000
+        self.record("event_loop.lag", max(lag, 0.0))
+        self._schedule_tick()
+
+    def report(self):
+        """
+        Return a text table of every callback's latencies, slowest total first.
+        """
+        with self._lock:
+            rows = [(name, h.summary()) for name, h in self.histograms.items()]
+        rows.sort(key=lambda row: row[1]["total_ms"], reverse=True)
+        width = max([len(name) for name, _ in rows] + [8])
+        lines = [
+            f"{'callback':<{width}} {'calls':>7} {'total':>9} {'mean':>8}"
+            f" {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)"
+        ]
+        for name, summary in rows:
+            lines.append(
+                f"{name:<{width}} {summary['count']:>7} {summary['total_ms']:>9.1f}"
+                f" {summary['mean_ms']:>8.2f} {summary['p50_ms']:>8.2f}"
+                f" {summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f}"
+                f" {summary['max_ms']:>8.2f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self):
+        """
+        Stop profiling and write the pstats file, histograms and report.
+
+        Returns the path prefix of the written files.
+        """
+        self._profile.disable()
+        self._lag_schedule = None  # The next tick stops the lag timer
+        prefix = os.path.join(self.directory, f"{self.name}-{self._started}")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._profile.dump_stats(prefix + ".pstats")
+            with self._lock:
+                histograms = {
+                    name: histogram.to_dict()
+                    for name, histogram in sorted(self.histograms.items())
+                }
+            with open(prefix + ".latency.json", "w") as file:
+                json.dump(histograms, file, indent=2)
+            with open(prefix + ".latency.txt", "w") as file:
+                file.write(self.report() + "\n")
+        except OSError as e:
+            print(f"Error: Could not write the profile to {self.directory}: {e}")
+        return prefix
+
+    def close(self):
+        """
+        Write the profile and put back every instrumented method.
+        """
+        prefix = self.dump()
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched.clear()
+        return prefix
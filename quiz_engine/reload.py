@@ -0,0 +1,278 @@
+import hashlib  # Import hashlib to hash the content of each question
+import json  # Import json to parse changed questions
+import os  # Import os to check the question file for changes
+from threading import Event, Lock, Thread  # Import threading to watch in the background
+
+from .bank import Question, QuestionBank, load_bank
+from .streaming import is_json_array, iter_json_array
+
+DEFAULT_RELOAD_INTERVAL = 2.0  # Seconds between checks of the question file
+
+
+def content_hash(text):
+    """
+    Return the content hash of a question's JSON text.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def iter_entry_texts(file_path):
+    """
+    Yield (JSON text, entry or None) for each question of a JSON or JSONL file.
+
+    Lines of a JSONL file are not parsed here, so unchanged questions never
+    are. Elements of a JSON array have to be parsed to find where they end.
+    """
+    with open(file_path, "r") as file:
+        if is_json_array(file):
+            yield from iter_json_array(file, with_text=True)
+            return
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line, None
+
+
+def _same(question, other):
+    return question.to_dict() == other.to_dict()
+
+
+class BankChange:
+    """
+    The difference between two snapshots of a reloaded question bank.
+
+    `changes` lists (position, old question, new question) for every
+    position that holds a different question in the new bank. The old
+    question is None at positions added at the end, and the new question
+    is None at positions beyond the end of the new bank. A question can
+    also show up at a new position when it moved into a removed one's place.
+    """
+
+    __slots__ = ("old", "bank", "changes", "questions", "added", "edited", "removed")
+
+    def __init__(self, old, bank, changes, questions=(), added=0, edited=0, removed=0):
+        self.old = old  # The previous snapshot
+        self.bank = bank  # The new snapshot
+        self.changes = changes
+        self.questions = questions  # The added and edited questions
+        self.added = added  # Questions added to the file
+        self.edited = edited  # Questions whose text stayed but content changed
+        self.removed = removed  # Questions removed from the file
+
+    def images(self):
+        """
+        Return the image paths of the added and edited questions.
+        """
+        return {question.image for question in self.questions if question.image}
+
+    def summary(self):
+        return f"{self.added} added, {self.edited} changed, {self.removed} removed"
+
+
+class BankReloader:
+    """
+    Keeps a question bank in step with its JSON or JSONL file.
+
+    The file is checked every few seconds (modification time and size).
+    When it has changed, it is read again, but only the questions whose
+    content hash is not in the current bank are turned into Question
+    records. The result is a new QuestionBank snapshot in which unchanged
+    questions are the same objects at the same positions: an edited
+    question (same text) takes the place of the old one, added questions
+    fill the places of removed ones first and are appended after that,
+    and the last questions move into any places still left. So only the
+    positions listed in the BankChange differ, and indexes over the bank
+    can be updated for those alone (see BankIndex.updated and
+    DifficultyIndex.updated). Sessions already in progress keep the
+    snapshot they started with.
+    """
+
+    def __init__(self, file_path, interval=DEFAULT_RELOAD_INTERVAL):
+        """
+        Initialize the reloader for a question file; call `load` to read it.
+        """
+        self.file_path = file_path
+        self.interval = interval
+        self.bank = QuestionBank()  # The current snapshot
+        self.watchable = True  # False for files that cannot be diffed
+        self._hashes = []  # Content hash of the question at each position
+        self._signature = None  # Modification time and size when last read
+        self._listeners = []
+        self._lock = Lock()  # One reload at a time
+        self._stop = Event()
+        self._thread = None
+
+    def subscribe(self, listener):
+        """
+        Call `listener(change)` with every BankChange, on the watching thread.
+        """
+        self._listeners.append(listener)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """
+        Read the file and return its bank; later changes are diffed against it.
+        """
+        from .compiled_bank import is_compiled_bank
+
+        if is_compiled_bank(self.file_path):
+            print(
+                f"Error: {self.file_path} is a compiled bank and cannot be watched;"
+                " watch the question file it was built from."
+            )
+            self.watchable = False
+            self.bank = load_bank(self.file_path)
+            return self.bank
+        self._read(self._stat())
+        return self.bank
+
+    def check(self):
+        """
+        Reload the file if it changed since it was last read.
+
+        Returns the BankChange, or None if no question changed.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return None
+        change = self._read(signature)
+        if change is None or not change.changes:
+            return None
+        print(f"Reloaded {self.file_path}: {change.summary()}")
+        for listener in list(self._listeners):
+            listener(change)
+        return change
+
+    def _read(self, signature):
+        """
+        Read the file and diff it against the current bank.
+
+        Returns the BankChange, or None if the file could not be read; the
+        current bank is then kept until the file changes again.
+        """
+        with self._lock:
+            self._signature = signature
+            try:
+                change = self._diff(iter_entry_texts(self.file_path))
+            except FileNotFoundError:
+                print(f"Error: The file {self.file_path} was not found.")
+                return None
+            except (ValueError, KeyError, TypeError):
+                # Also covers a file caught half-written by an editor
+                print(f"Error: The file {self.file_path} contains invalid JSON.")
+                return None
+            self.bank = change.bank
+            return change
+
+    def _diff(self, entries):
+        old = self.bank
+        hashes = list(self._hashes)
+        # Content hash -> old position; of duplicates only one is found here,
+        # the others are matched by their text below
+        by_hash = dict(zip(hashes, range(len(hashes))))
+
+        # Questions whose content is unchanged keep their place untouched
+        kept = bytearray(len(old))
+        pending = []  # (hash, question) of content not in the old bank
+        for text, entry in entries:
+            digest = content_hash(text)
+            position = by_hash.pop(digest, None)
+            if position is not None:
+                kept[position] = 1
+            else:
+                if entry is None:
+                    entry = json.loads(text)
+                pending.append((digest, Question.from_dict(entry)))
+
+        # The rest of the old questions were edited or removed
+        left = {}  # Question text -> old positions not kept
+        position = kept.find(0)
+        while position != -1:
+            left.setdefault(old[position].text, []).append(position)
+            position = kept.find(0, position + 1)
+
+        questions = list(old)
+        edited = []
+        new = []  # The edited and added questions
+        added = []  # (hash, question) to place
+        for digest, question in pending:
+            positions = left.get(question.text)
+            if not positions:
+                added.append((digest, question))
+                new.append(question)
+                continue
+            position = positions.pop()
+            hashes[position] = digest
+            if not _same(question, old[position]):  # Not only reformatted
+                questions[position] = question
+                edited.append(position)
+                new.append(question)
+        removed = sorted(p for positions in left.values() for p in positions)
+
+        # Added questions fill the places of removed ones, then go at the end
+        for position, (digest, question) in zip(removed, added):
+            questions[position] = question
+            hashes[position] = digest
+        for digest, question in added[len(removed) :]:
+            questions.append(question)
+            hashes.append(digest)
+        # Places still left are filled with the last questions
+        for position in reversed(removed[len(added) :]):
+            question = questions.pop()
+            digest = hashes.pop()
+            if position < len(questions):
+                questions[position] = question
+                hashes[position] = digest
+
+        touched = set(edited)
+        touched.update(removed)
+        touched.update(
+            range(min(len(old), len(questions)), max(len(old), len(questions)))
+        )
+        changes = []
+        for position in sorted(touched):
+            before = old[position] if position < len(old) else None
+            after = questions[position] if position < len(questions) else None
+            if before is not after:
+                changes.append((position, before, after))
+        self._hashes = hashes
+        return BankChange(
+            old,
+            QuestionBank(questions),
+            changes,
+            new,
+            len(added),
+            len(edited),
+            len(removed),
+        )
+
+    def start(self):
+        """
+        Start checking the file for changes in a daemon thread.
+        """
+        if not self.watchable or self._thread is not None:
+            return
+        self._thread = Thread(target=self._run, name="bank-reloader", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error: Could not reload {self.file_path}: {e}")
+
+    def stop(self):
+        """
+        Stop checking the file.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
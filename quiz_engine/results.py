@@ -0,0 +1,353 @@
+import csv  # Import csv for bulk exports
+import os  # Import os to create the database directory
+import queue  # Import queue to hand writes to the background writer
+import sqlite3  # Import sqlite3 for durable storage
+import time  # Import time to timestamp results
+from threading import Lock, Thread, local  # Import threading for the writer
+
+DEFAULT_RESULTS_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "quiz_game", "results.sqlite3"
+)
+DEFAULT_BATCH_SIZE = 500  # Most writes committed in one transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session TEXT PRIMARY KEY,
+    player TEXT NOT NULL,
+    age INTEGER,
+    score INTEGER NOT NULL,
+    answered INTEGER NOT NULL,
+    elapsed REAL,
+    seed INTEGER,
+    finished_at REAL NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_day_score
+    ON sessions (day, score DESC, elapsed IS NULL, elapsed);
+CREATE INDEX IF NOT EXISTS sessions_by_player
+    ON sessions (player, finished_at DESC);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS answers (
+    session TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    question_id INTEGER NOT NULL REFERENCES questions (id),
+    option TEXT,
+    correct INTEGER NOT NULL,
+    response_time REAL,
+    answered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_by_question
+    ON answers (question_id, correct);
+CREATE INDEX IF NOT EXISTS answers_by_session
+    ON answers (session);
+"""
+
+SESSION_COLUMNS = (
+    "session",
+    "player",
+    "age",
+    "score",
+    "answered",
+    "elapsed",
+    "seed",
+    "finished_at",
+    "day",
+)
+ANSWER_COLUMNS = (
+    "session",
+    "position",
+    "question",
+    "option",
+    "correct",
+    "response_time",
+    "answered_at",
+)
+
+
+def connect(file_path, check_same_thread=True):
+    """
+    Open a results database in WAL mode, creating its tables if needed.
+
+    WAL lets the leaderboard queries read while the writer is committing.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(
+        file_path, timeout=10, check_same_thread=check_same_thread
+    )
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, much faster
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class ResultsStore:
+    """
+    SQLite store of finished sessions and of every answer given.
+
+    Writes are queued and committed by a background thread in batches, one
+    transaction per batch, so the GUI never waits on the disk. Queries run
+    on a separate connection per calling thread and can be used while the
+    writer is busy.
+    """
+
+    def __init__(self, file_path=DEFAULT_RESULTS_PATH, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Open (or create) the database and start the writer thread.
+        """
+        self.file_path = file_path
+        self.batch_size = batch_size
+        connect(file_path).close()  # Create the schema before anyone reads
+        self._queue = queue.Queue()
+        self._readers = local()  # Per-thread read connection
+        self._reader_connections = []  # Read connections of every thread
+        self._reader_lock = Lock()
+        self._writer = Thread(target=self._run, name="results-writer", daemon=True)
+        self._writer.start()
+
+    # Writing
+
+    def record_answer(self, session, session_id, option, correct):
+        """
+        Queue the answer to a session's current question.
+        """
+        question = session.current_question()
+        self._queue.put(
+            (
+                "answer",
+                (
+                    session_id,
+                    session.current_question_index,
+                    question.text if question is not None else "",
+                    option,
+                    int(correct),
+                    session.time_since_shown(),
+                    time.time(),
+                ),
+            )
+        )
+
+    def record_session(self, session, session_id, player, age=None, elapsed=None):
+        """
+        Queue the result of a finished (or abandoned) session.
+        """
+        finished_at = time.time()
+        self._queue.put(
+            (
+                "session",
+                (
+                    session_id,
+                    player,
+                    age,
+                    session.score,
+                    session.current_question_index,
+                    elapsed,
+                    session.seed,
+                    finished_at,
+                    time.strftime("%Y-%m-%d", time.localtime(finished_at)),
+                ),
+            )
+        )
+
+    def _run(self):
+        try:
+            connection = connect(self.file_path)
+        except Exception as e:
+            # Keep taking writes off the queue so flush and close still return
+            print(f"Error: Could not open {self.file_path}: {e}")
+            connection = None
+        question_ids = {}  # Question text -> id, to avoid a lookup per answer
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if connection is not None:
+                    self._write(connection, question_ids, batch)
+            except Exception as e:
+                # Any error drops only this batch; the writer keeps running
+                connection.rollback()
+                question_ids.clear()  # Ids of a rolled back batch may be gone
+                print(f"Error: Could not save results to {self.file_path}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                if connection is not None:
+                    connection.close()
+                return
+
+    def _write(self, connection, question_ids, batch):
+        sessions = []
+        answers = []
+        for item in batch:
+            if item is None:
+                continue
+            kind, row = item
+            if kind == "session":
+                sessions.append(row)
+                continue
+            text = row[2]
+            question_id = question_ids.get(text)
+            if question_id is None:
+                connection.execute(
+                    "INSERT OR IGNORE INTO questions (text) VALUES (?)", (text,)
+                )
+                question_id = connection.execute(
+                    "SELECT id FROM questions WHERE text = ?", (text,)
+                ).fetchone()[0]
+                question_ids[text] = question_id
+            answers.append(row[:2] + (question_id,) + row[3:])
+        with connection:  # One transaction per batch
+            connection.executemany(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                sessions,
+            )
+            connection.executemany(
+                "INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)", answers
+            )
+
+    def flush(self):
+        """
+        Wait until every queued write has been committed.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Commit the queued writes and stop the writer.
+        """
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        # Read connections of other threads (e.g. the bank loader) too
+        with self._reader_lock:
+            connections, self._reader_connections = self._reader_connections, []
+        for connection in connections:
+            connection.close()
+        self._readers = local()
+
+    # Queries
+
+    def _reader(self):
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            # Closed by close(), which may run on another thread
+            connection = connect(self.file_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            self._readers.connection = connection
+            with self._reader_lock:
+                self._reader_connections.append(connection)
+        return connection
+
+    def top_today(self, limit=10):
+        """
+        Return today's best sessions: highest score first, then fastest.
+
+        Untimed (or abandoned) sessions come after timed ones with the same
+        score, as on the Leaderboard.
+        """
+        today = time.strftime("%Y-%m-%d")
+        return (
+            self._reader()
+            .execute(
+                "SELECT player, score, answered, elapsed, finished_at FROM sessions"
+                " WHERE day = ? ORDER BY score DESC, elapsed IS NULL, elapsed LIMIT ?",
+                (today, limit),
+            )
+            .fetchall()
+        )
+
+    def player_history(self, player, limit=20):
+        """
+        Return a player's most recent sessions, newest first.
+        """
+        return (
+            self._reader()
+            .execute(
+                "SELECT session, score, answered, elapsed, finished_at FROM sessions"
+                " WHERE player = ? ORDER BY finished_at DESC LIMIT ?",
+                (player, limit),
+            )
+            .fetchall()
+        )
+
+    def question_accuracy(self, question=None):
+        """
+        Return how often each question (or only `question`) was answered right.
+
+        Each row has the question text, the number of answers, the number of
+        correct ones and their ratio.
+        """
+        sql = (
+            "SELECT q.text AS question, a.answers, a.correct,"
+            " CAST(a.correct AS REAL) / a.answers AS accuracy"
+            " FROM (SELECT question_id, COUNT(*) AS answers,"
+            " SUM(correct) AS correct FROM answers{where} GROUP BY question_id) a"
+            " JOIN questions q ON q.id = a.question_id ORDER BY accuracy"
+        )
+        if question is None:
+            return self._reader().execute(sql.format(where="")).fetchall()
+        return (
+            self._reader()
+            .execute(
+                sql.format(
+                    where=" WHERE question_id ="
+                    " (SELECT id FROM questions WHERE text = ?)"
+                ),
+                (question,),
+            )
+            .fetchall()
+        )
+
+    def export_csv(self, directory):
+        """
+        Write every session and answer to sessions.csv and answers.csv.
+
+        Rows are streamed from the database, so exports of any size run in
+        constant memory. Returns the number of (sessions, answers) written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        counts = []
+        queries = (
+            ("sessions.csv", SESSION_COLUMNS, "SELECT * FROM sessions ORDER BY rowid"),
+            (
+                "answers.csv",
+                ANSWER_COLUMNS,
+                "SELECT a.session, a.position, q.text, a.option, a.correct,"
+                " a.response_time, a.answered_at FROM answers a"
+                " JOIN questions q ON q.id = a.question_id ORDER BY a.rowid",
+            ),
+        )
+        connection = connect(self.file_path)
+        try:
+            for file_name, columns, sql in queries:
+                with open(
+                    os.path.join(directory, file_name),
+                    "w",
+                    newline="",
+                    encoding="utf-8",
+                ) as file:
+                    writer = csv.writer(file)
+                    writer.writerow(columns)
+                    count = 0
+                    cursor = connection.execute(sql)
+                    while True:
+                        rows = cursor.fetchmany(10_000)
+                        if not rows:
+                            break
+                        writer.writerows(rows)
+                        count += len(rows)
+                counts.append(count)
+        finally:
+            connection.close()
+        return tuple(counts)
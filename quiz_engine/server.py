@@ -0,0 +1,443 @@
+import asyncio  # Import asyncio to serve many sessions from one thread
+import json  # Import json to encode requests and responses
+import secrets  # Import secrets to generate session identifiers
+import time  # Import time to expire idle sessions
+
+from .adaptive import DifficultyIndex
+from .index import BankIndex, assemble_quiz
+from .leaderboard import WINDOWS, Leaderboards
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_SESSION_TTL = 3600  # Seconds an idle session is kept
+MAX_BODY_SIZE = 64 * 1024  # Largest request body accepted
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """
+    Raised by request handlers to send an error response.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class QuizServer:
+    """
+    Headless quiz server hosting many concurrent sessions over HTTP/JSON.
+
+    All sessions share one immutable question bank; each session is a
+    QuizManager, which only holds its position, score, seed and question
+    order. A reloaded bank (see `apply_change`) is used for new sessions
+    only. Requests are served by a small HTTP/1.1 implementation on
+    asyncio streams with keep-alive, so one thread can serve thousands of
+    players.
+
+    Endpoints:
+        POST   /sessions                start a session; optional JSON body
+                                        with player, count, category,
+                                        difficulty, tags, seed and adaptive
+                                        (pick questions to match the
+                                        player's ability)
+        GET    /sessions/<id>/question  the current question
+        POST   /sessions/<id>/answer    answer it with {"option": ...} and
+                                        move to the next question
+        GET    /sessions/<id>/result    score so far and whether it is over
+        DELETE /sessions/<id>           end the session
+        GET    /leaderboard[/<window>]  best finished sessions of the day, or
+                                        of the hour ("hour") or all time
+                                        ("all")
+    """
+
+    def __init__(
+        self,
+        bank,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        session_ttl=DEFAULT_SESSION_TTL,
+        telemetry=None,
+        leaderboards=None,
+    ):
+        """
+        Initialize the server for a loaded question bank.
+
+        If a Telemetry is given, every question served and answered is
+        recorded in it. Finished sessions are ranked on `leaderboards`.
+        """
+        self.bank = bank
+        self.host = host
+        self.port = port
+        self.session_ttl = session_ttl
+        self.telemetry = telemetry
+        self.leaderboards = leaderboards or Leaderboards()
+        self.sessions = {}  # Session id -> QuizManager
+        self._last_seen = {}  # Session id -> time of its last request
+        self._players = {}  # Session id -> (player name, start time)
+        self._index = None  # BankIndex, built the first time a filter is used
+        self._difficulty_index = None  # Built for the first adaptive session
+        self._server = None
+        self._sweeper = None
+        self._connections = {}  # Task serving each open connection -> its writer
+
+    # Session handling
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "unknown session")
+        self._last_seen[session_id] = time.monotonic()
+        return session
+
+    def _check_options(self, options):
+        """
+        Reject session options of the wrong type with a 400 response.
+        """
+        count = options.get("count")
+        if count is not None and (
+            not isinstance(count, int) or isinstance(count, bool) or count < 1
+        ):
+            raise HTTPError(400, "'count' must be a positive integer")
+        seed = options.get("seed")
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise HTTPError(400, "'seed' must be an integer")
+        tags = options.get("tags")
+        if tags is not None and (
+            not isinstance(tags, list) or not all(isinstance(t, str) for t in tags)
+        ):
+            raise HTTPError(400, "'tags' must be a list of strings")
+        for name in ("category", "difficulty", "player"):
+            if options.get(name) is not None and not isinstance(options[name], str):
+                raise HTTPError(400, f"'{name}' must be a string")
+
+    def create_session(self, options):
+        """
+        Start a new session and return its id.
+
+        Raises HTTPError (400) if an option has the wrong type.
+        """
+        self._check_options(options)
+        filters = {
+            "count": options.get("count"),
+            "category": options.get("category"),
+            "difficulty": options.get("difficulty"),
+            "tags": options.get("tags") or (),
+        }
+        adaptive = bool(options.get("adaptive"))
+        if any(filters.values()) and self._index is None:
+            self._index = BankIndex(self.bank)
+        if adaptive and self._difficulty_index is None:
+            self._difficulty_index = DifficultyIndex(self.bank)
+        session = assemble_quiz(
+            self.bank,
+            index=self._index,
+            seed=options.get("seed"),
+            adaptive=adaptive,
+            difficulty_index=self._difficulty_index,
+            **filters,
+        )
+        session_id = secrets.token_urlsafe(12)
+        self.sessions[session_id] = session
+        self._last_seen[session_id] = time.monotonic()
+        self._players[session_id] = (options.get("player") or "", time.monotonic())
+        return session_id, session
+
+    def apply_change(self, change):
+        """
+        Start new sessions on a reloaded bank (see reload.BankReloader).
+
+        The indexes are updated for the changed questions only; sessions in
+        progress keep the bank they started with. Call this on the server's
+        event loop.
+        """
+        if self.bank is not change.old:
+            self._index = None  # Built for another bank: build again when needed
+            self._difficulty_index = None
+        if self._index is not None:
+            self._index = self._index.updated(change)
+        if self._difficulty_index is not None:
+            self._difficulty_index = self._difficulty_index.updated(change)
+        self.bank = change.bank
+
+    def end_session(self, session_id):
+        """
+        Forget a session.
+        """
+        self.sessions.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+        self._players.pop(session_id, None)
+
+    def expire_sessions(self):
+        """
+        Forget sessions that have been idle for longer than the TTL.
+        """
+        deadline = time.monotonic() - self.session_ttl
+        for session_id in [s for s, seen in self._last_seen.items() if seen < deadline]:
+            self.end_session(session_id)
+
+    def _total(self, session):
+        if session.adaptive is not None:
+            return session.adaptive.limit
+        return len(session.order) if session.order is not None else len(session.bank)
+
+    # Request handlers, each returning (status, JSON-serialisable body)
+
+    def handle(self, method, path, body):
+        """
+        Route a request to its handler.
+        """
+        parts = path.strip("/").split("/")
+        if parts == ["sessions"]:
+            if method != "POST":
+                raise HTTPError(405, "use POST to start a session")
+            session_id, session = self.create_session(body or {})
+            return 201, {
+                "session": session_id,
+                "seed": session.seed,
+                "questions": self._total(session),
+            }
+        if parts[0] == "leaderboard" and len(parts) <= 2:
+            if method != "GET":
+                raise HTTPError(405, "use GET to read the leaderboard")
+            return 200, self.leaderboard(parts[1] if len(parts) == 2 else "day")
+        if len(parts) < 2 or parts[0] != "sessions":
+            raise HTTPError(404, "not found")
+        session_id = parts[1]
+        action = parts[2] if len(parts) == 3 else None
+        if len(parts) == 2 and method == "DELETE":
+            self._session(session_id)
+            self.end_session(session_id)
+            return 200, {"session": session_id, "ended": True}
+        session = self._session(session_id)
+        if action == "question" and method == "GET":
+            return 200, self.question(session, session_id)
+        if action == "answer" and method == "POST":
+            return 200, self.answer(session, body or {}, session_id)
+        if action == "result" and method == "GET":
+            return 200, self.result(session)
+        raise HTTPError(404, "not found")
+
+    def question(self, session, session_id=None):
+        """
+        Describe the current question of a session.
+        """
+        if session.is_quiz_over():
+            return {"done": True}
+        if self.telemetry is not None and session.shown_at is None:
+            self.telemetry.question_shown(session, session_id)
+        session.mark_shown()
+        question, options, _, image = session.get_randomized_question()
+        return {
+            "done": False,
+            "number": session.current_question_index + 1,
+            "question": question,
+            "options": list(options),
+            "image": image,
+        }
+
+    def answer(self, session, body, session_id=None):
+        """
+        Grade an answer to the current question and move to the next one.
+        """
+        if session.is_quiz_over():
+            raise HTTPError(409, "the quiz is over")
+        if "option" not in body:
+            raise HTTPError(400, "missing 'option'")
+        if not isinstance(body["option"], str):
+            raise HTTPError(400, "'option' must be a string")
+        _, _, correct_answer, _ = session.get_randomized_question()
+        correct = session.check_answer(body["option"], correct_answer)
+        if self.telemetry is not None:
+            self.telemetry.question_answered(
+                session, session_id, body["option"], correct
+            )
+        session.next_question()
+        done = session.is_quiz_over()
+        rank = None
+        if done:
+            player, started = self._players.get(session_id, ("", time.monotonic()))
+            rank = self.leaderboards.record(
+                player,
+                session.score,
+                session.current_question_index,
+                time.monotonic() - started,
+            )
+        return {
+            "correct": correct,
+            "correct_answer": correct_answer,
+            "score": session.score,
+            "done": done,
+            "rank": rank,
+        }
+
+    def leaderboard(self, window):
+        """
+        List the best finished sessions of a leaderboard window.
+        """
+        if window not in WINDOWS:
+            raise HTTPError(404, f"unknown leaderboard window {window!r}")
+        return {
+            "window": window,
+            "entries": [entry.to_dict() for entry in self.leaderboards.top(window)],
+        }
+
+    def result(self, session):
+        """
+        Report the score of a session.
+        """
+        return {
+            "score": session.score,
+            "answered": session.current_question_index,
+            "questions": self._total(session),
+            "done": session.is_quiz_over(),
+            "seed": session.seed,
+        }
+
+    # HTTP plumbing
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Serve requests on one keep-alive connection until it is closed.
+        """
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request_line = await self._read_line(
+                        reader, 400, "request line too long"
+                    )
+                    if not request_line:
+                        break
+                    try:
+                        method, target, version = request_line.decode("latin-1").split()
+                    except ValueError:
+                        raise HTTPError(400, "bad request")
+                    headers = {}
+                    while True:
+                        line = await self._read_line(reader, 431, "header too long")
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except HTTPError as e:
+                    # The rest of the request cannot be found: answer and close
+                    await self._respond(writer, e.status, {"error": e.message}, False)
+                    break
+                keep_alive = headers.get("connection", "").lower() != "close" and (
+                    version == "HTTP/1.1"
+                    or headers.get("connection", "").lower() == "keep-alive"
+                )
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(
+                        writer, 400, {"error": "invalid Content-Length"}, False
+                    )
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self._respond(writer, 413, {"error": "body too large"}, False)
+                    break
+                raw_body = await reader.readexactly(length) if length else b""
+                try:
+                    try:
+                        body = json.loads(raw_body) if raw_body else None
+                    except ValueError:
+                        raise HTTPError(400, "invalid JSON")
+                    if body is not None and not isinstance(body, dict):
+                        raise HTTPError(400, "expected a JSON object")
+                    status, payload = self.handle(method, target.split("?")[0], body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception as e:
+                    # A handler bug must still get the client a reply
+                    print(f"Error: {method} {target} failed: {e!r}")
+                    status, payload = 500, {"error": "internal server error"}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _read_line(self, reader, status, message):
+        """
+        Read a line of the request head, or raise HTTPError if it is too long.
+        """
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HTTPError(status, message)
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def _sweep(self):
+        """
+        Periodically expire idle sessions.
+        """
+        while True:
+            await asyncio.sleep(min(60, self.session_ttl))
+            self.expire_sessions()
+
+    async def start(self):
+        """
+        Start listening; the actual port is stored in `port` (useful with 0).
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.create_task(self._sweep())
+        return self
+
+    async def stop(self):
+        """
+        Stop listening, close open connections and cancel background work.
+        """
+        self._sweeper.cancel()
+        self._server.close()
+        # Connections waiting for their next request see the end of input
+        # and finish; a request being handled is cut short
+        tasks = list(self._connections)
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        """
+        Start the server and serve until cancelled.
+        """
+        await self.start()
+        print(f"Quiz server listening on http://{self.host}:{self.port}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
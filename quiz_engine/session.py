@@ -0,0 +1,198 @@
+import os  # Import os to recognise file paths
+import random  # Import random to pick session seeds
+import time  # Import time to measure how long questions are on screen
+
+from .bank import load_bank
+from .shuffle import OptionShuffle, OptionsView
+
+
+class QuizManager:
+    """
+    Class to manage a single player's quiz session.
+
+    The question bank is shared and never modified; everything that belongs
+    to one player (position, score and option order) lives on the session,
+    so one loaded bank can serve many sessions at once. Option orders are
+    derived from the session's seed, so a session can be replayed exactly.
+    """
+
+    __slots__ = (
+        "bank",
+        "order",
+        "adaptive",
+        "seed",
+        "current_question_index",
+        "score",
+        "shown_at",
+        "_shuffle",
+    )
+
+    def __init__(self, question_source, order=None, seed=None, adaptive=None):
+        """
+        Initialize the session from a question file path or a loaded bank.
+
+        `order` lists the bank positions to ask, in order (see
+        BankIndex.select); by default every question is asked in file order.
+        With an AdaptiveSelector as `adaptive`, each question is instead
+        picked after the previous answer, to match the player's ability.
+        `seed` fixes the option orders; a random one is picked by default.
+        """
+        if isinstance(question_source, (str, os.PathLike)):
+            self.bank = load_bank(question_source)
+        else:
+            self.bank = question_source
+        self.order = order  # Bank positions of this session's questions, or None
+        self.adaptive = adaptive  # AdaptiveSelector picking the questions, or None
+        self.current_question_index = 0  # Start with the first question
+        self.score = 0  # Initialize score
+        self.shown_at = None  # Monotonic time the current question was shown
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self._shuffle = OptionShuffle(self.seed)  # Option orders of this session
+        if adaptive is not None:
+            self.order = []  # Filled in as the questions are picked
+            self._pick_next()
+
+    @property
+    def questions(self):
+        """
+        The question bank this session is drawing from.
+        """
+        return self.bank
+
+    def _question_at(self, index, wait=True):
+        """
+        Return the question at an index of this session, or None past the end.
+
+        Without `wait`, questions a streaming bank has not loaded yet are
+        treated as missing instead of being waited for.
+        """
+        if self.order is not None:
+            if index >= len(self.order):
+                return None
+            return self.bank[self.order[index]]
+        if self.bank.wait_for(index) if wait else index < len(self.bank):
+            return self.bank[index]
+        return None
+
+    def _pick_next(self):
+        position = self.adaptive.pick()
+        if position is not None:
+            self.order.append(position)
+
+    def session_questions(self):
+        """
+        Return the questions of this session, in the order they are asked.
+
+        For an adaptive session these are the questions picked so far.
+        """
+        if self.order is not None:
+            return [self.bank[position] for position in self.order]
+        return list(self.bank)
+
+    def replay(self):
+        """
+        Return a fresh session asking the same questions with the same options.
+
+        An adaptive session is replayed with the questions it picked.
+        """
+        order = list(self.order) if self.adaptive is not None else self.order
+        return QuizManager(self.bank, order=order, seed=self.seed)
+
+    def current_question(self):
+        """
+        Return the current Question, or None when the quiz is over.
+        """
+        return self._question_at(self.current_question_index)
+
+    def mark_shown(self):
+        """
+        Note that the current question is on screen, if not noted already.
+        """
+        if self.shown_at is None:
+            self.shown_at = time.monotonic()
+
+    def time_since_shown(self):
+        """
+        Return the seconds the current question has been shown, or None.
+        """
+        if self.shown_at is None:
+            return None
+        return time.monotonic() - self.shown_at
+
+    def get_option_order(self):
+        """
+        Return the display order of the current question's options.
+
+        The order is a tuple of indexes into the question's stored options.
+        """
+        question = self._question_at(self.current_question_index)
+        if question is None:
+            return None
+        return self._shuffle.order(self.current_question_index, len(question.options))
+
+    def get_randomized_question(self):
+        """
+        Retrieve the current question with options in random order.
+
+        The options are returned as a read-only view in display order.
+        """
+        question = self._question_at(self.current_question_index)
+        if question is not None:
+            order = self._shuffle.order(
+                self.current_question_index, len(question.options)
+            )
+            options = OptionsView(question.options, order)
+            return question.text, options, question.correct, question.image
+        else:
+            return None, None, None, None
+
+    def current_image(self):
+        """
+        Return the image path of the current question, empty if it has none.
+        """
+        question = self._question_at(self.current_question_index)
+        return question.image if question is not None else ""
+
+    def upcoming_images(self, count):
+        """
+        Return the image paths of up to `count` questions after the current one.
+
+        Only questions that are already loaded are considered.
+        """
+        images = []
+        start = self.current_question_index + 1
+        for index in range(start, start + count):
+            question = self._question_at(index, wait=False)
+            if question is None:
+                break
+            if question.image:
+                images.append(question.image)
+        return images
+
+    def next_question(self):
+        """
+        Move to the next question.
+        """
+        self.current_question_index += 1
+        self.shown_at = None
+        if self.adaptive is not None and self.current_question_index == len(self.order):
+            self._pick_next()
+
+    def check_answer(self, selected_option, correct_option):
+        """
+        Check if the selected option is correct and update the score.
+
+        In an adaptive session this also updates the ability estimate.
+        """
+        correct = selected_option == correct_option
+        if correct:
+            self.score += 1
+        if self.adaptive is not None:
+            self.adaptive.update(correct)
+        return correct
+
+    def is_quiz_over(self):
+        """
+        Check if all questions have been answered.
+        """
+        return self._question_at(self.current_question_index) is None
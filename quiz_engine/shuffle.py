@@ -0,0 +1,99 @@
+import random  # Import random for the seeded generator
+import sys  # Import sys to check the machine byte order
+from array import array  # Import array to hold the random draws compactly
+from collections.abc import Sequence  # Import Sequence for the options view
+from itertools import permutations  # Import permutations to build lookup tables
+
+BATCH_SIZE = 256  # Number of option orders drawn at a time
+MAX_TABLE_OPTIONS = 7  # Largest option count with a precomputed table (5040 rows)
+
+_tables = {}  # Option count -> tuple of every permutation of range(count)
+
+
+def permutation_table(option_count):
+    """
+    Return every ordering of `option_count` options, computed once.
+    """
+    table = _tables.get(option_count)
+    if table is None:
+        table = _tables[option_count] = tuple(permutations(range(option_count)))
+    return table
+
+
+class OptionsView(Sequence):
+    """
+    Read-only view of a question's options in a shuffled order.
+
+    No list is built; items are looked up through the permutation.
+    """
+
+    __slots__ = ("_options", "_order")
+
+    def __init__(self, options, order):
+        self._options = options  # The question's options, as stored in the bank
+        self._order = order  # Option indexes in display order
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._options[i] for i in self._order[index]]
+        return self._options[self._order[index]]
+
+    def __iter__(self):
+        options = self._options
+        for i in self._order:
+            yield options[i]
+
+    def __repr__(self):
+        return f"OptionsView({list(self)!r})"
+
+
+class OptionShuffle:
+    """
+    Deterministic option orders for every question of a session.
+
+    Random draws are generated from the seed in batches, one 32-bit value
+    per question, and each draw picks a row of a precomputed permutation
+    table. The same seed always gives the same orders, so a session can be
+    replayed exactly and the bank is never shuffled in place.
+    """
+
+    __slots__ = ("seed", "_rng", "_draws")
+
+    def __init__(self, seed):
+        """
+        Initialize the shuffle from a seed.
+        """
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._draws = array("I")  # One random value per question position
+
+    def _draw(self, position):
+        """
+        Return the random value for a position, drawing more batches as needed.
+        """
+        while position >= len(self._draws):
+            batch = array("I")
+            batch.frombytes(
+                self._rng.getrandbits(32 * BATCH_SIZE).to_bytes(
+                    batch.itemsize * BATCH_SIZE, "little"
+                )
+            )
+            if sys.byteorder == "big":
+                batch.byteswap()
+            self._draws.extend(batch)
+        return self._draws[position]
+
+    def order(self, position, option_count):
+        """
+        Return the display order (a tuple of option indexes) for a position.
+        """
+        draw = self._draw(position)
+        if option_count <= MAX_TABLE_OPTIONS:
+            table = permutation_table(option_count)
+            return table[draw % len(table)]
+        order = list(range(option_count))  # Too many options for a table
+        random.Random(draw).shuffle(order)
+        return tuple(order)
@@ -0,0 +1,23 @@
+def percentile(sorted_values, fraction):
+    """
+    Return the value at the given fraction (0-1) of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    index = int(round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(values):
+    """
+    Summarize a list of latencies (or any measurements) with percentiles.
+    """
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": values[-1] if values else 0.0,
+    }
@@ -0,0 +1,232 @@
+import json  # Import json to decode question entries
+import random  # Import random for reservoir sampling
+from threading import Condition, Thread  # Import primitives for background loading
+
+from .bank import Question
+
+CHUNK_SIZE = 64 * 1024  # Characters read from the file at a time
+NUMBER_CHARS = frozenset("0123456789+-.eE")  # Characters that can continue a number
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def iter_json_array(file, chunk_size=CHUNK_SIZE, with_text=False):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    The file is read in chunks and only the unparsed tail is kept in
+    memory, so arrays far larger than memory can be processed. With
+    `with_text`, each element is yielded as (its JSON text, its value).
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    expect = "["  # "[", then "value or ]", "value" after a comma, or ", or ]"
+
+    while True:
+        # Skip whitespace, reading more text when we run out
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer = buffer[position:] + file.read(chunk_size)
+            position = 0
+            eof = position == len(buffer)
+        if position == len(buffer):
+            raise json.JSONDecodeError("Unexpected end of array", buffer, position)
+
+        char = buffer[position]
+        if expect == "[":
+            if char != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, position)
+            expect = "value or ]"
+            position += 1
+            continue
+        if expect == ", or ]":
+            if char == "]":
+                _check_end(file, buffer, position + 1, chunk_size)
+                return
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+            expect = "value"
+            position += 1
+            continue
+        if char == "]":
+            if expect == "value":
+                raise json.JSONDecodeError("Expecting value", buffer, position)
+            _check_end(file, buffer, position + 1, chunk_size)
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            end = None
+        if not eof and (
+            end is None
+            or end == len(buffer)
+            or (_is_number(value) and NUMBER_CHARS.issuperset(buffer[end:]))
+        ):
+            # The element may continue in the next chunk (a number cut after
+            # "7." or "1e" decodes as just its leading digits)
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        if end is None:
+            raise json.JSONDecodeError("Unterminated element", buffer, position)
+        yield (buffer[position:end], value) if with_text else value
+        expect = ", or ]"
+        position = end
+        if position > chunk_size:
+            buffer = buffer[position:]  # Drop text that has been parsed
+            position = 0
+
+
+def _check_end(file, buffer, position, chunk_size):
+    """
+    Raise JSONDecodeError if anything but whitespace follows the array.
+    """
+    while True:
+        rest = buffer[position:]
+        if rest.strip(" \t\r\n"):
+            extra = position + len(rest) - len(rest.lstrip(" \t\r\n"))
+            raise json.JSONDecodeError("Extra data", buffer, extra)
+        buffer = file.read(chunk_size)
+        position = 0
+        if not buffer:
+            return
+
+
+def is_json_array(file):
+    """
+    Check if a question file holds a JSON array rather than JSON Lines.
+
+    Looks at the first non-whitespace character, then rewinds the file.
+    """
+    first = file.read(1)
+    while first.isspace():
+        first = file.read(1)
+    file.seek(0)
+    return first == "["
+
+
+def iter_jsonl(file):
+    """
+    Yield the JSON value on each non-empty line of a JSONL file.
+    """
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_questions(file_path):
+    """
+    Yield Question records from a JSON array or JSONL file, parsing lazily.
+    """
+    with open(file_path, "r") as file:
+        entries = iter_json_array(file) if is_json_array(file) else iter_jsonl(file)
+        for entry in entries:
+            yield Question.from_dict(entry)
+
+
+def reservoir_sample(items, k, rng=None):
+    """
+    Pick k items uniformly at random from an iterable of unknown length.
+
+    Only k items are held in memory at any time. The sample is returned in
+    random order.
+    """
+    rng = rng or random.Random()
+    reservoir = []
+    for seen, item in enumerate(items):
+        if seen < k:
+            reservoir.append(item)
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < k:
+                reservoir[slot] = item
+    rng.shuffle(reservoir)
+    return reservoir
+
+
+class StreamingBank:
+    """
+    Question bank that fills itself from a file in a background thread.
+
+    Questions become available as soon as they are parsed, so a quiz can
+    start on the first question while the rest of a large file loads.
+    """
+
+    def __init__(self, file_path):
+        """
+        Initialize the bank and start loading questions from the file.
+        """
+        self.file_path = file_path
+        self._questions = []
+        self._complete = False
+        self._condition = Condition()
+        self._thread = Thread(target=self._load, daemon=True)
+        self._thread.start()
+
+    def _load(self):
+        """
+        Parse the file, publishing each question as it is read.
+        """
+        try:
+            for question in iter_questions(self.file_path):
+                with self._condition:
+                    self._questions.append(question)
+                    self._condition.notify_all()
+        except FileNotFoundError:
+            print(f"Error: The file {self.file_path} was not found.")
+        except json.JSONDecodeError:
+            print(f"Error: The file {self.file_path} contains invalid JSON.")
+        finally:
+            with self._condition:
+                self._complete = True
+                self._condition.notify_all()
+
+    @property
+    def complete(self):
+        """
+        Whether the whole file has been loaded.
+        """
+        return self._complete
+
+    def wait_for(self, index):
+        """
+        Block until the question at `index` is loaded or the file is done.
+
+        Returns True if the question exists.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: index < len(self._questions) or self._complete
+            )
+            return index < len(self._questions)
+
+    def wait_until_complete(self):
+        """
+        Block until the whole file has been loaded.
+        """
+        self._thread.join()
+
+    def __len__(self):
+        return len(self._questions)  # Questions loaded so far
+
+    def __getitem__(self, index):
+        if index >= 0:
+            self.wait_for(index)
+        return self._questions[index]
+
+    def __iter__(self):
+        index = 0
+        while self.wait_for(index):
+            yield self._questions[index]
+            index += 1
@@ -0,0 +1,100 @@
+import hashlib  # Import hashlib to derive ETags
+import time  # Import time to simulate slow hosts
+from email.utils import formatdate  # Import formatdate for Last-Modified headers
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread  # Import Thread to serve in the background
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # Clients giving up early (timeouts, cancellations) are expected
+
+
+class StubImageServer:
+    """
+    Local HTTP stand-in for the image hosts used by the question bank.
+
+    Serves in-memory files on 127.0.0.1 with ETag and Last-Modified
+    validators and an optional per-request delay, so that image fetching can
+    be exercised and benchmarked without network access.
+    """
+
+    def __init__(self, files=None, delay=0.0, port=0):
+        """
+        Initialize the server with a mapping of URL paths to bytes.
+        """
+        self.files = dict(files or {})  # URL path -> content bytes
+        self.delay = delay  # Seconds to wait before answering each request
+        self.requests = 0  # Number of requests handled
+        self.last_modified = formatdate(usegmt=True)
+        self._server = _QuietHTTPServer(("127.0.0.1", port), self._make_handler())
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def url(self, path):
+        """
+        Return the full URL of a served path.
+        """
+        return f"http://127.0.0.1:{self.port}/{path.lstrip('/')}"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep connections alive
+
+            def do_GET(self):
+                stub.requests += 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+                data = stub.files.get(self.path.lstrip("/"))
+                if data is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", stub.last_modified)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+    def start(self):
+        """
+        Start serving in a background thread.
+        """
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and release the port.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,183 @@
+import json  # Import json to write events as JSON lines
+import os  # Import os to create the telemetry directory
+import time  # Import time to timestamp events
+from collections import deque  # Import deque as the in-memory ring buffer
+from threading import Event, Lock, Thread  # Import threading for the writer
+
+DEFAULT_TELEMETRY_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "quiz_game", "telemetry.jsonl"
+)
+DEFAULT_CAPACITY = 4096  # Events kept in memory before the oldest are dropped
+DEFAULT_BATCH_SIZE = 256  # Buffered events that wake the writer early
+DEFAULT_FLUSH_INTERVAL = 1.0  # Seconds between writes of smaller batches
+
+
+class Telemetry:
+    """
+    Per-question event stream: shown, image loaded, answered, finished.
+
+    Events go into a fixed-size in-memory ring buffer, and a background
+    thread appends them to a JSON Lines file in batches, so recording an
+    event never waits on the disk. If the writer falls behind, the oldest
+    events are dropped and counted in `dropped`. Without a file path, the
+    last `capacity` events are simply kept in memory.
+    """
+
+    def __init__(
+        self,
+        file_path=None,
+        capacity=DEFAULT_CAPACITY,
+        batch_size=DEFAULT_BATCH_SIZE,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+    ):
+        """
+        Initialize the buffer and start the writer if a file path is given.
+        """
+        self.file_path = file_path  # JSONL file events are appended to, or None
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0  # Events lost because the buffer was full
+        self._buffer = deque(maxlen=capacity)
+        self._wake = Event()
+        self._closed = False
+        self._write_lock = Lock()
+        self._file = None
+        self._writer = None
+        if file_path:
+            self._writer = Thread(
+                target=self._run, name="telemetry-writer", daemon=True
+            )
+            self._writer.start()
+
+    def record(self, event, **fields):
+        """
+        Record one event with the current wall-clock time.
+        """
+        fields["event"] = event
+        fields["time"] = time.time()
+        buffer = self._buffer
+        if len(buffer) == self.capacity:
+            self.dropped += 1  # The append below pushes out the oldest event
+        buffer.append(fields)
+        if self._writer is not None and len(buffer) >= self.batch_size:
+            self._wake.set()
+
+    def events(self):
+        """
+        Return the events still held in memory, oldest first.
+        """
+        return list(self._buffer)
+
+    # Quiz events
+
+    def _question_fields(self, session, session_id):
+        question = session.current_question()
+        return {
+            "session": session_id,
+            "seed": session.seed,
+            "position": session.current_question_index,
+            "question": question.text if question is not None else None,
+            "category": question.category if question is not None else None,
+            "difficulty": question.difficulty if question is not None else None,
+        }
+
+    def question_shown(self, session, session_id):
+        """
+        Record that the session's current question has been put on screen.
+
+        Also starts the session's clock for the question's response time.
+        """
+        session.mark_shown()
+        self.record("shown", **self._question_fields(session, session_id))
+
+    def image_loaded(self, session, session_id, source):
+        """
+        Record that the current question's image is on screen.
+
+        `source` says where it came from, e.g. "network" or "pack"; the
+        load time is measured from when the question was shown.
+        """
+        self.record(
+            "image_loaded",
+            source=source,
+            load_time=session.time_since_shown(),
+            **self._question_fields(session, session_id),
+        )
+
+    def image_failed(self, session, session_id):
+        """
+        Record that the current question's image could not be loaded.
+        """
+        self.record("image_failed", **self._question_fields(session, session_id))
+
+    def question_answered(self, session, session_id, option, correct):
+        """
+        Record an answer to the current question and how long it took.
+        """
+        self.record(
+            "answered",
+            option=option,
+            correct=correct,
+            response_time=session.time_since_shown(),
+            **self._question_fields(session, session_id),
+        )
+
+    def session_finished(self, session, session_id, elapsed=None):
+        """
+        Record the end of a session with its score.
+        """
+        self.record(
+            "finished",
+            session=session_id,
+            seed=session.seed,
+            score=session.score,
+            answered=session.current_question_index,
+            elapsed=elapsed,
+        )
+
+    # Writing
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write every buffered event to the file now.
+        """
+        if not self.file_path:
+            return
+        with self._write_lock:
+            buffer = self._buffer
+            lines = []
+            while buffer:
+                lines.append(json.dumps(buffer.popleft(), separators=(",", ":")))
+            if not lines:
+                return
+            try:
+                if self._file is None:
+                    directory = os.path.dirname(os.path.abspath(self.file_path))
+                    os.makedirs(directory, exist_ok=True)
+                    self._file = open(self.file_path, "a", encoding="utf-8")
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+            except OSError as e:
+                print(f"Error: Could not write telemetry to {self.file_path}: {e}")
+
+    def close(self):
+        """
+        Stop the writer after writing out the remaining events.
+        """
+        self._closed = True
+        if self._writer is not None:
+            self._wake.set()
+            self._writer.join()
+            self._writer = None
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
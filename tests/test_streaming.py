@@ -0,0 +1,60 @@
+import io  # Import io to feed JSON text as a file
+import json  # Import json to compare with the standard parser
+import unittest  # Import unittest for the test cases
+
+from quiz_engine.streaming import iter_json_array
+
+
+def parse(text, chunk_size):
+    """
+    Read a JSON array from text with the given chunk size.
+    """
+    return list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    """
+    Tests of the streaming JSON array reader.
+    """
+
+    def test_matches_json_load_at_every_chunk_size(self):
+        text = json.dumps(
+            [{"question": 'a,]"b', "options": ["x", "y"]}, [1, 2.5e-3], None, True]
+        )
+        for chunk_size in range(1, len(text) + 2):
+            self.assertEqual(parse(text, chunk_size), json.loads(text))
+
+    def test_numbers_split_across_chunks(self):
+        cases = ["[1,7.25]", "[-12, 3e+10]", "[1.5E-7 ]", "[100000,\n2]", "[0.125]"]
+        for text in cases:
+            for chunk_size in range(1, len(text) + 1):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(parse(text, chunk_size), json.loads(text))
+
+    def test_rejects_missing_or_extra_commas(self):
+        for text in ["[1 2]", "[1,,2]", "[,1]", "[1,]", '[{"a": 1} {"b": 2}]']:
+            for chunk_size in (1, 3, 64):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError):
+                        parse(text, chunk_size)
+
+    def test_rejects_data_after_the_array(self):
+        for text in ["[1]]", "[1] garbage", "[] x", "[1]\n\n,"]:
+            for chunk_size in (1, 2, 64):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError):
+                        parse(text, chunk_size)
+
+    def test_allows_whitespace_after_the_array(self):
+        self.assertEqual(parse("[1, 2]\n  \n", 1), [1, 2])
+        self.assertEqual(parse(" [] ", 1), [])
+
+    def test_rejects_truncated_arrays(self):
+        for text in ["", "[", "[1", "[1,", '[{"a": 1']:
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    parse(text, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
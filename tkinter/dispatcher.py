@@ -0,0 +1,87 @@
+import time  # Import time to bound the work done per tick
+import traceback  # Import traceback to report failing callbacks
+from collections import OrderedDict  # Import OrderedDict to queue callbacks in order
+from itertools import count  # Import count to key callbacks that are not coalesced
+from threading import Lock  # Import Lock to guard the queue
+
+DEFAULT_INTERVAL = 10  # Milliseconds between queue drains while there is work
+IDLE_INTERVAL = 50  # Longest wait between drains of an empty queue
+DEFAULT_BUDGET = 0.008  # Seconds of callbacks run per drain before yielding to Tk
+
+
+class UIDispatcher:
+    """
+    Run callbacks from background threads on the Tk main thread.
+
+    Tk is not thread-safe, so worker threads only add their results to a
+    queue here, and the queue is drained by a `root.after` poll on the Tk
+    thread. The poll backs off while the queue stays empty, so an idle
+    window wakes up rarely. Posts that share a key are coalesced: if
+    several images for the same label arrive before the next drain, only
+    the latest one is rendered. Each drain stops after a small time budget
+    so a burst of work never blocks the event loop.
+    """
+
+    def __init__(
+        self,
+        root,
+        interval=DEFAULT_INTERVAL,
+        idle_interval=IDLE_INTERVAL,
+        budget=DEFAULT_BUDGET,
+    ):
+        """
+        Initialize the dispatcher and start draining the queue.
+        """
+        self.root = root  # The main tkinter window
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.budget = budget
+        self._pending = OrderedDict()  # Key -> (callback, args)
+        self._sequence = count()  # Unique keys for posts without a key
+        self._lock = Lock()
+        self._delay = interval  # Wait before the next drain, Tk thread only
+        self._after_id = self.root.after(self._delay, self._drain)
+
+    def post(self, callback, *args, key=None):
+        """
+        Queue callback(*args) to run on the Tk thread. Safe from any thread.
+
+        A post with the same `key` as one still queued replaces it, keeping
+        its place in the queue.
+        """
+        with self._lock:
+            if key is None:
+                key = ("unkeyed", next(self._sequence))
+            self._pending[key] = (callback, args)
+
+    def _drain(self):
+        """
+        Run queued callbacks until the queue is empty or the budget is spent.
+        """
+        deadline = time.perf_counter() + self.budget
+        ran = False
+        while time.perf_counter() < deadline:
+            with self._lock:
+                if not self._pending:
+                    break
+                _, (callback, args) = self._pending.popitem(last=False)
+            ran = True
+            try:
+                callback(*args)
+            except Exception:
+                traceback.print_exc()
+        with self._lock:
+            left = bool(self._pending)
+        if left:
+            self._delay = 1  # Catch up quickly
+        elif ran:
+            self._delay = self.interval
+        else:
+            self._delay = min(self._delay * 2, self.idle_interval)  # Back off
+        self._after_id = self.root.after(self._delay, self._drain)
+
+    def stop(self):
+        """
+        Stop draining the queue.
+        """
+        self.root.after_cancel(self._after_id)
@@ -1,28 +1,149 @@
+import argparse  # Import argparse to read command-line options
+import os  # Import os to locate the shared quiz engine
+import sys  # Import sys to make the shared quiz engine importable
 import tkinter as tk  # Import tkinter for creating the GUI
 
-from quiz_manager import QuizManager  # Import QuizManager to handle quiz logic
-from user import User  # Import User to manage user details
-from user_interface import UserInterface  # Import UserInterface to handle the GUI
+# The quiz engine lives at the repository root, next to this frontend
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import ImagePrefetcher  # noqa: E402
+from quiz_engine.background import run_in_background  # noqa: E402
+from quiz_engine.asset_pack import open_asset_pack  # noqa: E402
+from quiz_engine.decode import DecodePool  # noqa: E402
+from quiz_engine.frontend import (  # noqa: E402
+    add_common_arguments,
+    check_common_arguments,
+    load_quiz,
+)
+from quiz_engine.http_client import FetchClient  # noqa: E402
+from quiz_engine.image_cache import ImageCache  # noqa: E402
+from quiz_engine.images import ImageLoader  # noqa: E402
+from quiz_engine.index import (  # noqa: E402
+    DEFAULT_HISTORY_PATH,
+    QuizPlan,
+    RecentQuestions,
+)
+from quiz_engine.leaderboard import Leaderboards  # noqa: E402
+from quiz_engine.results import ResultsStore  # noqa: E402
+from quiz_engine.telemetry import Telemetry  # noqa: E402
+from user import User  # noqa: E402
+from user_interface import UserInterface  # noqa: E402
+
+
+def parse_args():
+    """
+    Parse the command-line options of the quiz application.
+    """
+    parser = argparse.ArgumentParser(description="Tkinter quiz game")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+    check_common_arguments(parser, args)
+    return args
 
 
 def main():
     """
     Main function to initialize and run the quiz application.
     """
+    args = parse_args()
+
     # Create the main application window
     root = tk.Tk()
     root.title("Quiz Game")
     root.geometry("800x600")
 
+    profiler = None
+    if args.profile is not None:
+        # Only loaded when profiling, so normal runs pay nothing for it
+        from dispatcher import UIDispatcher
+        from quiz_engine.profiling import DEFAULT_PROFILE_DIR, Profiler
+
+        profiler = Profiler(args.profile or DEFAULT_PROFILE_DIR, "tkinter")
+        profiler.instrument(UserInterface)  # Before the UI binds its callbacks
+        profiler.instrument(UIDispatcher, ["_drain"])
+        profiler.instrument_engine()
+        profiler.watch_event_loop(root.after)
+        profiler.start()
+
     # Create instances of User and QuizManager
     user = User()
-    quiz_manager = QuizManager("data/questions.json")
+    recent = None
+    if args.avoid_recent:
+        recent = RecentQuestions(args.avoid_recent, DEFAULT_HISTORY_PATH)
+    # Every player's session is assembled with the same options
+    quiz_plan = QuizPlan(
+        count=args.count,
+        category=args.category,
+        difficulty=args.difficulty,
+        tags=args.tag,
+        recent=recent,
+        adaptive=args.adaptive,
+    )
+    reloader = None
+    if args.watch:
+        from quiz_engine.reload import BankReloader  # Only needed when watching
+
+        reloader = BankReloader(args.questions)
+        reloader.subscribe(quiz_plan.apply_change)  # Next players get the changes
+    # Saves results in the background
+    results_store = ResultsStore(args.results_db) if args.results_db else None
+    leaderboards = Leaderboards()  # Today's top 10, shown with the results
+    # Load the questions (and the leaderboard) while the name and age screen
+    # is already up
+    quiz_loader = run_in_background(
+        load_quiz,
+        args,
+        quiz_plan,
+        reloader,
+        leaderboards,
+        results_store,
+        name="bank-loader",
+    )
+    fetch_client = FetchClient()
+    decode_pool = DecodePool(
+        args.decode_workers, args.max_image_pixels, args.max_image_memory * 1024 * 1024
+    )
+    image_cache = ImageCache(args.image_cache_dir)
+    image_loader = ImageLoader(fetch_client, image_cache, decoder=decode_pool)
+    if reloader is not None:
+        # Edited questions may point at replaced images: check them again
+        reloader.subscribe(lambda change: image_cache.invalidate(*change.images()))
+    asset_pack = open_asset_pack(args.asset_pack)
+    image_prefetcher = ImagePrefetcher(
+        image_loader, depth=args.prefetch_depth, asset_pack=asset_pack
+    )
+
+    telemetry = Telemetry(args.telemetry)  # Per-question events, written in batches
 
     # Initialize the UserInterface (ui) and assign it to root to avoid Flake8 warning
-    root.ui = UserInterface(root, quiz_manager, user)
+    root.ui = UserInterface(
+        root,
+        quiz_loader,
+        user,
+        image_prefetcher,
+        asset_pack,
+        telemetry,
+        results_store,
+        leaderboards,
+        quiz_plan,
+    )
 
     # Start the tkinter main event loop
     root.mainloop()
+    if profiler is not None:
+        prefix = profiler.close()  # Write the profile, then stop timing calls
+        print(profiler.report())
+        print(f"Profile written to {prefix}.pstats and {prefix}.latency.json")
+    if root.ui.quiz_started():
+        quiz_plan.session_finished(root.ui.quiz_manager)
+    if reloader is not None:
+        reloader.stop()
+    image_prefetcher.shutdown()
+    fetch_client.close()
+    decode_pool.shutdown()
+    if results_store is not None:
+        results_store.close()  # Commit the last results
+    telemetry.close()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,16 @@
+import secrets  # Import secrets to identify sessions in the telemetry
 import time  # Import time to handle timing functions
 import tkinter as tk  # Import tkinter for creating the GUI
-from io import BytesIO  # Import BytesIO for handling image data
-from threading import Thread  # Import Thread for handling asynchronous tasks
+from concurrent.futures import Future  # Import Future to accept a loading quiz
 
-import requests  # Import requests for downloading images
-from PIL import Image, ImageTk, UnidentifiedImageError  # Import PIL for handling images
+from dispatcher import UIDispatcher  # Import UIDispatcher to update widgets safely
+from quiz_engine import (  # Import ImagePrefetcher to load images ahead
+    ImagePrefetcher,
+    LoadCancelled,
+    QuizManager,
+    Telemetry,
+)
+from quiz_engine.images import ImageLoadError  # Import the image loading error
 
 
 class UserInterface:
@@ -12,13 +18,41 @@ class UserInterface:
     Class to manage the graphical user interface of the quiz application.
     """
 
-    def __init__(self, root, quiz_manager, user):
+    def __init__(
+        self,
+        root,
+        quiz_manager,
+        user,
+        image_prefetcher=None,
+        asset_pack=None,
+        telemetry=None,
+        results_store=None,
+        leaderboards=None,
+        quiz_plan=None,
+    ):
         """
         Initialize the UserInterface with the root window, quiz manager, and user.
+
+        `quiz_manager` may also be a Future of one, while the questions are
+        still loading; the quiz then starts once it is ready. `quiz_plan`
+        starts the session of each next player on the same bank.
         """
         self.root = root  # The main tkinter window
         self.quiz_manager = quiz_manager  # Instance of QuizManager to handle quiz logic
         self.user = user  # Instance of User to store user details
+        # Instance of ImagePrefetcher to load question images ahead of time
+        self.image_prefetcher = image_prefetcher or ImagePrefetcher(
+            asset_pack=asset_pack
+        )
+        self.asset_pack = asset_pack  # Pre-rendered thumbnails, or None
+        # Per-question event stream; kept in memory only if none is given
+        self.telemetry = telemetry or Telemetry()
+        self.session_id = secrets.token_hex(8)  # Identifies this session's events
+        self.results_store = results_store  # ResultsStore saving results, or None
+        self.leaderboards = leaderboards  # Live top lists shown with the results
+        self.quiz_plan = quiz_plan  # QuizPlan for the next player's session, or None
+        # Runs results of background work on the Tk thread
+        self.dispatcher = UIDispatcher(root)
 
         # Variable to store the selected option
         self.selected_option = tk.StringVar()
@@ -35,6 +69,8 @@ class UserInterface:
         self.button_frame = tk.Frame(
             root
         )  # Frame for action buttons (Submit, Next, Quit)
+        self.result_frame = None  # Built when the first quiz is over
+        self.quiz_frames_built = False  # The quiz widgets are built once, then reused
 
         self.create_user_details_frame()  # Create the initial frame for user details
 
@@ -64,15 +100,16 @@ class UserInterface:
         self.age_entry.grid(row=2, column=1, pady=10)
 
         # Start quiz button
-        tk.Button(
+        self.start_button = tk.Button(
             self.user_details_frame, text="Start Quiz", command=self.start_quiz
-        ).grid(row=4, columnspan=2, pady=20)
+        )
+        self.start_button.grid(row=4, columnspan=2, pady=20)
 
         # Feedback label for error messages
-        self.feedback_label = tk.Label(
+        self.details_feedback_label = tk.Label(
             self.user_details_frame, text="", font=("Arial", 12), fg="red"
         )
-        self.feedback_label.grid(row=3, columnspan=2, pady=10)
+        self.details_feedback_label.grid(row=3, columnspan=2, pady=10)
 
         # Configure grid columns to expand equally
         self.user_details_frame.grid_columnconfigure(0, weight=1)
@@ -89,31 +126,69 @@ class UserInterface:
         self.user.age = self.age_entry.get()
 
         if not self.user.name or not self.user.age:
-            self.feedback_label.config(text="Please enter all details")
+            self.details_feedback_label.config(text="Please enter all details")
             return
 
         try:
             self.user.age = int(self.user.age)
         except ValueError:
-            self.feedback_label.config(text="Age must be a number")
+            self.details_feedback_label.config(text="Age must be a number")
+            return
+
+        if isinstance(self.quiz_manager, Future):
+            self.wait_for_quiz()
             return
 
         self.user_details_frame.pack_forget()
-        self.create_header_frame()
-        self.create_quiz_frame()
+        if self.quiz_frames_built:
+            self.show_quiz_frames()
+        else:
+            self.create_header_frame()
+            self.create_quiz_frame()
+            self.quiz_frames_built = True
         self.load_question()
 
+    def wait_for_quiz(self):
+        """
+        Start the quiz as soon as the questions have finished loading.
+        """
+        loader = self.quiz_manager
+        if loader.done():
+            try:
+                self.quiz_manager = loader.result()
+            except Exception as e:
+                print(f"Error: Could not load the questions: {e}")
+                self.details_feedback_label.config(text="Could not load the questions")
+                return
+            self.details_feedback_label.config(text="")
+            self.start_button.config(state=tk.NORMAL)  # Ready for the next player too
+            self.start_quiz()
+            return
+        self.details_feedback_label.config(text="Loading questions...")
+        self.start_button.config(state=tk.DISABLED)
+        loader.add_done_callback(
+            lambda _: self.dispatcher.post(self.wait_for_quiz, key="quiz")
+        )
+
+    def quiz_started(self):
+        """
+        Check if the player got past the name and age screen.
+        """
+        return not isinstance(self.quiz_manager, Future)
+
     def create_header_frame(self):
         """
         Create the header frame to display user details, score, and time.
         """
         self.header_frame.pack(pady=10)
-        tk.Label(
+        self.name_label = tk.Label(
             self.header_frame, text=f"Name: {self.user.name}", font=("Arial", 14)
-        ).grid(row=0, column=0, padx=20)
-        tk.Label(
+        )
+        self.name_label.grid(row=0, column=0, padx=20)
+        self.age_label = tk.Label(
             self.header_frame, text=f"Age: {self.user.age}", font=("Arial", 14)
-        ).grid(row=0, column=1, padx=20)
+        )
+        self.age_label.grid(row=0, column=1, padx=20)
         self.score_label = tk.Label(
             self.header_frame,
             text=f"Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}",
@@ -130,6 +205,21 @@ class UserInterface:
         self.header_frame.grid_columnconfigure(3, weight=1)
         self.update_time()
 
+    def show_quiz_frames(self):
+        """
+        Show the header, quiz and button frames again for the next player.
+        """
+        self.name_label.config(text=f"Name: {self.user.name}")
+        self.age_label.config(text=f"Age: {self.user.age}")
+        self.score_label.config(
+            text=f"Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}"
+        )
+        self.time_label.config(text="Time: 0s")
+        self.header_frame.pack(pady=10)
+        self.quiz_frame.pack(pady=20, padx=20)
+        self.button_frame.pack(pady=10)
+        self.update_time()
+
     def create_quiz_frame(self):
         """
         Create the frame for displaying quiz questions and options.
@@ -215,39 +305,80 @@ class UserInterface:
             )
 
             self.question_label.config(text=question)
-            if image_path:
-                thread = Thread(target=self.load_image, args=(image_path,))
-                thread.start()
+            self.telemetry.question_shown(self.quiz_manager, self.session_id)
+            # Fetch this question's image (usually already prefetched) and
+            # start loading the images of the next few questions
+            packed_image = self.asset_pack.get(image_path) if self.asset_pack else None
+            image_future = self.image_prefetcher.advance(self.quiz_manager)
+            generation = self.image_prefetcher.generation
+            # Label updates go through the dispatcher under one key, so a
+            # slower image for an earlier question cannot win over this one
+            if packed_image is not None:
+                self.dispatcher.post(
+                    self.display_packed_image, packed_image, key="image"
+                )
+            elif image_future is not None:
+                image_future.add_done_callback(
+                    lambda future: self.load_image(future, generation)
+                )
             else:
-                self.image_label.grid_forget()
+                self.dispatcher.post(self.image_label.grid_forget, key="image")
 
             for i, option in enumerate(options):
                 self.option_buttons[i].config(text=option, state=tk.NORMAL)
         else:
             self.show_results()
 
-    def load_image(self, image_path):
+    def load_image(self, image_future, generation):
         """
-        Load an image from a URL or file path and display it.
+        Hand the prefetched image over to the Tk thread once it has loaded.
+
+        This runs on a worker thread, so widgets are only touched through
+        the dispatcher; a newer image for the label replaces a pending one.
+        Images for a question the player has already left are dropped.
         """
+        if image_future.cancelled() or not self.image_prefetcher.is_current(generation):
+            return
         try:
-            if image_path.startswith("http"):
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
-                }
-                response = requests.get(image_path, headers=headers)
-                response.raise_for_status()
-                img_data = response.content
-                image = Image.open(BytesIO(img_data))
-            else:
-                image = Image.open(image_path)
-            image = image.resize((200, 200), Image.LANCZOS)
-            self.image = ImageTk.PhotoImage(image)
-            self.image_label.config(image=self.image)
-            self.image_label.grid(row=0, columnspan=2, pady=10)
-        except (requests.exceptions.RequestException, UnidentifiedImageError) as e:
+            image = image_future.result()
+        except LoadCancelled:
+            return
+        except ImageLoadError as e:
             print(f"Error loading image: {e}")
-            self.image_label.grid_forget()
+            self.dispatcher.post(self.clear_image, generation, key="image")
+            return
+        self.dispatcher.post(self.display_image, image, generation, key="image")
+
+    def display_image(self, image, generation):
+        """
+        Display a loaded image on the label, unless it is already out of date.
+        """
+        if not self.image_prefetcher.is_current(generation):
+            return
+        from PIL import ImageTk  # Only needed once an image question appears
+
+        self.image = ImageTk.PhotoImage(image)
+        self.image_label.config(image=self.image)
+        self.image_label.grid(row=0, columnspan=2, pady=10)
+        self.telemetry.image_loaded(self.quiz_manager, self.session_id, "loader")
+
+    def display_packed_image(self, png_data):
+        """
+        Display a pre-rendered thumbnail from the asset pack.
+        """
+        self.image = tk.PhotoImage(data=png_data)
+        self.image_label.config(image=self.image)
+        self.image_label.grid(row=0, columnspan=2, pady=10)
+        self.telemetry.image_loaded(self.quiz_manager, self.session_id, "pack")
+
+    def clear_image(self, generation):
+        """
+        Hide the image label after a failed load.
+        """
+        if not self.image_prefetcher.is_current(generation):
+            return
+        self.image_label.grid_forget()
+        self.telemetry.image_failed(self.quiz_manager, self.session_id)
 
     def enable_submit_button(self):
         """
@@ -261,7 +392,15 @@ class UserInterface:
         """
         selected_index = self.selected_option.get()
         selected_option = self.option_buttons[int(selected_index)].cget("text")
-        if self.quiz_manager.check_answer(selected_option, self.correct_answer):
+        correct = self.quiz_manager.check_answer(selected_option, self.correct_answer)
+        self.telemetry.question_answered(
+            self.quiz_manager, self.session_id, selected_option, correct
+        )
+        if self.results_store is not None:
+            self.results_store.record_answer(
+                self.quiz_manager, self.session_id, selected_option, correct
+            )
+        if correct:
             self.feedback_label.config(text="Correct!", fg="green")
         else:
             self.feedback_label.config(
@@ -293,14 +432,17 @@ class UserInterface:
         elapsed_time = int(time.time() - self.start_time)
         self.time_label.config(text=f"Time: {elapsed_time}s")
 
-    def update_time(self):
+    def update_time(self, session=None):
         """
-        Update the elapsed time every second.
+        Update the elapsed time every second, until the session is over.
         """
-        if not self.quiz_manager.is_quiz_over():
+        if session is None:
+            session = self.quiz_manager
+        # Stop once the player has moved on, so sessions never share a timer
+        if session is self.quiz_manager and not session.is_quiz_over():
             elapsed_time = int(time.time() - self.start_time)
             self.time_label.config(text=f"Time: {elapsed_time}s")
-            self.root.after(1000, self.update_time)
+            self.root.after(1000, self.update_time, session)
 
     def show_results(self):
         """
@@ -310,6 +452,25 @@ class UserInterface:
             self.quiz_manager.next_question()
 
         elapsed_time = time.time() - self.start_time
+        self.telemetry.session_finished(
+            self.quiz_manager, self.session_id, elapsed_time
+        )
+        if self.results_store is not None:
+            self.results_store.record_session(
+                self.quiz_manager,
+                self.session_id,
+                self.user.name,
+                self.user.age,
+                elapsed_time,
+            )
+        rank = None  # Place on today's leaderboard
+        if self.leaderboards is not None:
+            rank = self.leaderboards.record(
+                self.user.name,
+                self.quiz_manager.score,
+                self.quiz_manager.current_question_index,
+                elapsed_time,
+            )
         average_time = (
             elapsed_time / self.quiz_manager.current_question_index
             if self.quiz_manager.current_question_index
@@ -319,20 +480,86 @@ class UserInterface:
         self.button_frame.pack_forget()
         self.header_frame.pack_forget()
 
-        result_frame = tk.Frame(self.root)
-        result_frame.pack(pady=20)
-        tk.Label(result_frame, text="Quiz Over!", font=("Arial", 24)).pack(pady=20)
-        tk.Label(result_frame, text=f"Name: {self.user.name}").pack()
-        tk.Label(result_frame, text=f"Age: {self.user.age}").pack()
-        tk.Label(
-            result_frame,
-            text=f"Your Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}",
-            font=("Arial", 18),
-        ).pack(pady=20)
-        tk.Label(result_frame, text=f"Total Time: {int(elapsed_time)} seconds").pack(
-            pady=10
+        if self.result_frame is None:
+            self.create_result_frame()
+        self.result_name_label.config(text=f"Name: {self.user.name}")
+        self.result_age_label.config(text=f"Age: {self.user.age}")
+        self.result_score_label.config(
+            text=f"Your Score: {self.quiz_manager.score}/{self.quiz_manager.current_question_index}"
         )
-        tk.Label(
-            result_frame, text=f"Average Time per Question: {average_time:.2f} seconds"
-        ).pack(pady=10)
-        tk.Button(result_frame, text="Close", command=self.root.quit).pack(pady=20)
+        self.result_time_label.config(text=f"Total Time: {int(elapsed_time)} seconds")
+        self.result_average_label.config(
+            text=f"Average Time per Question: {average_time:.2f} seconds"
+        )
+        if self.leaderboards is not None:
+            self.leaderboard_label.config(text=self.leaderboard_text(rank))
+        self.result_frame.pack(pady=20)
+
+    def create_result_frame(self):
+        """
+        Create the frame for the quiz results, reused for every player.
+        """
+        self.result_frame = tk.Frame(self.root)
+        tk.Label(self.result_frame, text="Quiz Over!", font=("Arial", 24)).pack(pady=20)
+        self.result_name_label = tk.Label(self.result_frame)
+        self.result_name_label.pack()
+        self.result_age_label = tk.Label(self.result_frame)
+        self.result_age_label.pack()
+        self.result_score_label = tk.Label(self.result_frame, font=("Arial", 18))
+        self.result_score_label.pack(pady=20)
+        self.result_time_label = tk.Label(self.result_frame)
+        self.result_time_label.pack(pady=10)
+        self.result_average_label = tk.Label(self.result_frame)
+        self.result_average_label.pack(pady=10)
+        if self.leaderboards is not None:
+            tk.Label(
+                self.result_frame, text="Today's Top 10", font=("Arial", 14)
+            ).pack()
+            self.leaderboard_label = tk.Label(self.result_frame, justify=tk.LEFT)
+            self.leaderboard_label.pack(pady=10)
+        result_buttons = tk.Frame(self.result_frame)
+        result_buttons.pack(pady=20)
+        self.play_again_button = tk.Button(
+            result_buttons, text="Play Again", command=self.play_again
+        )
+        self.play_again_button.grid(row=0, column=0, padx=10)
+        tk.Button(result_buttons, text="Close", command=self.root.quit).grid(
+            row=0, column=1, padx=10
+        )
+
+    def play_again(self):
+        """
+        Start a new session on the loaded bank and ask the next player's details.
+
+        The frames and widgets of the last quiz are reused, so the next
+        player is ready to go without loading or building anything again.
+        """
+        if self.quiz_plan is not None:
+            self.quiz_plan.session_finished(self.quiz_manager)
+            # On the plan's latest bank, which may have been reloaded
+            self.quiz_manager = self.quiz_plan.new_session()
+        else:
+            self.quiz_manager = QuizManager(self.quiz_manager.bank)
+        self.session_id = secrets.token_hex(8)
+        self.start_time = time.time()
+        self.total_time = 0
+
+        self.result_frame.pack_forget()
+        self.name_entry.delete(0, tk.END)
+        self.age_entry.delete(0, tk.END)
+        self.details_feedback_label.config(text="")
+        self.user_details_frame.pack(expand=True)
+        self.name_entry.focus_set()
+
+    def leaderboard_text(self, rank):
+        """
+        Format today's leaderboard, marking this player's place on it.
+        """
+        lines = []
+        for place, entry in enumerate(self.leaderboards.top("day"), start=1):
+            marker = "  <- you" if place == rank else ""
+            lines.append(
+                f"{place}. {entry.player}  {entry.score}/{entry.answered}"
+                f"  {entry.elapsed or 0:.0f}s{marker}"
+            )
+        return "\n".join(lines) or "No results yet"